@@ -0,0 +1 @@
+# Admin package
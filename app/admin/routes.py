@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+
+from app.auth import get_current_superuser
+from app.db import pool_stats, slow_query_log
+from app.models.user import User
+from app.vehicles.facets import facets_cache
+from app.vehicles.result_cache import public_search_cache
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+@router.get("/cache-stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Get hit/miss counters and sizes of the in-process caches (superusers only)."""
+    return {
+        "public_search": public_search_cache.stats(),
+        "facets": facets_cache.stats(),
+    }
+
+@router.get("/pool-stats")
+async def get_pool_stats(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Get connection pool gauges, wait and connect latency histograms per database (superusers only)."""
+    return pool_stats()
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Get the slowest statements with their plans, and the latest slow executions (superusers only)."""
+    return slow_query_log.stats()
@@ -0,0 +1,71 @@
+"""Conditional GET support: ETag / Last-Modified validators and 304 checks.
+
+The ETag is a hash of the serialized response body, so it changes whenever
+any row feeding the response does. `updated_at` alone cannot do that: it
+has one-second resolution on SQLite, and it misses changes to related
+rows. Last-Modified is the newest `updated_at` of those rows. A 304 still
+costs the fetch and serialization, but saves sending the body.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.profiling import profile_span
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; the database clock is UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag over a serialized response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def last_modified(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """The most recent of the given timestamps, ignoring missing ones."""
+    present = [_as_utc(timestamp) for timestamp in timestamps if timestamp is not None]
+    return max(present) if present else None
+
+def validator_headers(etag: str, modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime]) -> bool:
+    """Whether the request's validators still match the current version.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client sent no entity tags.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        return "*" in tags or etag in [tag.removeprefix("W/") for tag in tags]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole-second resolution
+    return modified.replace(microsecond=0) <= _as_utc(since)
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+def conditional_response(request: Request, model, modified: Optional[datetime]) -> Response:
+    """Serialize a response model to JSON, or answer 304 if the client's copy is current."""
+    with profile_span("serialize"):
+        body = model.model_dump_json().encode()
+    headers = validator_headers(make_etag(body), modified)
+    if is_not_modified(request, headers["ETag"], modified):
+        return not_modified_response(headers)
+    return Response(content=body, media_type="application/json", headers=headers)
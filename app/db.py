@@ -1,8 +1,18 @@
+import hashlib
 import os
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+from sqlalchemy import (
+    Column, Integer, MetaData, String, Table, delete, event, insert, inspect, make_url, select, text,
+)
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
+from app.pool_metrics import InstrumentedPool
+from app.slow_queries import SlowQueryLog
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -14,21 +24,94 @@ if not DATABASE_URL:
 
 print(f"Using database: {DATABASE_URL}")
 
+# Optional comma-separated read replicas for read-only endpoints
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Seconds a replica that failed is left out before it is tried again
+REPLICA_RETRY_INTERVAL = float(os.getenv("REPLICA_RETRY_INTERVAL", "30"))
+
+# Connection pool settings, applied to the primary and every replica
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "0"))  # Extra connections allowed during bursts
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # Seconds before a connection is replaced; -1 never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+# Statements slower than this are logged and explained; 0 disables the log
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "50"))  # statements kept per list
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE)
+
+def _create_engine(url: str, **options):
+    if ":memory:" in url:
+        # In-memory SQLite lives and dies with its single connection; keep SQLAlchemy's default pool
+        return create_async_engine(url, echo=False, **options)
+    pool_options = dict(
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return create_async_engine(url, echo=False, **{**pool_options, **options})  # Disable echo for production
+
+# Tuned SQLite mode: WAL journal, relaxed fsync, memory-mapped I/O, and one
+# writer connection with a separate pool of read-only connections.
+# Off by default; the deployment configs (railway.toml, Dockerfile) turn it on
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "false").lower() in ("1", "true", "yes")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))  # page cache per connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # wait on locks held by other processes
+# Read connections; SQLite reads are CPU-bound, so more than the cores available only adds contention
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+
+def tune_sqlite(engine_, read_only: bool = False) -> None:
+    """Set the tuned-mode pragmas on every new connection of a SQLite engine."""
+    pragmas = [
+        "journal_mode=WAL",  # Readers no longer block the writer, or the writer readers
+        "synchronous=NORMAL",  # Durable across crashes of the app; fsync at checkpoints only
+        f"mmap_size={SQLITE_MMAP_SIZE}",
+        f"cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("query_only=ON")
+
+    @event.listens_for(engine_.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+def create_sqlite_engines(url: str) -> tuple:
+    """(writer, reader) engines for tuned SQLite mode.
+
+    SQLite allows one writer at a time. Queueing writers on a single pooled
+    connection avoids "database is locked" errors between them; with WAL,
+    the reader pool keeps serving committed data meanwhile.
+    """
+    writer = _create_engine(url, pool_size=1, max_overflow=0)
+    reader = _create_engine(url, pool_size=SQLITE_READ_POOL_SIZE, max_overflow=0)
+    tune_sqlite(writer)
+    tune_sqlite(reader, read_only=True)
+    return writer, reader
+
 try:
-    # Configure engine based on database type
-    if "sqlite" in DATABASE_URL:
-        # SQLite configuration
-        engine = create_async_engine(DATABASE_URL, echo=False)  # Disable echo for production
+    if "sqlite" in DATABASE_URL and SQLITE_TUNED and ":memory:" not in DATABASE_URL:
+        engine, read_engine = create_sqlite_engines(DATABASE_URL)
+        print("✅ SQLite tuned mode: WAL, single writer connection, separate read pool")
     else:
-        # PostgreSQL/MySQL configuration with connection pooling
-        engine = create_async_engine(
-            DATABASE_URL, 
-            echo=False,  # Disable echo for production
-            pool_size=20,
-            max_overflow=0
-        )
+        engine = _create_engine(DATABASE_URL)
+        read_engine = engine
+    slow_query_log.watch(engine, explain_engine=read_engine)
+    if read_engine is not engine:
+        slow_query_log.watch(read_engine)
 
     async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    # Read-only work that has no replica to go to
+    read_session_maker = async_sessionmaker(read_engine, expire_on_commit=False)
     print("✅ Database engine created successfully")
 
 except Exception as e:
@@ -36,3 +119,172 @@ except Exception as e:
     raise
 
 Base = declarative_base()
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        # Pre-ping so a dead replica fails at checkout, before the handler runs
+        self.engine = _create_engine(url, pool_pre_ping=True)
+        slow_query_log.watch(self.engine)
+        self.session_maker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.active = 0  # Sessions currently open
+        self.ejected_until = 0.0  # time.monotonic() before which the replica is skipped
+
+class ReplicaRouter:
+    """Spreads read-only sessions over the replicas, least busy first.
+
+    Ties rotate round-robin. A replica whose connection fails is ejected for
+    REPLICA_RETRY_INTERVAL seconds; with none healthy, reads use the primary.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._turn = 0
+
+    def candidates(self) -> list[Replica]:
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.ejected_until <= now]
+        if not healthy:
+            return []
+        self._turn = (self._turn + 1) % len(healthy)
+        rotated = healthy[self._turn:] + healthy[:self._turn]
+        return sorted(rotated, key=lambda replica: replica.active)
+
+    def eject(self, replica: Replica, error: Exception) -> None:
+        replica.ejected_until = time.monotonic() + REPLICA_RETRY_INTERVAL
+        print(f"⚠️ Read replica ejected for {REPLICA_RETRY_INTERVAL:g}s: {error}")
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+@asynccontextmanager
+async def read_session():
+    """A session for read-only work: on a healthy replica if any, else on the primary.
+
+    In tuned SQLite mode the primary's reads use its read-only connection pool.
+
+    Replicas lag the primary, so anything that must see a write it just made
+    (or that writes) uses `async_session_maker` instead.
+    """
+    for replica in replica_router.candidates():
+        session = replica.session_maker()
+        try:
+            await session.connection()
+        except (DBAPIError, OSError) as e:
+            await session.close()
+            replica_router.eject(replica, e)
+            continue
+
+        replica.active += 1
+        try:
+            yield session
+        except DBAPIError as e:
+            if e.connection_invalidated:
+                replica_router.eject(replica, e)
+            raise
+        finally:
+            replica.active -= 1
+            await session.close()
+        return
+
+    async with read_session_maker() as session:
+        yield session
+
+def pool_stats() -> dict:
+    """Pool gauges and counters of the primary (and its SQLite reader) and each replica."""
+    def stats(engine_) -> dict:
+        pool = engine_.sync_engine.pool
+        return pool.stats() if isinstance(pool, InstrumentedPool) else {"status": pool.status()}
+
+    return {
+        "primary": stats(engine),
+        **({"primary_reader": stats(read_engine)} if read_engine is not engine else {}),
+        "replicas": {
+            make_url(replica.url).render_as_string(hide_password=True): {
+                **stats(replica.engine),
+                "active_sessions": replica.active,
+                "ejected": replica.ejected_until > time.monotonic(),
+            }
+            for replica in replica_router.replicas
+        },
+    }
+
+def is_replica_session(session) -> bool:
+    return any(session.bind is replica.engine for replica in replica_router.replicas)
+
+async def get_read_db():
+    """Dependency for read-only endpoints; see `read_session`."""
+    async with read_session() as session:
+        yield session
+
+async def get_primary_read_db():
+    """Dependency for read-only lookups that must not lag behind writes.
+
+    Always the primary, never a replica; in tuned SQLite mode the read pool,
+    so the lookup doesn't wait for (or hold) the single writer connection.
+    """
+    async with read_session_maker() as session:
+        yield session
+
+def ensure_indexes(connection):
+    """Create indexes added to models after their tables were first created.
+
+    `create_all` skips tables that already exist, along with their indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def ensure_columns(connection):
+    """Add nullable columns added to models after their tables were first created.
+
+    There are no migrations; `create_all` only creates missing tables.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+# Schema version marker: a fingerprint of the models, written after a full
+# schema check so later startups can skip `create_all` and the ensure_* steps
+_schema_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _schema_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+)
+
+def schema_fingerprint(*extra: str) -> str:
+    """Hash of every table, column and index in the models, plus `extra` DDL."""
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            digest.update(f"column {column.name} {column.type!r} {column.nullable}\n".encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(f"index {index.name} {[column.name for column in index.columns]} {index.unique}\n".encode())
+    for statement in extra:
+        digest.update(statement.encode())
+    return digest.hexdigest()
+
+async def stored_schema_fingerprint():
+    """The fingerprint recorded by the last full schema check, or None."""
+    try:
+        async with engine.connect() as connection:
+            return (await connection.execute(select(schema_version.c.fingerprint))).scalar()
+    except DBAPIError:
+        return None  # No marker table yet
+
+def record_schema_fingerprint(connection, fingerprint: str) -> None:
+    _schema_metadata.create_all(connection)
+    connection.execute(delete(schema_version))
+    connection.execute(insert(schema_version).values(id=1, fingerprint=fingerprint))
+
+def drop_schema_fingerprint(connection) -> None:
+    """Forget the recorded fingerprint so the next startup runs the full schema check."""
+    _schema_metadata.drop_all(connection)
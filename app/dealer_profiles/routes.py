@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import Optional
 
-from app.db import async_session_maker
+from app.db import async_session_maker, get_read_db
 from app.models.dealer_profile import DealerProfile
 from app.models.user import User, UserType
 from app.schemas.dealer_profile import DealerProfileCreate, DealerProfileUpdate, DealerProfileOut
 from app.auth import get_current_active_user
+from app.conditional import conditional_response, last_modified
 
 router = APIRouter(prefix="/api", tags=["dealer-profiles"])
 
@@ -72,9 +73,10 @@ async def get_my_dealer_profile(
 @router.get("/dealer-profile/{user_id}", response_model=DealerProfileOut)
 async def get_dealer_profile_by_user_id(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get dealer profile by user ID (public access)."""
+    """Get dealer profile by user ID (public access). Supports conditional GET."""
     
     result = await db.execute(
         select(DealerProfile).where(DealerProfile.user_id == user_id)
@@ -84,7 +86,7 @@ async def get_dealer_profile_by_user_id(
     if not profile:
         raise HTTPException(status_code=404, detail="Dealer profile not found")
     
-    return profile
+    return conditional_response(request, DealerProfileOut.model_validate(profile), last_modified(profile.updated_at))
 
 @router.put("/dealer-profile", response_model=DealerProfileOut)
 async def update_dealer_profile(
@@ -0,0 +1 @@
+# Geo package
@@ -0,0 +1,171 @@
+"""Bundled gazetteer of Sri Lankan towns for geocoding free-text locations."""
+import re
+from typing import Optional
+
+# town -> (latitude, longitude) of the town centre
+TOWNS = {
+    # Western Province
+    "colombo": (6.9271, 79.8612),
+    "dehiwala": (6.8511, 79.8659),
+    "mount lavinia": (6.8389, 79.8633),
+    "moratuwa": (6.7730, 79.8816),
+    "kotte": (6.8868, 79.9187),
+    "sri jayawardenepura kotte": (6.8868, 79.9187),
+    "nugegoda": (6.8649, 79.8997),
+    "maharagama": (6.8480, 79.9265),
+    "battaramulla": (6.9000, 79.9180),
+    "rajagiriya": (6.9094, 79.8943),
+    "kolonnawa": (6.9329, 79.8848),
+    "kaduwela": (6.9333, 79.9833),
+    "malabe": (6.9040, 79.9580),
+    "homagama": (6.8440, 80.0024),
+    "piliyandala": (6.8018, 79.9227),
+    "kesbewa": (6.7953, 79.9406),
+    "avissawella": (6.9543, 80.2046),
+    "hanwella": (6.9000, 80.0833),
+    "wattala": (6.9897, 79.8917),
+    "kelaniya": (6.9553, 79.9220),
+    "kiribathgoda": (6.9800, 79.9290),
+    "kadawatha": (7.0000, 79.9500),
+    "ragama": (7.0300, 79.9200),
+    "kandana": (7.0480, 79.8970),
+    "ja ela": (7.0744, 79.8919),
+    "seeduwa": (7.1280, 79.8840),
+    "katunayake": (7.1700, 79.8800),
+    "negombo": (7.2008, 79.8737),
+    "gampaha": (7.0917, 79.9999),
+    "minuwangoda": (7.1667, 79.9500),
+    "divulapitiya": (7.2167, 80.0167),
+    "nittambuwa": (7.1444, 80.0964),
+    "veyangoda": (7.1556, 80.0600),
+    "mirigama": (7.2414, 80.1325),
+    "panadura": (6.7132, 79.9026),
+    "bandaragama": (6.7144, 79.9886),
+    "horana": (6.7159, 80.0626),
+    "kalutara": (6.5854, 79.9607),
+    "matugama": (6.5222, 80.1144),
+    "beruwala": (6.4788, 79.9828),
+    "aluthgama": (6.4340, 80.0037),
+    # Southern Province
+    "bentota": (6.4210, 80.0000),
+    "ambalangoda": (6.2355, 80.0538),
+    "elpitiya": (6.2910, 80.1590),
+    "hikkaduwa": (6.1395, 80.1063),
+    "baddegama": (6.1667, 80.1833),
+    "galle": (6.0535, 80.2210),
+    "weligama": (5.9742, 80.4295),
+    "akuressa": (6.1000, 80.4833),
+    "deniyaya": (6.3400, 80.5600),
+    "matara": (5.9549, 80.5550),
+    "dikwella": (5.9667, 80.6833),
+    "tangalle": (6.0243, 80.7941),
+    "ambalantota": (6.1167, 81.0333),
+    "hambantota": (6.1241, 81.1185),
+    "tissamaharama": (6.2796, 81.2870),
+    # Sabaragamuwa Province
+    "embilipitiya": (6.3439, 80.8499),
+    "ratnapura": (6.6828, 80.3992),
+    "kuruwita": (6.7833, 80.3667),
+    "eheliyagoda": (6.8500, 80.2667),
+    "pelmadulla": (6.6167, 80.5333),
+    "balangoda": (6.6442, 80.7022),
+    "kegalle": (7.2513, 80.3464),
+    "mawanella": (7.2527, 80.4467),
+    "warakapola": (7.2260, 80.1970),
+    "rambukkana": (7.3240, 80.3910),
+    # Central Province
+    "kandy": (7.2906, 80.6337),
+    "peradeniya": (7.2690, 80.5940),
+    "katugastota": (7.3167, 80.6167),
+    "kadugannawa": (7.2540, 80.5240),
+    "digana": (7.2970, 80.7350),
+    "gampola": (7.1643, 80.5696),
+    "nawalapitiya": (7.0540, 80.5320),
+    "matale": (7.4675, 80.6234),
+    "dambulla": (7.8742, 80.6511),
+    "sigiriya": (7.9570, 80.7603),
+    "nuwara eliya": (6.9497, 80.7891),
+    "hatton": (6.8916, 80.5955),
+    # Uva Province
+    "badulla": (6.9934, 81.0550),
+    "bandarawela": (6.8259, 80.9982),
+    "ella": (6.8667, 81.0466),
+    "haputale": (6.7656, 80.9510),
+    "welimada": (6.9000, 80.9167),
+    "mahiyanganaya": (7.3167, 81.0000),
+    "monaragala": (6.8728, 81.3507),
+    "wellawaya": (6.7370, 81.1030),
+    "bibile": (7.1600, 81.2200),
+    "kataragama": (6.4134, 81.3346),
+    # North Western Province
+    "kurunegala": (7.4863, 80.3623),
+    "kuliyapitiya": (7.4688, 80.0401),
+    "narammala": (7.4333, 80.2167),
+    "wariyapola": (7.6222, 80.2375),
+    "dambadeniya": (7.3667, 80.1500),
+    "pannala": (7.3287, 80.0253),
+    "puttalam": (8.0362, 79.8283),
+    "chilaw": (7.5758, 79.7953),
+    "marawila": (7.4167, 79.8333),
+    "wennappuwa": (7.3500, 79.8500),
+    # North Central Province
+    "anuradhapura": (8.3114, 80.4037),
+    "kekirawa": (8.0333, 80.6000),
+    "medawachchiya": (8.5392, 80.4947),
+    "habarana": (8.0336, 80.7500),
+    "polonnaruwa": (7.9403, 81.0188),
+    # Eastern Province
+    "trincomalee": (8.5874, 81.2152),
+    "kinniya": (8.4975, 81.1803),
+    "batticaloa": (7.7170, 81.7000),
+    "kattankudy": (7.6750, 81.7300),
+    "eravur": (7.7667, 81.6000),
+    "ampara": (7.2975, 81.6820),
+    "kalmunai": (7.4167, 81.8167),
+    "akkaraipattu": (7.2167, 81.8500),
+    "pottuvil": (6.8767, 81.8306),
+    # Northern Province
+    "jaffna": (9.6615, 80.0255),
+    "chavakachcheri": (9.6580, 80.1580),
+    "point pedro": (9.8167, 80.2333),
+    "kilinochchi": (9.3803, 80.3770),
+    "mullaitivu": (9.2671, 80.8142),
+    "vavuniya": (8.7514, 80.4971),
+    "mannar": (8.9810, 79.9044),
+}
+
+# Other spellings seen in listings
+ALIASES = {
+    "mt lavinia": "mount lavinia",
+    "dehiwala mount lavinia": "dehiwala",
+    "jaela": "ja ela",
+    "nuwaraeliya": "nuwara eliya",
+    "trinco": "trincomalee",
+    "anuradapura": "anuradhapura",
+    "kurunagala": "kurunegala",
+    "rathnapura": "ratnapura",
+    "moneragala": "monaragala",
+}
+
+_LONGEST_NAME = max(len(name.split()) for name in (*TOWNS, *ALIASES))
+
+def _tokens(text: str) -> list[str]:
+    # "Colombo 07", "Ja-Ela" and "Kandy." all reduce to the bare town words
+    return re.sub(r"[^a-z]+", " ", text.lower()).split()
+
+def geocode(location: Optional[str]) -> Optional[tuple[float, float]]:
+    """Coordinates of the town named in a free-text location, or None.
+
+    The leftmost, longest town name wins, so "Nugegoda, Colombo" resolves to
+    Nugegoda rather than Colombo.
+    """
+    if not location:
+        return None
+    tokens = _tokens(location)
+    for start in range(len(tokens)):
+        for length in range(min(_LONGEST_NAME, len(tokens) - start), 0, -1):
+            name = " ".join(tokens[start:start + length])
+            name = ALIASES.get(name, name)
+            if name in TOWNS:
+                return TOWNS[name]
+    return None
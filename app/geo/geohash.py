@@ -0,0 +1,79 @@
+"""Geohash encoding, radius cover cells and flat-earth distances.
+
+A geohash names a lat/lng cell with a base32 string; every cell inside it
+shares its prefix. A radius search therefore turns into a few prefix range
+scans over an indexed geohash column, followed by an exact distance check.
+"""
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Sorts after every base32 character, so [prefix, prefix + END] spans a cell
+PREFIX_END = "~"
+
+KM_PER_DEGREE = 111.32
+# Upper bound on prefix ranges a radius search may expand into
+MAX_COVER_CELLS = 16
+
+def encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at `precision`."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(south, west, north, east) of the box enclosing the circle."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lng_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lng_delta, 180.0),
+    )
+
+def _cells(box: tuple, precision: int) -> list[str]:
+    south, west, north, east = box
+    height, width = cell_size(precision)
+    rows = range(math.floor((south + 90) / height), math.floor((north + 90) / height) + 1)
+    columns = range(math.floor((west + 180) / width), math.floor((east + 180) / width) + 1)
+    if len(rows) * len(columns) > MAX_COVER_CELLS:
+        return []
+    return [
+        encode(min(-90 + (row + 0.5) * height, 90.0), min(-180 + (column + 0.5) * width, 180.0), precision)
+        for row in rows
+        for column in columns
+    ]
+
+def cover(latitude: float, longitude: float, radius_km: float) -> list[str]:
+    """The finest geohash prefixes, at most MAX_COVER_CELLS, covering the circle's box."""
+    box = bounding_box(latitude, longitude, radius_km)
+    for precision in range(9, 0, -1):
+        cells = _cells(box, precision)
+        if cells:
+            return cells
+    return [""]  # The whole world
+
+def distance_squared_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Squared equirectangular distance; exact enough at city-to-province scale."""
+    lat_km = (lat2 - lat1) * KM_PER_DEGREE
+    lng_km = (lng2 - lng1) * KM_PER_DEGREE * math.cos(math.radians(lat1))
+    return lat_km * lat_km + lng_km * lng_km
@@ -1,13 +1,66 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.vehicles.routes import router as vehicle_router
 from app.users.routes import router as auth_router
 from app.dealer_profiles.routes import router as dealer_profile_router
+from app.admin.routes import router as admin_router
+from app.saved_searches.routes import router as saved_search_router
+from app.vehicles.pagination import NEXT_CURSOR_HEADER
+from app.vehicles.columnar import COLUMNAR_INDEX_ENABLED, columnar_index
+from app.vehicles.suggest import suggestion_index
+from app.vehicles.valuation import VALUATION_REBUILD_INTERVAL, refresh_price_stats_periodically
+from app.db import async_session_maker
+from app.schema import ensure_schema
+from app.profiling import PROFILING_ENABLED, ProfilingMiddleware, install_profiling
 # Import models to ensure they are registered with SQLAlchemy
 from app.models import Vehicle, VehicleImage, User
 from app.models.dealer_profile import DealerProfile
 
-app = FastAPI(title="Carro Backend API", description="Vehicle marketplace API with authentication")
+async def warm_up(app: FastAPI):
+    """Run the startup steps, build the in-memory indexes and start the price statistics rebuilds, then mark the app ready.
+
+    The startup steps default to the schema check; run.py replaces them with
+    its own (schema check plus demo data).
+    """
+    try:
+        for step in getattr(app.state, "startup_steps", [ensure_schema]):
+            await step()
+        async with async_session_maker() as session:
+            await suggestion_index.build(session)
+        if COLUMNAR_INDEX_ENABLED:
+            async with async_session_maker() as session:
+                await columnar_index.build(session)
+            print(f"✅ Columnar search index built ({len(columnar_index)} vehicles)")
+        # Only once the startup steps have created the tables
+        if VALUATION_REBUILD_INTERVAL > 0:
+            app.state.price_stats_task = asyncio.create_task(refresh_price_stats_periodically())
+        app.state.ready = True
+        print("✅ Warm-up finished, ready for traffic")
+    except Exception as e:
+        app.state.warm_up_error = str(e)
+        print(f"❌ Warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warm_up_error = None
+    app.state.price_stats_task = None
+    # Warm up in the background so the server listens (and /health answers) right away
+    warm_up_task = asyncio.create_task(warm_up(app))
+    yield
+    warm_up_task.cancel()
+    if app.state.price_stats_task:
+        app.state.price_stats_task.cancel()
+
+app = FastAPI(
+    title="Carro Backend API",
+    description="Vehicle marketplace API with authentication",
+    lifespan=lifespan,
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -16,8 +69,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER],  # Lets browsers read the pagination cursor
 )
 
+# Sampled per-request timings: Server-Timing header plus a JSON log line
+if PROFILING_ENABLED:
+    install_profiling()
+    app.add_middleware(ProfilingMiddleware)
+
 @app.get("/")
 def read_root():
     return {"message": "Hello from Carro backend!"}
@@ -26,6 +85,17 @@ def read_root():
 def health_check():
     return {"status": "healthy", "service": "carro-backend"}
 
+@app.get("/ready")
+def readiness_check(request: Request):
+    """503 until the database checks and index warm-up have finished."""
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        detail = getattr(state, "warm_up_error", None) or "warming up"
+        return JSONResponse(status_code=503, content={"status": "not ready", "detail": detail})
+    return {"status": "ready", "service": "carro-backend"}
+
 app.include_router(vehicle_router)
 app.include_router(auth_router)
 app.include_router(dealer_profile_router)
+app.include_router(admin_router)
+app.include_router(saved_search_router)
@@ -2,5 +2,8 @@
 from .vehicle import Vehicle
 from .vehicle_image import VehicleImage
 from .user import User
+from .price_stat import PriceStat
+from .saved_search import SavedSearch, SavedSearchMatch
+from .feature import Feature, VehicleFeature
 
-__all__ = ["Vehicle", "VehicleImage", "User"]
+__all__ = ["Vehicle", "VehicleImage", "User", "PriceStat", "SavedSearch", "SavedSearchMatch", "Feature", "VehicleFeature"]
@@ -0,0 +1,22 @@
+from sqlalchemy import Integer, String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+class Feature(Base):
+    """Dictionary of the distinct features listings mention."""
+    __tablename__ = "features"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True)  # Lower-cased, single-spaced
+    label: Mapped[str] = mapped_column(String(100))  # As first written, e.g. "Reverse Camera"
+
+class VehicleFeature(Base):
+    """Normalized copy of Vehicle.features, one row per vehicle and feature."""
+    __tablename__ = "vehicle_features"
+    __table_args__ = (
+        # Feature filters look vehicles up by feature
+        Index("ix_vehicle_features_feature_id_vehicle_id", "feature_id", "vehicle_id"),
+    )
+
+    vehicle_id: Mapped[int] = mapped_column(ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True)
+    feature_id: Mapped[int] = mapped_column(ForeignKey("features.id"), primary_key=True)
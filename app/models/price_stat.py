@@ -0,0 +1,36 @@
+from sqlalchemy import Integer, String, Float, JSON, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db import Base
+from typing import List
+from datetime import datetime
+
+# Sentinel mileage band for the row covering every mileage
+ALL_MILEAGE = -1
+
+class PriceStat(Base):
+    """Precomputed asking-price distribution for one make/model/year/mileage band."""
+    __tablename__ = "vehicle_price_stats"
+    __table_args__ = (
+        UniqueConstraint("make", "model", "year", "mileage_band", name="uq_vehicle_price_stats_bucket"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    make: Mapped[str] = mapped_column(String(100))  # Lower-cased
+    model: Mapped[str] = mapped_column(String(100))  # Lower-cased
+    year: Mapped[int] = mapped_column(Integer)
+    mileage_band: Mapped[int] = mapped_column(Integer)  # Index into MILEAGE_BANDS, or ALL_MILEAGE
+
+    listing_count: Mapped[int] = mapped_column(Integer)
+    price_min: Mapped[float] = mapped_column(Float)
+    price_p10: Mapped[float] = mapped_column(Float)
+    price_p25: Mapped[float] = mapped_column(Float)
+    price_median: Mapped[float] = mapped_column(Float)
+    price_p75: Mapped[float] = mapped_column(Float)
+    price_p90: Mapped[float] = mapped_column(Float)
+    price_max: Mapped[float] = mapped_column(Float)
+    price_mean: Mapped[float] = mapped_column(Float)
+    # Uniform sample of prices (at most SAMPLE_SIZE) used to update the percentiles incrementally
+    price_samples: Mapped[List[float]] = mapped_column(JSON)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,34 @@
+from sqlalchemy import Integer, String, Boolean, ForeignKey, JSON, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db import Base
+from typing import Optional
+from datetime import datetime
+
+class SavedSearch(Base):
+    """A user's persisted set of vehicle search filters."""
+    __tablename__ = "saved_searches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    filters: Mapped[dict] = mapped_column(JSON)  # build_vehicle_search_query parameters, None values dropped
+    # The search's equality predicates, e.g. "fuel_type=petrol;vehicle_type=car" ("" when it has none).
+    # New listings look up every key their own values could satisfy.
+    anchor_key: Mapped[str] = mapped_column(String(255), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class SavedSearchMatch(Base):
+    """A new listing that matched a saved search, in its owner's inbox."""
+    __tablename__ = "saved_search_matches"
+    __table_args__ = (
+        UniqueConstraint("saved_search_id", "vehicle_id", name="uq_saved_search_matches_search_vehicle"),
+        Index("ix_saved_search_matches_user_id_id", "user_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    saved_search_id: Mapped[int] = mapped_column(ForeignKey("saved_searches.id", ondelete="CASCADE"))
+    vehicle_id: Mapped[int] = mapped_column(ForeignKey("vehicles.id", ondelete="CASCADE"))
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    matched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
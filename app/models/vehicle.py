@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Float, Date, Enum, ForeignKey, JSON, DateTime
+from sqlalchemy import Integer, String, Float, Date, Enum, ForeignKey, JSON, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -46,6 +46,13 @@ class VehicleCondition(str, enum.Enum):
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        # Composite (sort key, id) indexes back keyset pagination on search
+        Index("ix_vehicles_created_at_id", "created_at", "id"),
+        Index("ix_vehicles_price_id", "price", "id"),
+        Index("ix_vehicles_year_id", "year", "id"),
+        Index("ix_vehicles_mileage_id", "mileage", "id"),
+    )
     vehicle_type: Mapped[VehicleType] = mapped_column(Enum(VehicleType))
     images = relationship(
         "VehicleImage",
@@ -69,6 +76,10 @@ class Vehicle(Base):
     doors: Mapped[int] = mapped_column(Integer)
     registration_date: Mapped[Optional[Date]] = mapped_column(Date, nullable=True)  # Registration/customs clearance date
     location: Mapped[str] = mapped_column(String(255))
+    # Geocoded from `location` with the bundled town gazetteer; None when no town is recognised
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    geohash: Mapped[Optional[str]] = mapped_column(String(12), nullable=True, index=True)
     seller_type: Mapped[SellerType] = mapped_column(Enum(SellerType))
     import_status: Mapped[ImportStatus] = mapped_column(Enum(ImportStatus))
     condition: Mapped[VehicleCondition] = mapped_column(Enum(VehicleCondition))
@@ -82,3 +93,7 @@ class Vehicle(Base):
     
     # Relationship to user who posted this vehicle
     posted_by = relationship("User", back_populates="vehicles")
+
+# Geohash cell ranges are compared bytewise (see app.vehicles.filters); on
+# PostgreSQL that needs an index in the "C" collation
+Index("ix_vehicles_geohash_c", Vehicle.geohash.collate("C")).ddl_if(dialect="postgresql")
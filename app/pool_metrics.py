@@ -0,0 +1,106 @@
+"""Connection pool instrumentation.
+
+`InstrumentedPool` is the default async queue pool plus counters: how many
+callers are waiting for a connection, how long checkouts wait, how long new
+connections take to open, and how many checkouts timed out. Pool sizing
+(checked out, overflow, idle) comes from the pool itself.
+"""
+import time
+from bisect import bisect_left
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Histogram bucket upper bounds in seconds; a final +Inf bucket is implied
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+class Histogram:
+    def __init__(self, buckets: list[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def stats(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, Prometheus style."""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "buckets": buckets,
+        }
+
+class PoolMetrics:
+    def __init__(self):
+        self.waiting = 0  # Callers blocked in checkout right now
+        self.checkouts = 0
+        self.timeouts = 0  # Checkouts that gave up after the pool timeout
+        self.connects = 0
+        self.connect_errors = 0
+        self.wait_time = Histogram()
+        self.connect_time = Histogram()
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        metrics = self.metrics
+        metrics.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+            metrics.wait_time.observe(time.perf_counter() - started)
+        metrics.checkouts += 1
+        return connection
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            record = super()._create_connection()
+        except Exception:
+            self.metrics.connect_errors += 1
+            raise
+        self.metrics.connects += 1
+        self.metrics.connect_time.observe(time.perf_counter() - started)
+        return record
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        metrics = self.metrics
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": metrics.waiting,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "connects": metrics.connects,
+            "connect_errors": metrics.connect_errors,
+            "wait_seconds": metrics.wait_time.stats(),
+            "connect_seconds": metrics.connect_time.stats(),
+        }
@@ -0,0 +1,137 @@
+"""Per-request profiling: SQL time and count, serialization and password hashing.
+
+When PROFILING_ENABLED is set, `ProfilingMiddleware` picks a share of
+requests (PROFILING_SAMPLE_RATE) and records where their time goes:
+- statements and time spent in the database driver, from engine events on
+  every engine (primary, SQLite reader, replicas)
+- response serialization, both FastAPI's response_model step and pages
+  serialized by the app itself
+- password hashing and verification
+
+Sampled responses carry a `Server-Timing` header. Each sampled request also
+prints one JSON log line with the route, status and timings. Requests that
+are not sampled only pay for one random draw.
+"""
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))  # share of requests profiled, 0-1
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.spans: dict[str, float] = {"serialize": 0.0}  # span name -> seconds
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"']
+        metrics += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.spans.items()]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(metrics)
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+@contextmanager
+def profile_span(name: str):
+    """Add the time spent in the block to the current request's `name` span, if profiled."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+# Engine events
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None and conn.info.get("profile_started"):
+        profile.queries += 1
+        profile.db_time += time.perf_counter() - conn.info["profile_started"].pop()
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("profile_started"):
+        connection.info["profile_started"].pop()
+
+def install_profiling() -> None:
+    """Hook the engine events and FastAPI's response serialization. Call once."""
+    import fastapi.routing
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # Listening on the Engine class covers every engine, including ones created later
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+    # The request handler looks serialize_response up at call time, so wrapping
+    # the module attribute times the response_model step of every route
+    serialize_response = fastapi.routing.serialize_response
+
+    async def timed_serialize_response(*args, **kwargs):
+        with profile_span("serialize"):
+            return await serialize_response(*args, **kwargs)
+
+    fastapi.routing.serialize_response = timed_serialize_response
+
+# Middleware
+
+class ProfilingMiddleware:
+    def __init__(self, app, sample_rate: float = PROFILING_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [*message.get("headers", []), (b"server-timing", profile.server_timing().encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            route = scope.get("route")
+            print(json.dumps({
+                "event": "request_profile",
+                "method": scope["method"],
+                "route": getattr(route, "path", scope["path"]),
+                "status": status,
+                "total_ms": round(profile.elapsed() * 1000, 2),
+                "db_ms": round(profile.db_time * 1000, 2),
+                "queries": profile.queries,
+                **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in profile.spans.items()},
+            }))
@@ -0,0 +1 @@
+# Saved searches package
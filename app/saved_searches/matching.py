@@ -0,0 +1,100 @@
+"""Incremental matching of new listings against saved searches.
+
+Each saved search is indexed by its equality predicates (the enum filters),
+combined into one `anchor_key` such as "fuel_type=petrol;vehicle_type=car".
+A new listing can only match searches whose key is built from a subset of
+its own enum values, so it looks up those 2^5 keys and checks the remaining
+filters of just the searches found, instead of scanning every subscription.
+Searches without any equality filter share the "" key and are checked
+against every new listing.
+"""
+import enum
+from itertools import combinations
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.models.vehicle import FuelType, SellerType, TransmissionType, VehicleCondition, VehicleType
+from app.vehicles.filters import near_point, vehicle_matches
+
+# filter name -> enum it compares against, in anchor key order
+EQUALITY_FILTERS = {
+    "fuel_type": FuelType,
+    "transmission": TransmissionType,
+    "condition": VehicleCondition,
+    "seller_type": SellerType,
+    "vehicle_type": VehicleType,
+}
+_LOOKUP_BATCH = 500
+
+def _member_name(enum_type, value) -> Optional[str]:
+    if isinstance(value, enum.Enum):
+        return value.name
+    for member in enum_type:
+        if value in (member.name, member.value):
+            return member.name
+    return None
+
+def normalize_filters(filters: dict) -> dict:
+    """Drop unset filters and store enum filters by member name."""
+    normalized = {}
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name in EQUALITY_FILTERS:
+            member = _member_name(EQUALITY_FILTERS[name], value)
+            if member is None:
+                raise HTTPException(status_code=400, detail=f"Unknown {name} '{value}'")
+            value = member
+        normalized[name] = value
+    if "near" in normalized:
+        near_point(normalized["near"])  # Rejects unknown places up front
+    return normalized
+
+def anchor_key(filters: dict) -> str:
+    """Index key of a saved search's normalized filters."""
+    return ";".join(f"{name}={filters[name]}" for name in EQUALITY_FILTERS if name in filters)
+
+def _listing_anchor_keys(values: dict) -> list[str]:
+    pairs = [
+        f"{name}={_member_name(enum_type, values[name])}"
+        for name, enum_type in EQUALITY_FILTERS.items()
+        if values.get(name) is not None
+    ]
+    return [";".join(subset) for size in range(len(pairs) + 1) for subset in combinations(pairs, size)]
+
+async def match_saved_searches(db: AsyncSession, listings: list[dict]) -> int:
+    """Add inbox entries for the saved searches new listings match. Returns the count.
+
+    `listings` are the column-value dicts of freshly inserted vehicles,
+    including id and posted_by_id. Runs in the caller's transaction, so the
+    entries commit together with the listings. Users are not notified of
+    their own listings.
+    """
+    keys_by_listing = [(listing, _listing_anchor_keys(listing)) for listing in listings]
+    all_keys = list({key for _, keys in keys_by_listing for key in keys})
+
+    searches_by_key: dict[str, list] = {}
+    for start in range(0, len(all_keys), _LOOKUP_BATCH):
+        result = await db.execute(
+            select(SavedSearch.id, SavedSearch.user_id, SavedSearch.filters, SavedSearch.anchor_key)
+            .where(SavedSearch.anchor_key.in_(all_keys[start:start + _LOOKUP_BATCH]))
+        )
+        for search in result:
+            searches_by_key.setdefault(search.anchor_key, []).append(search)
+    if not searches_by_key:
+        return 0
+
+    matches = [
+        {"user_id": search.user_id, "saved_search_id": search.id, "vehicle_id": listing["id"]}
+        for listing, keys in keys_by_listing
+        for key in keys
+        for search in searches_by_key.get(key, ())
+        if search.user_id != listing["posted_by_id"] and vehicle_matches(search.filters, listing)
+    ]
+    if matches:
+        await db.execute(insert(SavedSearchMatch), matches)
+    return len(matches)
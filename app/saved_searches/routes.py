@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select, update
+from typing import Optional
+
+from app.db import async_session_maker
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.models.user import User
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchOut, SavedSearchInbox
+from app.auth import get_current_active_user
+from app.saved_searches.matching import anchor_key, normalize_filters
+from app.vehicles.listing import fetch_vehicle_cards
+
+router = APIRouter(prefix="/api", tags=["saved-searches"])
+
+async def get_db():
+    async with async_session_maker() as session:
+        yield session
+
+@router.post("/saved-searches", response_model=SavedSearchOut)
+async def create_saved_search(
+    search_data: SavedSearchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Save a set of vehicle search filters; new matching listings go to the inbox."""
+    filters = normalize_filters(search_data.filters.model_dump())
+    saved_search = SavedSearch(
+        user_id=current_user.id,
+        name=search_data.name,
+        filters=filters,
+        anchor_key=anchor_key(filters),
+    )
+    db.add(saved_search)
+    await db.commit()
+    await db.refresh(saved_search)
+    return saved_search
+
+@router.get("/saved-searches", response_model=list[SavedSearchOut])
+async def get_my_saved_searches(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get current user's saved searches."""
+    result = await db.execute(
+        select(SavedSearch).where(SavedSearch.user_id == current_user.id).order_by(SavedSearch.id)
+    )
+    return result.scalars().all()
+
+@router.get("/saved-searches/matches", response_model=SavedSearchInbox)
+async def get_saved_search_matches(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = Query(False, description="Only return matches not yet marked as read"),
+    saved_search_id: Optional[int] = Query(None, description="Only return matches of this saved search"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get current user's inbox of new listings matching their saved searches, newest first."""
+    query = select(SavedSearchMatch).where(SavedSearchMatch.user_id == current_user.id)
+    if unread_only:
+        query = query.where(SavedSearchMatch.is_read.is_(False))
+    if saved_search_id is not None:
+        query = query.where(SavedSearchMatch.saved_search_id == saved_search_id)
+    result = await db.execute(
+        query.order_by(SavedSearchMatch.id.desc()).offset((page - 1) * limit).limit(limit)
+    )
+    matches = result.scalars().all()
+
+    unread = await db.scalar(
+        select(func.count()).select_from(SavedSearchMatch)
+        .where(SavedSearchMatch.user_id == current_user.id, SavedSearchMatch.is_read.is_(False))
+    )
+    cards = {card.id: card for card in await fetch_vehicle_cards(db, [match.vehicle_id for match in matches])}
+    return {
+        "unread": unread,
+        "matches": [
+            {
+                "id": match.id,
+                "saved_search_id": match.saved_search_id,
+                "is_read": match.is_read,
+                "matched_at": match.matched_at,
+                "vehicle": cards[match.vehicle_id],
+            }
+            for match in matches
+            if match.vehicle_id in cards
+        ],
+    }
+
+@router.post("/saved-searches/matches/read")
+async def mark_saved_search_matches_read(
+    saved_search_id: Optional[int] = Query(None, description="Only mark matches of this saved search"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark current user's inbox matches as read."""
+    query = update(SavedSearchMatch).where(
+        SavedSearchMatch.user_id == current_user.id, SavedSearchMatch.is_read.is_(False)
+    )
+    if saved_search_id is not None:
+        query = query.where(SavedSearchMatch.saved_search_id == saved_search_id)
+    result = await db.execute(query.values(is_read=True))
+    await db.commit()
+    return {"message": f"Marked {result.rowcount} matches as read"}
+
+@router.delete("/saved-searches/{saved_search_id}")
+async def delete_saved_search(
+    saved_search_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete one of current user's saved searches and its inbox matches."""
+    saved_search = await db.get(SavedSearch, saved_search_id)
+    if saved_search is None or saved_search.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+
+    await db.execute(delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == saved_search_id))
+    await db.delete(saved_search)
+    await db.commit()
+    return {"message": "Saved search deleted successfully"}
@@ -0,0 +1,39 @@
+"""Startup schema check: create missing tables and bring existing ones up to date.
+
+There are no migrations. `create_all` only creates missing tables, so the
+ensure_* steps add what it skips on existing ones (new columns and indexes,
+the text index) and geocode rows stored before coordinates existed. A
+fingerprint of the models is recorded afterwards, letting later startups
+skip all of it while the models are unchanged.
+
+The app's warm-up runs this, so every way of starting it (run.py, uvicorn
+directly, the Docker image) gets the same schema.
+"""
+from app.db import (
+    engine, Base, ensure_columns, ensure_indexes,
+    record_schema_fingerprint, schema_fingerprint, stored_schema_fingerprint,
+)
+from app.vehicles.search import POSTGRES_DDL, SQLITE_DDL, ensure_search_index
+from app.vehicles.writes import backfill_geocodes
+# Import models to ensure they are registered with SQLAlchemy before fingerprinting
+import app.models
+import app.models.dealer_profile
+
+async def ensure_schema() -> None:
+    """Create and update the tables, unless the stored schema fingerprint is current."""
+    fingerprint = schema_fingerprint(*SQLITE_DDL, *POSTGRES_DDL)
+    if await stored_schema_fingerprint() == fingerprint:
+        print("✅ Database schema is current, skipping table checks")
+        return
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add new columns, indexes and the text index separately
+        await conn.run_sync(ensure_columns)
+        await conn.run_sync(ensure_indexes)
+        await conn.run_sync(ensure_search_index)
+        geocoded = await conn.run_sync(backfill_geocodes)
+        if geocoded:
+            print(f"📍 Geocoded {geocoded} existing vehicle locations")
+        await conn.run_sync(record_schema_fingerprint, fingerprint)
+    print("✅ Database tables created/verified")
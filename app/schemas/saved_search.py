@@ -0,0 +1,56 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.schemas.vehicle import VehicleCard
+
+class SavedSearchFilters(BaseModel):
+    """The /api/vehicles search filters; enum filters take a member's name or value"""
+    q: Optional[str] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    location: Optional[str] = None
+    near: Optional[str] = None  # "lat,lng" or a town name
+    radius_km: Optional[float] = Field(None, gt=0, le=500)
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    min_year: Optional[int] = Field(None, ge=1900)
+    max_year: Optional[int] = Field(None, le=2030)
+    min_mileage: Optional[int] = Field(None, ge=0)
+    max_mileage: Optional[int] = Field(None, ge=0)
+    min_engine_size: Optional[float] = Field(None, ge=0)
+    max_engine_size: Optional[float] = Field(None, ge=0)
+    fuel_type: Optional[str] = None
+    transmission: Optional[str] = None
+    body_type: Optional[str] = None
+    condition: Optional[str] = None
+    seller_type: Optional[str] = None
+    vehicle_type: Optional[str] = None
+    features: Optional[str] = None  # Comma-separated, all required
+
+    class Config:
+        extra = "forbid"
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    filters: SavedSearchFilters
+
+class SavedSearchOut(BaseModel):
+    id: int
+    name: str
+    filters: SavedSearchFilters
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SavedSearchMatchOut(BaseModel):
+    id: int
+    saved_search_id: int
+    is_read: bool
+    matched_at: datetime
+    vehicle: VehicleCard
+
+class SavedSearchInbox(BaseModel):
+    unread: int  # Unread matches across all of the user's saved searches
+    matches: List[SavedSearchMatchOut] = []
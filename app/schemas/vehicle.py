@@ -86,6 +86,8 @@ class VehicleBase(BaseModel):
 class VehicleOut(VehicleBase):
     id: int
     posted_by_id: int
+    latitude: Optional[float] = None  # Geocoded from location, when the town is known
+    longitude: Optional[float] = None
     created_at: datetime
     updated_at: datetime
     images: List[VehicleImageOut] = []
@@ -93,9 +95,74 @@ class VehicleOut(VehicleBase):
     class Config:
         from_attributes = True
 
+class VehicleCard(BaseModel):
+    """Compact listing for grid views"""
+    id: int
+    title: str
+    price: float  # LKR
+    year: int
+    mileage: int  # kilometers
+    image_url: Optional[str] = None  # First image, if any
+
+    class Config:
+        from_attributes = True
+
 class VehicleCreate(VehicleBase):
     images: Optional[List[VehicleImageCreate]] = []
 
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
+class PriceFacetBucket(FacetBucket):
+    min_price: Optional[float] = None  # Inclusive
+    max_price: Optional[float] = None  # Exclusive; None means no upper bound
+
+class VehicleFacets(BaseModel):
+    total: int  # Listings matching every filter
+    make: List[FacetBucket] = []
+    fuel_type: List[FacetBucket] = []
+    transmission: List[FacetBucket] = []
+    condition: List[FacetBucket] = []
+    vehicle_type: List[FacetBucket] = []
+    price: List[PriceFacetBucket] = []
+
+class VehicleImportRow(BaseModel):
+    line: int  # Line of the upload the row starts on
+    status: str  # "created" or "error"
+    id: Optional[int] = None  # New vehicle id when created
+    errors: List[str] = []
+
+class VehicleImportReport(BaseModel):
+    created: int
+    failed: int
+    results: List[VehicleImportRow] = []
+
+class VehicleSuggestion(BaseModel):
+    field: str  # "make", "model" or "variant"
+    text: str  # e.g. "Toyota Axio"
+    make: str
+    model: Optional[str] = None
+    variant: Optional[str] = None
+    count: int  # Listings with this make/model/variant
+
+class VehicleValuation(BaseModel):
+    make: str
+    model: str
+    year: int
+    min_mileage: Optional[int] = None  # Mileage band in km; both None when all mileages are covered
+    max_mileage: Optional[int] = None  # Exclusive; None means no upper bound
+    listing_count: int
+    price_min: float  # LKR
+    price_p10: float
+    price_p25: float
+    price_median: float
+    price_p75: float
+    price_p90: float
+    price_max: float
+    price_mean: float
+    updated_at: datetime
+
 # Import UserSummary with forward reference to avoid circular imports
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -0,0 +1,123 @@
+"""Slow-query log with automatic EXPLAIN capture.
+
+`SlowQueryLog.watch` times every statement an engine runs. Statements that
+take longer than the threshold are printed with their parameters and kept
+in two places:
+- a ring buffer of the latest slow executions
+- a table of the worst offenders, one row per distinct SQL text with its
+  count and durations, holding at most `size` statements ranked by their
+  slowest run
+
+The first time a statement lands in that table, a background task runs
+EXPLAIN on it (EXPLAIN QUERY PLAN on SQLite) with the same parameters and
+stores the plan on the row. The slow request never waits for it.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+# Execution option that keeps a statement out of the log (set on the EXPLAIN runs)
+SKIP_OPTION = "skip_slow_query_log"
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+_PARAMETERS_LENGTH = 500  # characters of the parameters kept per statement
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    return text if len(text) <= _PARAMETERS_LENGTH else text[:_PARAMETERS_LENGTH] + "..."
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, size: int):
+        self.threshold = threshold_ms / 1000  # seconds; 0 or less disables the log
+        self.size = size
+        self.recent = deque(maxlen=size)
+        self._statements: dict[str, dict] = {}  # SQL text -> aggregate row
+        self._explaining: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()  # Keeps EXPLAIN tasks referenced until done
+
+    def watch(self, engine_, explain_engine=None) -> None:
+        """Time the statements of an async engine, explaining slow ones on `explain_engine`.
+
+        `explain_engine` defaults to the engine itself; tuned SQLite mode
+        passes the reader so EXPLAIN never queues for the single writer.
+        """
+        if self.threshold <= 0:
+            return
+        explain_engine = explain_engine or engine_
+
+        @event.listens_for(engine_.sync_engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._slow_query_started = time.perf_counter()
+
+        @event.listens_for(engine_.sync_engine, "after_cursor_execute")
+        def _finish(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_slow_query_started", None)
+            if started is None or context.execution_options.get(SKIP_OPTION):
+                return
+            duration = time.perf_counter() - started
+            if duration >= self.threshold:
+                self.record(statement, parameters, duration, executemany, explain_engine)
+
+    def record(self, statement: str, parameters, duration: float, executemany: bool, explain_engine) -> None:
+        duration_ms = round(duration * 1000, 2)
+        parameters_text = _format_parameters(parameters)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        print(f"🐢 Slow query ({duration_ms:.0f} ms): {' '.join(statement.split())} | parameters: {parameters_text}")
+        self.recent.append({"statement": statement, "parameters": parameters_text, "duration_ms": duration_ms, "at": now})
+
+        entry = self._statements.get(statement)
+        if entry is None:
+            if len(self._statements) >= self.size:
+                mildest = min(self._statements, key=lambda key: self._statements[key]["max_ms"])
+                if self._statements[mildest]["max_ms"] >= duration_ms:
+                    return
+                del self._statements[mildest]
+            entry = self._statements[statement] = {
+                "statement": statement,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "plan": None,
+            }
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + duration_ms, 2)
+        if duration_ms >= entry["max_ms"]:
+            entry.update(max_ms=duration_ms, parameters=parameters_text)
+        entry["last_seen"] = now
+
+        explainable = statement.lstrip().lower().startswith(_EXPLAINABLE)
+        if entry["plan"] is None and explainable and not executemany and statement not in self._explaining:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # Not on an event loop (sync use of the engine); skip the plan
+            self._explaining.add(statement)
+            task = loop.create_task(self._explain(explain_engine, statement, parameters))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, engine_, statement: str, parameters) -> None:
+        prefix = "EXPLAIN QUERY PLAN " if engine_.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            async with engine_.connect() as connection:
+                connection = await connection.execution_options(**{SKIP_OPTION: True})
+                result = await connection.exec_driver_sql(prefix + statement, parameters)
+                # SQLite plan rows end with the step's detail; PostgreSQL returns one text column
+                plan = [str(row[-1]) for row in result.all()]
+        except Exception as e:
+            plan = [f"EXPLAIN failed: {e}"]
+        finally:
+            self._explaining.discard(statement)
+        entry = self._statements.get(statement)
+        if entry is not None:
+            entry["plan"] = plan
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "top": sorted(self._statements.values(), key=lambda entry: entry["max_ms"], reverse=True),
+            "recent": list(reversed(self.recent)),
+        }
@@ -9,6 +9,7 @@ from app.auth import (
     authenticate_user, create_access_token, get_password_hash,
     get_current_active_user, get_db, ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.db import get_primary_read_db
 from app.models.user import User
 from app.models.dealer_profile import DealerProfile
 from app.schemas.user import UserCreate, UserRead, UserLogin, Token, UserCreateWithDealer
@@ -122,7 +123,7 @@ async def register_simple(user_data: UserCreate, db: AsyncSession = Depends(get_
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_primary_read_db)):
     """Login and get access token."""
     user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
@@ -142,7 +143,7 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """Login with OAuth2 form and get access token (for OpenAPI docs)."""
     user = await authenticate_user(db, form_data.username, form_data.password)
@@ -163,7 +164,7 @@ async def login_for_access_token(
 @router.get("/me", response_model=UserRead)
 async def read_users_me(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """Get current user information."""
     # Re-fetch the user with dealer profile to ensure proper loading
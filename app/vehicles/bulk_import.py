@@ -0,0 +1,207 @@
+"""Bulk vehicle import from NDJSON or CSV uploads.
+
+Rows are parsed and validated against VehicleCreate while the request body
+streams in. Valid rows are inserted in chunks of IMPORT_BATCH_SIZE, one
+transaction per chunk, using multi-row INSERTs for the vehicles and their
+images. A chunk the database rejects is retried row by row so one bad row
+only fails itself. Every row gets an entry in the returned report.
+"""
+import codecs
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.vehicle import Vehicle
+from app.models.vehicle_image import VehicleImage
+from app.saved_searches.matching import match_saved_searches
+from app.schemas.vehicle import VehicleCreate
+from app.vehicles.events import CREATED, VehicleChange, notify_vehicles_changed
+from app.vehicles.features import sync_vehicle_features
+from app.vehicles.search import index_new_vehicles
+from app.vehicles.valuation import record_listing_prices
+from app.vehicles.writes import vehicle_values
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+NDJSON = "ndjson"
+CSV = "csv"
+IMPORT_FORMATS = (NDJSON, CSV)
+
+_CONTENT_TYPES = {
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "text/csv": CSV,
+}
+
+# CSV cells holding lists use "|" between items
+_LIST_SEPARATOR = "|"
+
+def detect_import_format(format: Optional[str], content_type: Optional[str]) -> str:
+    """Pick the upload format from ?format=, else from the Content-Type header."""
+    if format:
+        if format not in IMPORT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid format '{format}'. Valid options: {', '.join(IMPORT_FORMATS)}"
+            )
+        return format
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[media_type]
+    raise HTTPException(
+        status_code=415,
+        detail=f"Unsupported upload type. Send {', '.join(_CONTENT_TYPES)} or pass ?format="
+    )
+
+async def _lines(chunks: AsyncIterator[bytes]):
+    """Yield (line number, text) for each line of a streamed UTF-8 body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    number = 0
+    async for chunk in chunks:
+        try:
+            buffer += decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail=f"Upload is not valid UTF-8 (after line {number})")
+        *complete, buffer = buffer.split("\n")
+        for line in complete:
+            number += 1
+            yield number, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield number + 1, buffer.rstrip("\r")
+
+async def _ndjson_records(lines):
+    async for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, [f"Invalid JSON: {exc}"]
+            continue
+        if not isinstance(record, dict):
+            yield number, None, ["Each line must be a JSON object"]
+            continue
+        yield number, record, None
+
+def _csv_record(header: list[str], cells: list[str]) -> dict:
+    record = {}
+    for name, cell in zip(header, cells):
+        cell = cell.strip()
+        if name in ("images", "features"):
+            items = [item.strip() for item in cell.split(_LIST_SEPARATOR) if item.strip()]
+            if name == "images":
+                items = [{"url": url} for url in items]
+            record[name] = items or None
+        else:
+            # Empty cells are explicit nulls so optional columns can be left blank
+            record[name] = cell or None
+    return record
+
+async def _csv_records(lines):
+    header = None
+    pending, start = [], None
+    async for number, line in lines:
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+        start = start or number
+        # A quoted cell may span physical lines; wait until the quotes balance
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        cells = next(csv.reader(io.StringIO("\n".join(pending))))
+        pending, record_line = [], start
+        start = None
+        if header is None:
+            header = [name.strip() for name in cells]
+            continue
+        if len(cells) != len(header):
+            yield record_line, None, [f"Expected {len(header)} columns, got {len(cells)}"]
+            continue
+        yield record_line, _csv_record(header, cells), None
+    if pending:
+        yield start, None, ["Unterminated quoted field"]
+
+def _validation_errors(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+async def _insert_rows(db: AsyncSession, batch: list, posted_by_id: int) -> list[VehicleChange]:
+    rows = [vehicle_values(data, posted_by_id) for _, data in batch]
+    result = await db.execute(
+        insert(Vehicle).returning(Vehicle.id, sort_by_parameter_order=True), rows
+    )
+    ids = result.scalars().all()
+
+    images = [
+        {"vehicle_id": vehicle_id, "url": image.url}
+        for vehicle_id, (_, data) in zip(ids, batch)
+        for image in data.images or []
+    ]
+    if images:
+        await db.execute(insert(VehicleImage), images)
+
+    documents = [{**values, "id": vehicle_id} for vehicle_id, values in zip(ids, rows)]
+    await index_new_vehicles(db, documents)
+    await record_listing_prices(db, rows)
+    await sync_vehicle_features(db, [(document["id"], document["features"]) for document in documents])
+    await match_saved_searches(db, documents)
+    return [VehicleChange(CREATED, document["id"], document) for document in documents]
+
+async def _import_batch(db: AsyncSession, batch: list, posted_by_id: int) -> list[dict]:
+    try:
+        changes = await _insert_rows(db, batch, posted_by_id)
+        await db.commit()
+    except DBAPIError as exc:
+        await db.rollback()
+        if len(batch) == 1:
+            line, _ = batch[0]
+            return [{"line": line, "status": "error", "errors": [f"Database error: {exc.orig}"]}]
+        results = []
+        for row in batch:
+            results.extend(await _import_batch(db, [row], posted_by_id))
+        return results
+
+    # Core inserts skip the session hooks, so publish the changes here
+    notify_vehicles_changed(changes)
+    return [
+        {"line": line, "status": "created", "id": change.id}
+        for (line, _), change in zip(batch, changes)
+    ]
+
+async def import_vehicles(
+    db: AsyncSession, chunks: AsyncIterator[bytes], import_format: str, posted_by_id: int
+) -> dict:
+    """Validate and insert every row of an upload, returning a per-row report."""
+    parse = _ndjson_records if import_format == NDJSON else _csv_records
+    results = []
+    batch = []
+    async for line, record, errors in parse(_lines(chunks)):
+        if errors is None:
+            try:
+                batch.append((line, VehicleCreate.model_validate(record)))
+            except ValidationError as exc:
+                errors = _validation_errors(exc)
+        if errors is not None:
+            results.append({"line": line, "status": "error", "errors": errors})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            results.extend(await _import_batch(db, batch, posted_by_id))
+            batch = []
+    if batch:
+        results.extend(await _import_batch(db, batch, posted_by_id))
+
+    results.sort(key=lambda result: result["line"])
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "results": results}
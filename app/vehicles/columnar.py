@@ -0,0 +1,363 @@
+"""Optional in-process columnar index for numeric and enum search filters.
+
+The price, year, mileage, engine size, created_at and enum columns of every
+listing are kept in packed NumPy arrays. A search whose filters all live in
+those columns is answered here: matches are found with vectorized masks,
+walking the requested sort order chunk by chunk until the page is full.
+Only the ids of that page are then loaded from the database. Searches that
+use text filters (q, make, model, location, body_type) or relevance order
+fall back to SQL.
+
+Enabled with COLUMNAR_INDEX_ENABLED; built at startup and kept in sync from
+vehicle change events. Changes whose values are incomplete (server defaults,
+image-only changes) are re-read from the database before the next search.
+The index is per process: writes made by other worker processes are not
+seen, so only enable it when every write goes through this process.
+"""
+import calendar
+import enum
+import math
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session_maker
+from app.models.vehicle import FuelType, SellerType, TransmissionType, Vehicle, VehicleCondition, VehicleType
+from app.vehicles.events import DELETED, on_vehicles_changed
+from app.vehicles.pagination import RELEVANCE_SORT, decode_cursor, get_sort_option
+
+COLUMNAR_INDEX_ENABLED = os.getenv("COLUMNAR_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Rows examined per step while filling a page in sort order
+_SCAN_CHUNK = 65536
+# Changes applied in one event beyond which sort orders are rebuilt instead of patched
+_INCREMENTAL_LIMIT = 64
+_REFRESH_BATCH = 500
+
+# column -> array dtype; engine_size may be NULL and is kept as NaN
+_NUMERIC = {
+    "price": np.float64,
+    "year": np.int16,
+    "mileage": np.int32,
+    "engine_size": np.float64,
+    "created_at": np.int64,  # microseconds since the epoch
+}
+_ENUMS = {
+    "fuel_type": FuelType,
+    "transmission": TransmissionType,
+    "condition": VehicleCondition,
+    "seller_type": SellerType,
+    "vehicle_type": VehicleType,
+}
+_COLUMNS = [*_NUMERIC, *_ENUMS]
+
+# search filter -> (column, comparison)
+_RANGE_FILTERS = {
+    "min_price": ("price", np.greater_equal),
+    "max_price": ("price", np.less_equal),
+    "min_year": ("year", np.greater_equal),
+    "max_year": ("year", np.less_equal),
+    "min_mileage": ("mileage", np.greater_equal),
+    "max_mileage": ("mileage", np.less_equal),
+    "min_engine_size": ("engine_size", np.greater_equal),
+    "max_engine_size": ("engine_size", np.less_equal),
+}
+SUPPORTED_FILTERS = {*_RANGE_FILTERS, *_ENUMS}
+
+# Enum filters accept a member's name or its value, like the SQL Enum type
+_ENUM_CODES = {
+    column: {
+        **{member.name: code for code, member in enumerate(enum_type)},
+        **{member.value: code for code, member in enumerate(enum_type)},
+    }
+    for column, enum_type in _ENUMS.items()
+}
+
+def _timestamp(value: datetime) -> int:
+    # SQLite returns naive timestamps; the database clock is UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return calendar.timegm(value.timetuple()) * 1_000_000 + value.microsecond
+
+def _encode(column: str, value):
+    if column in _ENUMS:
+        if value is None:
+            return -1
+        return _ENUM_CODES[column].get(value.name if isinstance(value, enum.Enum) else value, -1)
+    if column == "created_at":
+        return _timestamp(value)
+    if value is None:
+        return np.nan
+    return value
+
+class _SortOrder:
+    """Row positions ordered by (key, id) ascending, with the keys alongside for seeks."""
+
+    def __init__(self, keys: np.ndarray, ids: np.ndarray, rows: np.ndarray):
+        order = np.lexsort((ids[rows], keys[rows]))
+        self.rows = rows[order]
+        self.keys = keys[self.rows]
+        self.ids = ids[self.rows]
+
+    def _locate(self, key, vehicle_id: int, side: str) -> int:
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        return int(lo + np.searchsorted(self.ids[lo:hi], vehicle_id, side=side))
+
+    def remove(self, key, vehicle_id: int) -> None:
+        position = self._locate(key, vehicle_id, "left")
+        if position < len(self.ids) and self.ids[position] == vehicle_id:
+            self.rows = np.delete(self.rows, position)
+            self.keys = np.delete(self.keys, position)
+            self.ids = np.delete(self.ids, position)
+
+    def insert(self, key, vehicle_id: int, row: int) -> None:
+        position = self._locate(key, vehicle_id, "left")
+        self.rows = np.insert(self.rows, position, row)
+        self.keys = np.insert(self.keys, position, key)
+        self.ids = np.insert(self.ids, position, vehicle_id)
+
+    def before(self, key, vehicle_id: int) -> int:
+        """Position of the first entry not ordered before (key, id)."""
+        return self._locate(key, vehicle_id, "left")
+
+    def after(self, key, vehicle_id: int) -> int:
+        """Position of the first entry ordered after (key, id)."""
+        return self._locate(key, vehicle_id, "right")
+
+class ColumnarIndex:
+    def __init__(self):
+        self.ready = False
+        self._building = False
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._columns = {column: np.empty(0, dtype=_column_dtype(column)) for column in _COLUMNS}
+        self._rows: dict[int, int] = {}  # vehicle id -> array position
+        self._orders: dict[str, _SortOrder] = {}  # sort column -> order; built lazily
+        self._stale: set[int] = set()  # ids to re-read from the database
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # Building and syncing
+
+    async def build(self, db: AsyncSession) -> None:
+        """Load every listing from the database and replace the index contents."""
+        self._building = True
+        try:
+            ids, values = [], {column: [] for column in _COLUMNS}
+            result = await db.stream(
+                select(Vehicle.id, *(getattr(Vehicle, column) for column in _COLUMNS))
+                .execution_options(yield_per=10_000)
+            )
+            async for rows in result.partitions():
+                for row in rows:
+                    ids.append(row.id)
+                    for column in _COLUMNS:
+                        values[column].append(_encode(column, getattr(row, column)))
+
+            self._ids = np.array(ids, dtype=np.int64)
+            self._columns = {
+                column: np.array(values[column], dtype=_column_dtype(column)) for column in _COLUMNS
+            }
+            self._alive = np.ones(len(ids), dtype=bool)
+            self._size = len(ids)
+            self._rows = {vehicle_id: row for row, vehicle_id in enumerate(ids)}
+            self._orders.clear()
+            self.ready = True
+        finally:
+            self._building = False
+
+    def apply(self, changes) -> None:
+        """Apply committed vehicle changes; incomplete ones are re-read later."""
+        if len(changes) > _INCREMENTAL_LIMIT:
+            self._orders.clear()
+        for change in changes:
+            if self._building:
+                self._stale.add(change.id)
+            elif change.action == DELETED:
+                self._remove(change.id)
+            elif change.values is not None and all(column in change.values for column in _COLUMNS):
+                self._upsert(change.id, {column: _encode(column, change.values[column]) for column in _COLUMNS})
+            else:
+                self._stale.add(change.id)
+
+    async def refresh_stale(self, db: AsyncSession) -> None:
+        """Re-read listings whose latest values are not known from their change events."""
+        while self._stale:
+            batch = [self._stale.pop() for _ in range(min(len(self._stale), _REFRESH_BATCH))]
+            result = await db.execute(
+                select(Vehicle.id, *(getattr(Vehicle, column) for column in _COLUMNS))
+                .where(Vehicle.id.in_(batch))
+            )
+            found = set()
+            for row in result:
+                found.add(row.id)
+                self._upsert(row.id, {column: _encode(column, getattr(row, column)) for column in _COLUMNS})
+            for vehicle_id in set(batch) - found:
+                self._remove(vehicle_id)
+
+    def _upsert(self, vehicle_id: int, encoded: dict) -> None:
+        row = self._rows.get(vehicle_id)
+        if row is None:
+            row = self._append(vehicle_id)
+        else:
+            for column, order in self._orders.items():
+                order.remove(self._columns[column][row], vehicle_id)
+        for column, value in encoded.items():
+            self._columns[column][row] = value
+        self._alive[row] = True
+        for column, order in self._orders.items():
+            order.insert(self._columns[column][row], vehicle_id, row)
+
+    def _append(self, vehicle_id: int) -> int:
+        if self._size == len(self._ids):
+            capacity = max(1024, 2 * len(self._ids))
+            self._ids = _grow(self._ids, capacity)
+            self._alive = _grow(self._alive, capacity)
+            self._columns = {column: _grow(values, capacity) for column, values in self._columns.items()}
+        row = self._size
+        self._size += 1
+        self._ids[row] = vehicle_id
+        self._rows[vehicle_id] = row
+        return row
+
+    def _remove(self, vehicle_id: int) -> None:
+        row = self._rows.pop(vehicle_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        for column, order in self._orders.items():
+            order.remove(self._columns[column][row], vehicle_id)
+
+    # Searching
+
+    def can_answer(self, filters: dict, sort: str) -> bool:
+        if not self.ready or sort == RELEVANCE_SORT:
+            return False
+        column, _ = get_sort_option(sort)
+        if column.key not in _NUMERIC:
+            return False
+        return all(value is None or name in SUPPORTED_FILTERS for name, value in filters.items())
+
+    def _order(self, column: str) -> _SortOrder:
+        order = self._orders.get(column)
+        if order is None:
+            live_rows = np.flatnonzero(self._alive[:self._size])
+            order = self._orders[column] = _SortOrder(self._columns[column], self._ids, live_rows)
+        return order
+
+    def _predicates(self, filters: dict) -> Optional[list]:
+        predicates = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name in _RANGE_FILTERS:
+                column, compare = _RANGE_FILTERS[name]
+                values = self._columns[column]
+                predicates.append((values, compare, _bound(values.dtype, compare, value)))
+            else:
+                code = _ENUM_CODES[name].get(value)
+                if code is None:
+                    return None  # Unknown enum value: nothing can match
+                predicates.append((self._columns[name], np.equal, code))
+        return predicates
+
+    def page_ids(self, filters: dict, sort: str, page: int, limit: int, cursor: Optional[str]) -> list[int]:
+        """Ids of one page of matches in `sort` order, by offset or after a cursor.
+
+        The first chunk of the sort order is checked row by row, which fills
+        the page at once for broad searches. Narrow searches instead mask the
+        whole columns in storage order and sort only the matches.
+        """
+        column, descending = get_sort_option(sort)
+        order = self._order(column.key)
+        rows = order.rows
+
+        offset = (page - 1) * limit
+        position = None
+        if cursor:
+            payload = decode_cursor(cursor)
+            if payload["s"] != sort:
+                raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+            position = (_encode(column.key, payload["v"]), payload["id"])
+            if descending:
+                rows = rows[:order.before(*position)]
+            else:
+                rows = rows[order.after(*position):]
+            offset = 0
+        if descending:
+            rows = rows[::-1]
+
+        predicates = self._predicates(filters)
+        if predicates is None:
+            return []
+        needed = offset + limit
+
+        chunk = rows[:_SCAN_CHUNK]
+        mask = np.ones(len(chunk), dtype=bool)
+        for values, compare, bound in predicates:
+            mask &= compare(values[chunk], bound)
+        hits = chunk[mask]
+        if len(hits) >= needed or len(rows) <= _SCAN_CHUNK:
+            return self._ids[hits[offset:needed]].tolist()
+
+        mask = self._alive[:self._size].copy()
+        scratch = np.empty_like(mask)
+        for values, compare, bound in predicates:
+            mask &= compare(values[:self._size], bound, out=scratch)
+        matched = np.flatnonzero(mask)
+        keys, ids = self._columns[column.key][matched], self._ids[matched]
+        if position is not None:
+            key, vehicle_id = position
+            if descending:
+                keep = (keys < key) | ((keys == key) & (ids < vehicle_id))
+            else:
+                keep = (keys > key) | ((keys == key) & (ids > vehicle_id))
+            keys, ids = keys[keep], ids[keep]
+        ranked = np.lexsort((ids, keys))
+        if descending:
+            ranked = ranked[::-1]
+        return ids[ranked[offset:needed]].tolist()
+
+    async def search_ids(
+        self, db: AsyncSession, filters: dict, sort: str, page: int, limit: int, cursor: Optional[str]
+    ) -> Optional[list[int]]:
+        """Ids for one page of results, or None when the search needs SQL."""
+        if not self.can_answer(filters, sort):
+            return None
+        if self._stale:
+            # The changes were written to the primary; a replica may not have them yet
+            async with async_session_maker() as session:
+                await self.refresh_stale(session)
+        return self.page_ids(filters, sort, page, limit, cursor)
+
+def _bound(dtype: np.dtype, compare, value):
+    """A range bound in the column's own dtype, so comparisons need no upcast copy."""
+    if not np.issubdtype(dtype, np.integer):
+        return float(value)
+    # Integer columns: round the bound inwards, then clamp it to the dtype's range
+    value = math.ceil(value) if compare is np.greater_equal else math.floor(value)
+    limits = np.iinfo(dtype)
+    return dtype.type(min(max(value, limits.min), limits.max))
+
+def _column_dtype(column: str):
+    return _NUMERIC.get(column, np.int8)
+
+def _grow(values: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+columnar_index = ColumnarIndex()
+
+@on_vehicles_changed
+def _sync_columnar_index(changes):
+    if COLUMNAR_INDEX_ENABLED:
+        columnar_index.apply(changes)
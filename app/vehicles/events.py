@@ -0,0 +1,93 @@
+"""Notifications about committed vehicle changes.
+
+Session hooks record every Vehicle (and VehicleImage) insert, update and
+delete at flush time and publish them once the transaction commits, so
+in-process caches and indexes stay correct whichever code path wrote the
+row. Writes that bypass the ORM (bulk Core inserts) call
+`notify_vehicles_changed` themselves.
+
+Listeners run synchronously right after commit and must be quick and
+must not touch the database.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.vehicle import Vehicle
+from app.models.vehicle_image import VehicleImage
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+@dataclass
+class VehicleChange:
+    action: str  # CREATED, UPDATED or DELETED
+    id: int
+    # Loaded column values at the time of the change. None when only the
+    # vehicle's images changed and its own row is untouched.
+    values: Optional[dict] = None
+    # For updates, the pre-change values of the columns that changed
+    previous: Optional[dict] = None
+
+_listeners: list[Callable[[list[VehicleChange]], None]] = []
+_PENDING_KEY = "vehicle_changes"
+_COLUMNS = [column.key for column in Vehicle.__table__.columns]
+
+def on_vehicles_changed(listener: Callable[[list[VehicleChange]], None]):
+    """Register `listener(changes)` to run after vehicle changes commit."""
+    _listeners.append(listener)
+    return listener
+
+def notify_vehicles_changed(changes: list[VehicleChange]) -> None:
+    """Publish committed changes to every registered listener."""
+    if not changes:
+        return
+    for listener in _listeners:
+        listener(changes)
+
+def snapshot(vehicle) -> dict:
+    """Column values already loaded on `vehicle`, without emitting SQL."""
+    loaded = inspect(vehicle).dict
+    return {key: loaded[key] for key in _COLUMNS if key in loaded}
+
+def _previous_values(vehicle) -> dict:
+    attrs = inspect(vehicle).attrs
+    previous = {}
+    for key in _COLUMNS:
+        history = attrs[key].history
+        if history.deleted:
+            previous[key] = history.deleted[0]
+    return previous
+
+@event.listens_for(Session, "after_flush")
+def _record_vehicle_changes(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Vehicle):
+            changes.append(VehicleChange(CREATED, obj.id, snapshot(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, Vehicle) and session.is_modified(obj, include_collections=False):
+            changes.append(VehicleChange(UPDATED, obj.id, snapshot(obj), _previous_values(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Vehicle):
+            changes.append(VehicleChange(DELETED, obj.id, snapshot(obj)))
+
+    touched = {change.id for change in changes}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, VehicleImage) and obj.vehicle_id is not None and obj.vehicle_id not in touched:
+            changes.append(VehicleChange(UPDATED, obj.vehicle_id))
+            touched.add(obj.vehicle_id)
+
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+@event.listens_for(Session, "after_commit")
+def _publish_vehicle_changes(session):
+    notify_vehicles_changed(session.info.pop(_PENDING_KEY, []))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_vehicle_changes(session):
+    session.info.pop(_PENDING_KEY, None)
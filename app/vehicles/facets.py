@@ -0,0 +1,104 @@
+"""Facet counts for vehicle search.
+
+All facets are computed from one grouped aggregate. Filters that no facet
+owns go in the WHERE clause. Each facet's own filter becomes a 0/1 column in
+the GROUP BY instead. A facet's counts then sum the groups that pass every
+other facet's filter, so each facet ignores its own selection.
+"""
+import enum
+import os
+from collections import defaultdict
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.models.vehicle import Vehicle
+from app.vehicles.events import on_vehicles_changed
+from app.vehicles.filters import build_vehicle_filters
+
+FACETS_CACHE_TTL = float(os.getenv("FACETS_CACHE_TTL", "30"))  # seconds
+
+# Lower bounds of the price buckets in LKR; the last bucket is open-ended
+PRICE_BUCKETS = [0, 1_000_000, 2_500_000, 5_000_000, 7_500_000, 10_000_000, 20_000_000]
+
+_price_bucket = case(
+    *[(Vehicle.price >= lower, index) for index, lower in reversed(list(enumerate(PRICE_BUCKETS)))],
+    else_=0,
+)
+
+# facet name -> (grouping expression, search filters the facet ignores)
+FACETS = {
+    "make": (Vehicle.make, ("make",)),
+    "fuel_type": (Vehicle.fuel_type, ("fuel_type",)),
+    "transmission": (Vehicle.transmission, ("transmission",)),
+    "condition": (Vehicle.condition, ("condition",)),
+    "vehicle_type": (Vehicle.vehicle_type, ("vehicle_type",)),
+    "price": (_price_bucket, ("min_price", "max_price")),
+}
+
+facets_cache = TTLCache(ttl=FACETS_CACHE_TTL, max_entries=512)
+
+@on_vehicles_changed
+def _clear_facets_cache(changes):
+    facets_cache.clear()
+
+def _price_buckets(counts: dict) -> list[dict]:
+    buckets = []
+    for index, lower in enumerate(PRICE_BUCKETS):
+        upper = PRICE_BUCKETS[index + 1] if index + 1 < len(PRICE_BUCKETS) else None
+        buckets.append({
+            "value": f"{lower}-{upper}" if upper is not None else f"{lower}+",
+            "min_price": lower,
+            "max_price": upper,
+            "count": counts.get(index, 0),
+        })
+    return buckets
+
+def _value_buckets(counts: dict) -> list[dict]:
+    buckets = [
+        {"value": value.value if isinstance(value, enum.Enum) else str(value), "count": count}
+        for value, count in counts.items()
+    ]
+    return sorted(buckets, key=lambda bucket: (-bucket["count"], bucket["value"]))
+
+async def compute_facets(db: AsyncSession, search_filters: dict) -> dict:
+    """Count matching listings per facet value for the given search filters."""
+    cache_key = tuple(sorted((name, value) for name, value in search_filters.items() if value is not None))
+    cached = facets_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    filters = build_vehicle_filters(**search_filters)
+    facet_owned = {name for _, owned in FACETS.values() for name in owned}
+    shared_filters = [expression for name, expression in filters.items() if name not in facet_owned]
+
+    match_columns = {}
+    for facet, (_, owned) in FACETS.items():
+        own_filters = [filters[name] for name in owned if name in filters]
+        if own_filters:
+            match_columns[facet] = case((and_(*own_filters), 1), else_=0).label(f"{facet}_match")
+
+    group_columns = [expression.label(facet) for facet, (expression, _) in FACETS.items()]
+    group_columns += match_columns.values()
+    query = (
+        select(*group_columns, func.count().label("listings"))
+        .where(*shared_filters)
+        .group_by(*group_columns)
+    )
+    result = await db.execute(query)
+
+    counts = {facet: defaultdict(int) for facet in FACETS}
+    total = 0
+    for row in result.mappings():
+        matches = {facet: row[f"{facet}_match"] == 1 for facet in match_columns}
+        for facet in FACETS:
+            if all(matched for other, matched in matches.items() if other != facet):
+                counts[facet][row[facet]] += row["listings"]
+        if all(matches.values()):
+            total += row["listings"]
+
+    facets = {"total": total, "price": _price_buckets(counts.pop("price"))}
+    facets.update({facet: _value_buckets(facet_counts) for facet, facet_counts in counts.items()})
+    facets_cache.set(cache_key, facets)
+    return facets
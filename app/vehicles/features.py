@@ -0,0 +1,94 @@
+"""Normalized vehicle features for indexed feature filtering.
+
+`Vehicle.features` stays the JSON array listings are written and returned
+with. Alongside it, every distinct feature gets a row in `features` and each
+listing a row per feature in `vehicle_features`, so "has sunroof AND reverse
+camera" is an index lookup per feature instead of a scan parsing every
+array. Write paths call `sync_vehicle_features` in the transaction that
+stores the listing; `backfill_features.py` converts existing rows.
+"""
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feature import Feature, VehicleFeature
+from app.models.vehicle import Vehicle
+
+_NAME_LENGTH = 100
+
+def normalize_feature(feature: Optional[str]) -> str:
+    return " ".join((feature or "").lower().split())[:_NAME_LENGTH]
+
+def parse_features(features: str) -> list[str]:
+    """Normalized, distinct names from a comma-separated `features=` filter."""
+    return list(dict.fromkeys(name for name in map(normalize_feature, features.split(",")) if name))
+
+def has_features(names: list[str]):
+    """Filter expression: the vehicle has every one of the named features."""
+    vehicle_ids = (
+        select(VehicleFeature.vehicle_id)
+        .join(Feature, Feature.id == VehicleFeature.feature_id)
+        .where(Feature.name.in_(names))
+        .group_by(VehicleFeature.vehicle_id)
+        .having(func.count() == len(names))
+    )
+    return Vehicle.id.in_(vehicle_ids)
+
+def vehicle_has_features(names: list[str], features: Optional[list]) -> bool:
+    """`has_features` evaluated on a listing's JSON features array."""
+    return set(names) <= {normalize_feature(feature) for feature in features or []}
+
+async def _feature_ids(db: AsyncSession, labels: dict[str, str]) -> dict[str, int]:
+    ids = {}
+    while True:
+        missing = [name for name in labels if name not in ids]
+        result = await db.execute(select(Feature.name, Feature.id).where(Feature.name.in_(missing)))
+        ids.update(result.all())
+        missing = [name for name in missing if name not in ids]
+        if not missing:
+            return ids
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(Feature), [{"name": name, "label": labels[name][:_NAME_LENGTH]} for name in missing])
+        except IntegrityError:
+            pass  # A concurrent writer added some of them first; look them up again
+
+async def sync_vehicle_features(db: AsyncSession, vehicles: list[tuple[int, Optional[list]]]) -> None:
+    """Replace the feature rows of (vehicle id, features array) pairs.
+
+    Runs in the caller's transaction, adding unseen features to the dictionary.
+    """
+    labels = {}
+    rows = {}
+    for vehicle_id, features in vehicles:
+        for feature in features or []:
+            name = normalize_feature(feature)
+            if name:
+                labels.setdefault(name, " ".join(feature.split()))
+                rows[vehicle_id, name] = None
+
+    await db.execute(delete(VehicleFeature).where(VehicleFeature.vehicle_id.in_([vehicle_id for vehicle_id, _ in vehicles])))
+    if rows:
+        ids = await _feature_ids(db, labels)
+        await db.execute(
+            insert(VehicleFeature),
+            [{"vehicle_id": vehicle_id, "feature_id": ids[name]} for vehicle_id, name in rows],
+        )
+
+async def backfill_vehicle_features(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Rebuild the feature rows of every listing from its JSON array. Returns listings processed."""
+    processed = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Vehicle.id, Vehicle.features).where(Vehicle.id > last_id).order_by(Vehicle.id).limit(batch_size)
+        )
+        batch = result.all()
+        if not batch:
+            return processed
+        await sync_vehicle_features(db, batch)
+        await db.commit()
+        processed += len(batch)
+        last_id = batch[-1][0]
@@ -0,0 +1,250 @@
+import enum
+import math
+import re
+
+from fastapi import HTTPException, Query
+from sqlalchemy import select, and_, or_
+from sqlalchemy.orm import selectinload
+from typing import Optional
+
+from app.db import engine
+from app.geo import geohash
+from app.geo.gazetteer import geocode
+from app.models.vehicle import Vehicle
+from app.vehicles.features import has_features, parse_features, vehicle_has_features
+from app.vehicles.search import INDEXED_COLUMNS, has_search_terms, text_matches, text_search_filter
+
+DEFAULT_RADIUS_KM = 25.0
+
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+def near_point(near: str) -> tuple[float, float]:
+    """Resolve `near=` ("lat,lng" or a town name) to coordinates."""
+    match = _COORDINATES.match(near)
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude
+        raise HTTPException(status_code=400, detail="near coordinates are out of range")
+    point = geocode(near)
+    if point is None:
+        raise HTTPException(status_code=400, detail=f"Unknown location '{near}' for near")
+    return point
+
+def _bytewise_geohash():
+    # The cell ranges assume byte order; PostgreSQL compares text by the
+    # column's collation, so compare in "C" (backed by ix_vehicles_geohash_c)
+    if engine.dialect.name == "postgresql":
+        return Vehicle.geohash.collate("C")
+    return Vehicle.geohash
+
+def _within_radius(latitude: float, longitude: float, radius_km: float):
+    # Geohash prefix ranges narrow the search to a few index scans; the
+    # distance check then drops the box corners outside the circle
+    key = _bytewise_geohash()
+    cells = or_(*[
+        and_(key >= cell, key <= cell + geohash.PREFIX_END)
+        for cell in geohash.cover(latitude, longitude, radius_km)
+    ])
+    lat_km = (Vehicle.latitude - latitude) * geohash.KM_PER_DEGREE
+    lng_km = (Vehicle.longitude - longitude) * (geohash.KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    return and_(cells, lat_km * lat_km + lng_km * lng_km <= radius_km * radius_km)
+
+def vehicle_search_filters(
+    q: Optional[str] = Query(None, description="Free-text search over title, make, model, variant, description and features"),
+    make: Optional[str] = Query(None, description="Filter by vehicle make"),
+    model: Optional[str] = Query(None, description="Filter by vehicle model"),
+    location: Optional[str] = Query(None, description="Filter by location"),
+    near: Optional[str] = Query(None, description="Only listings near this point: 'lat,lng' or a town name"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500, description=f"Radius for near, in km (default {DEFAULT_RADIUS_KM:g})"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
+    min_year: Optional[int] = Query(None, ge=1900, description="Minimum year filter"),
+    max_year: Optional[int] = Query(None, le=2030, description="Maximum year filter"),
+    min_mileage: Optional[int] = Query(None, ge=0, description="Minimum mileage filter (km)"),
+    max_mileage: Optional[int] = Query(None, ge=0, description="Maximum mileage filter (km)"),
+    min_engine_size: Optional[float] = Query(None, ge=0, description="Minimum engine size filter"),
+    max_engine_size: Optional[float] = Query(None, ge=0, description="Maximum engine size filter"),
+    fuel_type: Optional[str] = Query(None, description="Filter by fuel type (petrol, diesel, electric, hybrid)"),
+    transmission: Optional[str] = Query(None, description="Filter by transmission (manual, automatic)"),
+    body_type: Optional[str] = Query(None, description="Filter by body type"),
+    condition: Optional[str] = Query(None, description="Filter by condition (used, new, reconditioned)"),
+    seller_type: Optional[str] = Query(None, description="Filter by seller type (dealer, private)"),
+    vehicle_type: Optional[str] = Query(None, description="Filter by vehicle type (car, motorbike, truck, etc.)"),
+    features: Optional[str] = Query(None, description="Comma-separated features every listing must have, e.g. 'sunroof,reverse camera'"),
+) -> dict:
+    """Collect the search filter query parameters shared by the vehicle search endpoints."""
+    return dict(
+        q=q,
+        make=make,
+        model=model,
+        location=location,
+        near=near,
+        radius_km=radius_km,
+        min_price=min_price,
+        max_price=max_price,
+        min_year=min_year,
+        max_year=max_year,
+        min_mileage=min_mileage,
+        max_mileage=max_mileage,
+        min_engine_size=min_engine_size,
+        max_engine_size=max_engine_size,
+        fuel_type=fuel_type,
+        transmission=transmission,
+        body_type=body_type,
+        condition=condition,
+        seller_type=seller_type,
+        vehicle_type=vehicle_type,
+        features=features,
+    )
+
+def build_vehicle_filters(
+    q: Optional[str] = None,
+    make: Optional[str] = None,
+    model: Optional[str] = None,
+    location: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: Optional[float] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_year: Optional[int] = None,
+    max_year: Optional[int] = None,
+    min_mileage: Optional[int] = None,
+    max_mileage: Optional[int] = None,
+    min_engine_size: Optional[float] = None,
+    max_engine_size: Optional[float] = None,
+    fuel_type: Optional[str] = None,
+    transmission: Optional[str] = None,
+    body_type: Optional[str] = None,
+    condition: Optional[str] = None,
+    seller_type: Optional[str] = None,
+    vehicle_type: Optional[str] = None,
+    features: Optional[str] = None,
+) -> dict:
+    """Build the active filter expressions, keyed by the parameter that produced them"""
+    filters = {}
+
+    if has_search_terms(q):
+        filters["q"] = text_search_filter(q)
+    if make:
+        filters["make"] = Vehicle.make.ilike(f"%{make}%")
+    if model:
+        filters["model"] = Vehicle.model.ilike(f"%{model}%")
+    if location:
+        filters["location"] = Vehicle.location.ilike(f"%{location}%")
+    if near:
+        latitude, longitude = near_point(near)
+        filters["near"] = _within_radius(latitude, longitude, radius_km or DEFAULT_RADIUS_KM)
+    if min_price is not None:
+        filters["min_price"] = Vehicle.price >= min_price
+    if max_price is not None:
+        filters["max_price"] = Vehicle.price <= max_price
+    if min_year is not None:
+        filters["min_year"] = Vehicle.year >= min_year
+    if max_year is not None:
+        filters["max_year"] = Vehicle.year <= max_year
+    if min_mileage is not None:
+        filters["min_mileage"] = Vehicle.mileage >= min_mileage
+    if max_mileage is not None:
+        filters["max_mileage"] = Vehicle.mileage <= max_mileage
+    if min_engine_size is not None:
+        filters["min_engine_size"] = Vehicle.engine_size >= min_engine_size
+    if max_engine_size is not None:
+        filters["max_engine_size"] = Vehicle.engine_size <= max_engine_size
+    if fuel_type:
+        filters["fuel_type"] = Vehicle.fuel_type == fuel_type
+    if transmission:
+        filters["transmission"] = Vehicle.transmission == transmission
+    if body_type:
+        filters["body_type"] = Vehicle.body_type.ilike(f"%{body_type}%")
+    if condition:
+        filters["condition"] = Vehicle.condition == condition
+    if seller_type:
+        filters["seller_type"] = Vehicle.seller_type == seller_type
+    if vehicle_type:
+        filters["vehicle_type"] = Vehicle.vehicle_type == vehicle_type
+    if features and parse_features(features):
+        filters["features"] = has_features(parse_features(features))
+
+    return filters
+
+def apply_vehicle_filters(query, **search_filters):
+    """Restrict any query over vehicles to those matching the search filters"""
+    filters = build_vehicle_filters(**search_filters)
+    if filters:
+        query = query.where(and_(*filters.values()))
+    return query
+
+def build_vehicle_search_query(**search_filters):
+    """Build a filtered query for vehicle search, loading what VehicleOut returns"""
+    query = select(Vehicle).options(selectinload(Vehicle.images))
+    return apply_vehicle_filters(query, **search_filters)
+
+def _enum_equals(expected: str, actual) -> bool:
+    # Filters accept an enum member's name ("petrol") or its value ("Petrol")
+    if isinstance(actual, enum.Enum):
+        return expected in (actual.name, actual.value)
+    return expected == actual
+
+def _contains(expected: str, actual) -> bool:
+    return expected.lower() in (actual or "").lower()
+
+# filter name -> (vehicle column it reads, check(filter value, column value))
+_MATCHERS = {
+    "make": ("make", _contains),
+    "model": ("model", _contains),
+    "location": ("location", _contains),
+    "body_type": ("body_type", _contains),
+    "min_price": ("price", lambda bound, price: price >= bound),
+    "max_price": ("price", lambda bound, price: price <= bound),
+    "min_year": ("year", lambda bound, year: year >= bound),
+    "max_year": ("year", lambda bound, year: year <= bound),
+    "min_mileage": ("mileage", lambda bound, mileage: mileage >= bound),
+    "max_mileage": ("mileage", lambda bound, mileage: mileage <= bound),
+    "min_engine_size": ("engine_size", lambda bound, size: size >= bound),
+    "max_engine_size": ("engine_size", lambda bound, size: size <= bound),
+    "fuel_type": ("fuel_type", _enum_equals),
+    "transmission": ("transmission", _enum_equals),
+    "condition": ("condition", _enum_equals),
+    "seller_type": ("seller_type", _enum_equals),
+    "vehicle_type": ("vehicle_type", _enum_equals),
+}
+
+def vehicle_matches(search_filters: dict, values: dict) -> bool:
+    """Check in Python whether a listing's column values satisfy the search filters.
+
+    Mirrors `build_vehicle_filters`. A filter whose columns are missing from
+    `values` counts as matching, so callers err on the side of "may match".
+    """
+    for name, expected in search_filters.items():
+        if expected is None:
+            continue
+        if name == "q":
+            if not has_search_terms(expected):
+                continue
+            if any(column not in values for column in INDEXED_COLUMNS):
+                continue
+            if not text_matches(expected, values):
+                return False
+            continue
+        if name == "radius_km":
+            continue  # Applied together with near
+        if name == "near":
+            if "latitude" not in values or "longitude" not in values:
+                continue
+            if values["latitude"] is None or values["longitude"] is None:
+                return False
+            latitude, longitude = near_point(expected)
+            radius = search_filters.get("radius_km") or DEFAULT_RADIUS_KM
+            if geohash.distance_squared_km(latitude, longitude, values["latitude"], values["longitude"]) > radius * radius:
+                return False
+            continue
+        if name == "features":
+            if "features" in values and not vehicle_has_features(parse_features(expected), values["features"]):
+                return False
+            continue
+        column, check = _MATCHERS[name]
+        actual = values.get(column)
+        if actual is not None and not check(expected, actual):
+            return False
+    return True
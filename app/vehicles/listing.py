@@ -0,0 +1,180 @@
+"""Loading and serializing pages of vehicle search results.
+
+Three response shapes are supported:
+- the full `VehicleOut` (default),
+- a sparse `VehicleOut` limited to the names listed in `fields=`,
+- the compact `VehicleCard` (`view=card`).
+
+Each shape loads only the columns and relationships it returns.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import ConfigDict, TypeAdapter, create_model
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+
+from app.models.user import User
+from app.models.vehicle import Vehicle
+from app.models.vehicle_image import VehicleImage
+from app.profiling import profile_span
+from app.schemas.vehicle import VehicleCard, VehicleOut
+from app.vehicles.columnar import columnar_index
+from app.vehicles.filters import apply_vehicle_filters, build_vehicle_search_query
+from app.vehicles.pagination import RELEVANCE_SORT, get_sort_option, next_cursor, paginate
+
+FULL_VIEW = "full"
+CARD_VIEW = "card"
+VIEWS = (FULL_VIEW, CARD_VIEW)
+
+# Most ids accepted by one batch lookup
+MAX_BATCH_IDS = 100
+
+_COLUMN_KEYS = {column.key for column in Vehicle.__table__.columns}
+
+first_image_url = (
+    select(VehicleImage.url)
+    .where(VehicleImage.vehicle_id == Vehicle.id)
+    .order_by(VehicleImage.id)
+    .limit(1)
+    .correlate(Vehicle)
+    .scalar_subquery()
+)
+
+vehicle_list_adapter = TypeAdapter(list[VehicleOut])
+vehicle_card_list_adapter = TypeAdapter(list[VehicleCard])
+
+@dataclass(frozen=True)
+class VehiclePage:
+    filters: dict
+    body: bytes  # Serialized JSON array
+    next_cursor: Optional[str]
+    vehicle_ids: frozenset
+
+def parse_vehicle_ids(ids: str) -> list[int]:
+    """Parse a comma-separated `ids=` list, dropping repeats but keeping the order."""
+    try:
+        vehicle_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not vehicle_ids:
+        raise HTTPException(status_code=400, detail="ids must name at least one vehicle")
+    if len(vehicle_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be requested at once")
+    return vehicle_ids
+
+def parse_view(view: str, fields: Optional[str]) -> tuple[str, Optional[tuple]]:
+    """Validate `view` and `fields=`, returning the view and requested field names."""
+    if view not in VIEWS:
+        raise HTTPException(status_code=400, detail=f"Invalid view '{view}'. Valid options: {', '.join(VIEWS)}")
+    if not fields:
+        return view, None
+    if view != FULL_VIEW:
+        raise HTTPException(status_code=400, detail="fields can only be combined with the full view")
+
+    names = ["id"]  # Always returned; cursors and caching rely on it
+    for name in (part.strip() for part in fields.split(",")):
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in VehicleOut.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return view, tuple(names)
+
+@lru_cache(maxsize=256)
+def _sparse_list_adapter(fields: tuple) -> TypeAdapter:
+    model = create_model(
+        "VehicleFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (VehicleOut.model_fields[name].annotation, VehicleOut.model_fields[name]) for name in fields},
+    )
+    return TypeAdapter(list[model])
+
+def _sort_column_keys(sort: str) -> list[str]:
+    # The cursor for the next page is read from the sort column of the last row
+    if sort == RELEVANCE_SORT:
+        return []
+    column, _ = get_sort_option(sort)
+    return [column.key]
+
+def _card_query(filters: dict, sort: str):
+    columns = [Vehicle.id, Vehicle.title, Vehicle.price, Vehicle.year, Vehicle.mileage]
+    columns += [getattr(Vehicle, key) for key in _sort_column_keys(sort) if key not in ("id", "title", "price", "year", "mileage")]
+    query = select(*columns, first_image_url.label("image_url"))
+    return apply_vehicle_filters(query, **filters)
+
+def _sparse_query(filters: dict, sort: str, fields: tuple):
+    keys = [name for name in fields if name in _COLUMN_KEYS]
+    keys += [key for key in _sort_column_keys(sort) if key not in keys]
+    options = [load_only(*(getattr(Vehicle, key) for key in keys))]
+    if "images" in fields:
+        options.append(selectinload(Vehicle.images))
+    return apply_vehicle_filters(select(Vehicle).options(*options), **filters)
+
+async def fetch_vehicle_page(
+    db: AsyncSession,
+    filters: dict,
+    page: int,
+    limit: int,
+    sort: str,
+    cursor: Optional[str],
+    view: str = FULL_VIEW,
+    fields: Optional[tuple] = None,
+) -> VehiclePage:
+    """Run a search and serialize one page of results in the requested shape."""
+    if view == CARD_VIEW:
+        query, adapter = _card_query(filters, sort), vehicle_card_list_adapter
+    elif fields:
+        query, adapter = _sparse_query(filters, sort, fields), _sparse_list_adapter(fields)
+    else:
+        query, adapter = build_vehicle_search_query(**filters), vehicle_list_adapter
+
+    page_ids = await columnar_index.search_ids(db, filters, sort, page, limit, cursor)
+    if page_ids is None:
+        result = await db.execute(paginate(query, page, limit, sort, cursor, filters["q"]))
+    else:
+        result = await db.execute(query.where(Vehicle.id.in_(page_ids)))
+    rows = result.all() if view == CARD_VIEW else result.scalars().unique().all()
+    if page_ids is not None:
+        positions = {vehicle_id: position for position, vehicle_id in enumerate(page_ids)}
+        rows = sorted(rows, key=lambda row: positions[row.id])
+
+    with profile_span("serialize"):
+        body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return VehiclePage(
+        filters=filters,
+        body=body,
+        next_cursor=next_cursor(sort, rows, limit),
+        vehicle_ids=frozenset(row.id for row in rows),
+    )
+
+async def fetch_vehicle_cards(db: AsyncSession, vehicle_ids: list[int]) -> list:
+    """Load VehicleCard rows for the given ids, in the order given."""
+    if not vehicle_ids:
+        return []
+    result = await db.execute(
+        select(Vehicle.id, Vehicle.title, Vehicle.price, Vehicle.year, Vehicle.mileage, first_image_url.label("image_url"))
+        .where(Vehicle.id.in_(vehicle_ids))
+    )
+    rows = {row.id: row for row in result}
+    return [rows[vehicle_id] for vehicle_id in vehicle_ids if vehicle_id in rows]
+
+async def fetch_vehicles_with_users(db: AsyncSession, vehicle_ids: list[int]) -> list[Vehicle]:
+    """Load vehicles with images, poster and dealer profile, in the order given.
+
+    One IN query for the vehicles and one per relationship, however many ids.
+    Ids that do not exist are left out.
+    """
+    result = await db.execute(
+        select(Vehicle)
+        .options(
+            selectinload(Vehicle.images),
+            selectinload(Vehicle.posted_by).selectinload(User.dealer_profile),
+        )
+        .where(Vehicle.id.in_(vehicle_ids))
+    )
+    vehicles = {vehicle.id: vehicle for vehicle in result.scalars()}
+    return [vehicles[vehicle_id] for vehicle_id in vehicle_ids if vehicle_id in vehicles]
@@ -0,0 +1,125 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import String, tuple_, type_coerce
+
+from app.db import engine
+from app.models.vehicle import Vehicle
+from app.vehicles.search import has_search_terms, order_by_relevance
+
+# Sort options available to the search endpoints: name -> (column, descending).
+# Every option is paired with Vehicle.id as a tie-breaker so the order is total
+# and a cursor always points at exactly one position.
+# Each sort column has a matching (column, id) index on Vehicle, so sorted
+# pages are read straight off an index instead of sorting every match.
+SORT_OPTIONS = {
+    "created_at_desc": (Vehicle.created_at, True),
+    "created_at_asc": (Vehicle.created_at, False),
+    "price_asc": (Vehicle.price, False),
+    "price_desc": (Vehicle.price, True),
+    "year_desc": (Vehicle.year, True),
+    "year_asc": (Vehicle.year, False),
+    "mileage_asc": (Vehicle.mileage, False),
+    "mileage_desc": (Vehicle.mileage, True),
+}
+# Friendlier names accepted for sort options
+SORT_ALIASES = {
+    "newest": "created_at_desc",
+    "oldest": "created_at_asc",
+}
+DEFAULT_SORT = "created_at_desc"
+# Text-match rank order; only meaningful with a `q` search and paged by offset
+RELEVANCE_SORT = "relevance"
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def resolve_sort(sort: Optional[str], q: Optional[str] = None) -> str:
+    """Pick the effective sort: explicit choice, else relevance for text searches."""
+    if sort:
+        return SORT_ALIASES.get(sort, sort)
+    return RELEVANCE_SORT if has_search_terms(q) else DEFAULT_SORT
+
+def get_sort_option(sort: str):
+    """Look up a sort option, rejecting unknown names with a 400."""
+    if sort not in SORT_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort '{sort}'. Valid options: {', '.join([*SORT_OPTIONS, *SORT_ALIASES, RELEVANCE_SORT])}"
+        )
+    return SORT_OPTIONS[sort]
+
+def apply_sort(query, sort: str):
+    """Order a vehicle query by the sort key, then by id."""
+    column, descending = get_sort_option(sort)
+    if descending:
+        return query.order_by(column.desc(), Vehicle.id.desc())
+    return query.order_by(column.asc(), Vehicle.id.asc())
+
+def encode_cursor(sort: str, vehicle) -> str:
+    """Build an opaque cursor pointing just after `vehicle` in `sort` order."""
+    column, _ = get_sort_option(sort)
+    value = getattr(vehicle, column.key)
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort, "v": value, "id": vehicle.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(payload["v"], dict):
+            payload["v"] = datetime.fromisoformat(payload["v"]["dt"])
+        payload["id"] = int(payload["id"])
+        return payload
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _bind_value(value: Any):
+    """Bind a cursor value so it compares the same way the column sorts.
+
+    SQLite keeps timestamps as text; CURRENT_TIMESTAMP defaults have no
+    fractional part, so the bound value must use the same text layout.
+    """
+    if isinstance(value, datetime) and engine.dialect.name == "sqlite":
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return type_coerce(value.strftime(fmt), String)
+    return value
+
+def apply_cursor(query, sort: str, cursor: str):
+    """Restrict a query to rows after the cursor position (keyset seek)."""
+    column, descending = get_sort_option(sort)
+    payload = decode_cursor(cursor)
+    if payload["s"] != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+
+    key = tuple_(column, Vehicle.id)
+    position = tuple_(_bind_value(payload["v"]), payload["id"])
+    return query.where(key < position if descending else key > position)
+
+def paginate(query, page: int, limit: int, sort: str, cursor: str = None, q: str = None):
+    """Apply ordering plus keyset (when a cursor is given) or offset paging."""
+    if sort == RELEVANCE_SORT:
+        if not has_search_terms(q):
+            raise HTTPException(status_code=400, detail="Relevance sort requires a search query (q)")
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursors are not supported with relevance sort")
+        return order_by_relevance(query, q).offset((page - 1) * limit).limit(limit)
+
+    query = apply_sort(query, sort)
+    if cursor:
+        query = apply_cursor(query, sort, cursor)
+    else:
+        query = query.offset((page - 1) * limit)
+    return query.limit(limit)
+
+def next_cursor(sort: str, rows: list, limit: int):
+    """Return the cursor for the following page, or None on the last page."""
+    if sort == RELEVANCE_SORT or len(rows) < limit:
+        return None
+    return encode_cursor(sort, rows[-1])
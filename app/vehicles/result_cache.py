@@ -0,0 +1,79 @@
+"""Response cache for the public vehicle search.
+
+Pages are cached as serialized JSON, keyed by the normalized filter set plus
+sort, page, limit and cursor. When vehicles change, only the entries that
+could show them are dropped: pages that contain a changed vehicle, and
+pages whose filters match its old or new values.
+
+The cache is per process, so other workers can serve a stale page until its
+TTL expires.
+"""
+import os
+from typing import Optional
+
+from app.cache import TTLCache
+from app.vehicles.events import on_vehicles_changed
+from app.vehicles.filters import vehicle_matches
+from app.vehicles.listing import VehiclePage
+
+PUBLIC_SEARCH_CACHE_TTL = float(os.getenv("PUBLIC_SEARCH_CACHE_TTL", "60"))  # seconds
+PUBLIC_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("PUBLIC_SEARCH_CACHE_MAX_ENTRIES", "2048"))
+PUBLIC_SEARCH_CACHE_MAX_BYTES = int(os.getenv("PUBLIC_SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Filters compared case-insensitively by the search query
+_CASE_INSENSITIVE = {"q", "make", "model", "location", "near", "body_type", "features"}
+
+public_search_cache = TTLCache(
+    ttl=PUBLIC_SEARCH_CACHE_TTL,
+    max_entries=PUBLIC_SEARCH_CACHE_MAX_ENTRIES,
+    max_size=PUBLIC_SEARCH_CACHE_MAX_BYTES,
+)
+# Bumped on every invalidation so a page computed before a write is not stored after it
+_generation = 0
+
+def public_search_key(
+    filters: dict,
+    page: int,
+    limit: int,
+    sort: str,
+    cursor: Optional[str],
+    view: str,
+    fields: Optional[tuple],
+) -> tuple:
+    """Cache key for one page of public search results."""
+    normalized = []
+    for name, value in sorted(filters.items()):
+        if value is None:
+            continue
+        if name in _CASE_INSENSITIVE and value.isascii():
+            value = value.lower()
+        normalized.append((name, value))
+    # With a cursor the page number is ignored, so leave it out of the key
+    return (tuple(normalized), sort, limit, cursor, None if cursor else page, view, fields)
+
+def current_generation() -> int:
+    return _generation
+
+def store_page(key: tuple, page: VehiclePage, generation: int) -> None:
+    """Cache `page` unless vehicles changed since `generation` was read."""
+    if generation == _generation:
+        public_search_cache.set(key, page, size=len(page.body))
+
+@on_vehicles_changed
+def _invalidate_changed_vehicles(changes):
+    global _generation
+    _generation += 1
+
+    def affected(key, page: VehiclePage) -> bool:
+        for change in changes:
+            if change.id in page.vehicle_ids:
+                return True
+            if change.values is None:
+                continue  # Only images changed; pages without the vehicle are unaffected
+            if vehicle_matches(page.filters, change.values):
+                return True
+            if change.previous and vehicle_matches(page.filters, {**change.values, **change.previous}):
+                return True
+        return False
+
+    public_search_cache.invalidate(affected)
@@ -1,14 +1,36 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import Optional
+from typing import Optional, Union
 
-from app.db import async_session_maker
+from app.db import async_session_maker, get_read_db, is_replica_session
 from app.models.vehicle import Vehicle, FuelType, TransmissionType, VehicleCondition, SellerType
 from app.models.user import User
-from app.schemas.vehicle import VehicleOut, VehicleCreate, VehicleWithUser
+from app.models.vehicle_image import VehicleImage
+from app.models.price_stat import ALL_MILEAGE
+from app.schemas.vehicle import VehicleOut, VehicleCard, VehicleCreate, VehicleWithUser, VehicleFacets, VehicleImportReport, VehicleSuggestion, VehicleValuation
 from app.auth import get_current_active_user
+from app.conditional import conditional_response, last_modified
+from app.saved_searches.matching import match_saved_searches
+from app.vehicles.pagination import (
+    DEFAULT_SORT, NEXT_CURSOR_HEADER, RELEVANCE_SORT, SORT_ALIASES, SORT_OPTIONS, resolve_sort
+)
+from app.vehicles.bulk_import import IMPORT_FORMATS, NDJSON, detect_import_format, import_vehicles
+from app.vehicles.export import MEDIA_TYPES, stream_vehicle_export
+from app.vehicles.facets import compute_facets
+from app.vehicles.features import sync_vehicle_features
+from app.vehicles.filters import build_vehicle_search_query, vehicle_search_filters
+from app.vehicles.listing import (
+    FULL_VIEW, MAX_BATCH_IDS, VIEWS, VehiclePage, fetch_vehicle_cards, fetch_vehicle_page, fetch_vehicles_with_users,
+    parse_vehicle_ids, parse_view
+)
+from app.vehicles.similar import similar_vehicle_index
+from app.vehicles.suggest import suggestion_index
+from app.vehicles.valuation import band_range, find_valuation, record_listing_prices
+from app.vehicles.result_cache import current_generation, public_search_cache, public_search_key, store_page
+from app.vehicles.writes import vehicle_values
 
 router = APIRouter(prefix="/api", tags=["vehicles"])
 
@@ -16,153 +38,156 @@ async def get_db():
     async with async_session_maker() as session:
         yield session
 
-def build_vehicle_search_query(
-    make: Optional[str] = None,
-    model: Optional[str] = None,
-    location: Optional[str] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
-    min_year: Optional[int] = None,
-    max_year: Optional[int] = None,
-    fuel_type: Optional[str] = None,
-    transmission: Optional[str] = None,
-    body_type: Optional[str] = None,
-    condition: Optional[str] = None,
-    seller_type: Optional[str] = None,
-    vehicle_type: Optional[str] = None,
-):
-    """Build a filtered query for vehicle search"""
-    query = select(Vehicle).options(
-        selectinload(Vehicle.images),
-        selectinload(Vehicle.posted_by).selectinload(User.dealer_profile)
-    )
-    
-    filters = []
-    
-    if make:
-        filters.append(Vehicle.make.ilike(f"%{make}%"))
-    if model:
-        filters.append(Vehicle.model.ilike(f"%{model}%"))
-    if location:
-        filters.append(Vehicle.location.ilike(f"%{location}%"))
-    if min_price is not None:
-        filters.append(Vehicle.price >= min_price)
-    if max_price is not None:
-        filters.append(Vehicle.price <= max_price)
-    if min_year is not None:
-        filters.append(Vehicle.year >= min_year)
-    if max_year is not None:
-        filters.append(Vehicle.year <= max_year)
-    if fuel_type:
-        filters.append(Vehicle.fuel_type == fuel_type)
-    if transmission:
-        filters.append(Vehicle.transmission == transmission)
-    if body_type:
-        filters.append(Vehicle.body_type.ilike(f"%{body_type}%"))
-    if condition:
-        filters.append(Vehicle.condition == condition)
-    if seller_type:
-        filters.append(Vehicle.seller_type == seller_type)
-    if vehicle_type:
-        filters.append(Vehicle.vehicle_type == vehicle_type)
-    
-    if filters:
-        query = query.where(and_(*filters))
-    
-    return query
+def _page_response(vehicle_page: VehiclePage, headers: Optional[dict] = None) -> Response:
+    headers = dict(headers or {})
+    if vehicle_page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = vehicle_page.next_cursor
+    return Response(content=vehicle_page.body, media_type="application/json", headers=headers)
 
-@router.get("/vehicles", response_model=list[VehicleOut])
+@router.get("/vehicles", response_model=Union[list[VehicleOut], list[VehicleCard]])
 async def get_vehicles(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    make: Optional[str] = Query(None, description="Filter by vehicle make"),
-    model: Optional[str] = Query(None, description="Filter by vehicle model"),
-    location: Optional[str] = Query(None, description="Filter by location"),
-    min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
-    max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
-    min_year: Optional[int] = Query(None, ge=1900, description="Minimum year filter"),
-    max_year: Optional[int] = Query(None, le=2030, description="Maximum year filter"),
-    fuel_type: Optional[str] = Query(None, description="Filter by fuel type (petrol, diesel, electric, hybrid)"),
-    transmission: Optional[str] = Query(None, description="Filter by transmission (manual, automatic)"),
-    body_type: Optional[str] = Query(None, description="Filter by body type"),
-    condition: Optional[str] = Query(None, description="Filter by condition (used, new, reconditioned)"),
-    seller_type: Optional[str] = Query(None, description="Filter by seller type (dealer, private)"),
-    vehicle_type: Optional[str] = Query(None, description="Filter by vehicle type (car, motorbike, truck, etc.)"),
-    db: AsyncSession = Depends(get_db),
+    sort: Optional[str] = Query(None, description=f"Sort order ({', '.join([*SORT_OPTIONS, *SORT_ALIASES])}, {RELEVANCE_SORT}); defaults to {RELEVANCE_SORT} with q, else {DEFAULT_SORT}"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    view: str = Query(FULL_VIEW, description=f"Response shape ({', '.join(VIEWS)}); card returns VehicleCard"),
+    fields: Optional[str] = Query(None, description="Comma-separated VehicleOut fields to return (id is always included)"),
+    filters: dict = Depends(vehicle_search_filters),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get vehicles with search filters (requires authentication)."""
-    offset = (page - 1) * limit
-    
-    query = build_vehicle_search_query(
-        make=make,
-        model=model,
-        location=location,
-        min_price=min_price,
-        max_price=max_price,
-        min_year=min_year,
-        max_year=max_year,
-        fuel_type=fuel_type,
-        transmission=transmission,
-        body_type=body_type,
-        condition=condition,
-        seller_type=seller_type,
-        vehicle_type=vehicle_type,
-    )
+    sort = resolve_sort(sort, filters["q"])
+    view, fields = parse_view(view, fields)
     
-    result = await db.execute(query.offset(offset).limit(limit))
-    vehicles = result.scalars().unique().all()
-    return vehicles
+    vehicle_page = await fetch_vehicle_page(db, filters, page, limit, sort, cursor, view, fields)
+    return _page_response(vehicle_page)
 
 # Public endpoint for unauthenticated access (if needed)
-@router.get("/vehicles/public", response_model=list[VehicleOut])
+@router.get("/vehicles/public", response_model=Union[list[VehicleOut], list[VehicleCard]])
 async def get_vehicles_public(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    make: Optional[str] = Query(None, description="Filter by vehicle make"),
-    model: Optional[str] = Query(None, description="Filter by vehicle model"),
-    location: Optional[str] = Query(None, description="Filter by location"),
-    min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
-    max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
-    min_year: Optional[int] = Query(None, ge=1900, description="Minimum year filter"),
-    max_year: Optional[int] = Query(None, le=2030, description="Maximum year filter"),
-    fuel_type: Optional[str] = Query(None, description="Filter by fuel type (petrol, diesel, electric, hybrid)"),
-    transmission: Optional[str] = Query(None, description="Filter by transmission (manual, automatic)"),
-    body_type: Optional[str] = Query(None, description="Filter by body type"),
-    condition: Optional[str] = Query(None, description="Filter by condition (used, new, reconditioned)"),
-    seller_type: Optional[str] = Query(None, description="Filter by seller type (dealer, private)"),
-    vehicle_type: Optional[str] = Query(None, description="Filter by vehicle type (car, motorbike, truck, etc.)"),
-    db: AsyncSession = Depends(get_db),
+    sort: Optional[str] = Query(None, description=f"Sort order ({', '.join([*SORT_OPTIONS, *SORT_ALIASES])}, {RELEVANCE_SORT}); defaults to {RELEVANCE_SORT} with q, else {DEFAULT_SORT}"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    view: str = Query(FULL_VIEW, description=f"Response shape ({', '.join(VIEWS)}); card returns VehicleCard"),
+    fields: Optional[str] = Query(None, description="Comma-separated VehicleOut fields to return (id is always included)"),
+    filters: dict = Depends(vehicle_search_filters),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get vehicles with search filters (public access).
+    
+    Serialized pages are served from an in-process cache; X-Cache reports HIT or MISS.
+    """
+    sort = resolve_sort(sort, filters["q"])
+    view, fields = parse_view(view, fields)
+    cache_key = public_search_key(filters, page, limit, sort, cursor, view, fields)
+    vehicle_page = public_search_cache.get(cache_key)
+    cache_status = "HIT"
+    
+    if vehicle_page is None:
+        cache_status = "MISS"
+        generation = current_generation()
+        vehicle_page = await fetch_vehicle_page(db, filters, page, limit, sort, cursor, view, fields)
+        store_page(cache_key, vehicle_page, generation)
+    
+    return _page_response(vehicle_page, {"X-Cache": cache_status})
+
+@router.get("/vehicles/facets", response_model=VehicleFacets)
+async def get_vehicle_facets(
+    filters: dict = Depends(vehicle_search_filters),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get vehicles with search filters (public access)."""
-    offset = (page - 1) * limit
+    """Get listing counts per facet value for a search (public access).
     
-    query = build_vehicle_search_query(
+    Each facet ignores its own filter, so the counts show what selecting
+    another value of that facet would return.
+    """
+    return await compute_facets(db, filters)
+
+@router.get("/vehicles/suggest", response_model=list[VehicleSuggestion])
+async def get_vehicle_suggestions(
+    prefix: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Make, model and variant suggestions for type-ahead, most listed first (public access)."""
+    await suggestion_index.ensure_loaded()
+    return suggestion_index.suggest(prefix, limit)
+
+@router.get("/vehicles/valuation", response_model=VehicleValuation)
+async def get_vehicle_valuation(
+    make: str = Query(..., description="Vehicle make"),
+    model: str = Query(..., description="Vehicle model"),
+    year: int = Query(..., ge=1900, le=2030, description="Model year"),
+    mileage: Optional[int] = Query(None, ge=0, description="Mileage in km; narrows the estimate to its mileage band"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Typical asking prices for a make, model and year (public access)."""
+    stat = await find_valuation(db, make, model, year, mileage)
+    if stat is None:
+        raise HTTPException(status_code=404, detail="No market data for this vehicle")
+    min_mileage, max_mileage = band_range(stat.mileage_band) if stat.mileage_band != ALL_MILEAGE else (None, None)
+    return VehicleValuation(
         make=make,
         model=model,
-        location=location,
-        min_price=min_price,
-        max_price=max_price,
-        min_year=min_year,
-        max_year=max_year,
-        fuel_type=fuel_type,
-        transmission=transmission,
-        body_type=body_type,
-        condition=condition,
-        seller_type=seller_type,
-        vehicle_type=vehicle_type,
+        year=year,
+        min_mileage=min_mileage,
+        max_mileage=max_mileage,
+        listing_count=stat.listing_count,
+        price_min=stat.price_min,
+        price_p10=stat.price_p10,
+        price_p25=stat.price_p25,
+        price_median=stat.price_median,
+        price_p75=stat.price_p75,
+        price_p90=stat.price_p90,
+        price_max=stat.price_max,
+        price_mean=stat.price_mean,
+        updated_at=stat.updated_at,
+    )
+
+@router.get("/vehicles/export")
+async def export_vehicles(
+    format: str = Query(NDJSON, description=f"Export format ({', '.join(MEDIA_TYPES)})"),
+    filters: dict = Depends(vehicle_search_filters),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Stream every vehicle matching the filters as NDJSON or CSV (requires authentication)."""
+    if format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format '{format}'. Valid options: {', '.join(MEDIA_TYPES)}"
+        )
+    return StreamingResponse(
+        stream_vehicle_export(format, build_vehicle_search_query(**filters)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="vehicles.{format}"'},
+    )
+
+@router.get("/vehicles/batch", response_model=list[VehicleWithUser])
+async def get_vehicles_batch(
+    ids: str = Query(..., description=f"Comma-separated vehicle ids (at most {MAX_BATCH_IDS})"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get several vehicles by ID in the order requested; unknown ids are skipped (public access)."""
+    return await fetch_vehicles_with_users(db, parse_vehicle_ids(ids))
+
+def _vehicle_timestamps(vehicle: Vehicle) -> tuple:
+    """The updated_at of every row feeding a VehicleWithUser payload."""
+    profile = vehicle.posted_by.dealer_profile
+    return (
+        vehicle.updated_at,
+        vehicle.posted_by.updated_at,
+        profile.updated_at if profile else None,
+        *(image.updated_at for image in vehicle.images),
     )
-    
-    result = await db.execute(query.offset(offset).limit(limit))
-    vehicles = result.scalars().unique().all()
-    return vehicles
 
 @router.get("/vehicles/{vehicle_id}", response_model=VehicleWithUser)
 async def get_vehicle_by_id(
     vehicle_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a specific vehicle by ID (public access)."""
+    """Get a specific vehicle by ID (public access). Supports conditional GET."""
     query = select(Vehicle).options(
         selectinload(Vehicle.images),
         selectinload(Vehicle.posted_by).selectinload(User.dealer_profile)
@@ -171,10 +196,28 @@ async def get_vehicle_by_id(
     result = await db.execute(query)
     vehicle = result.scalar_one_or_none()
     
+    if vehicle is None and is_replica_session(db):
+        # It may have been created moments ago and not reached the replica yet
+        async with async_session_maker() as primary:
+            return await get_vehicle_by_id(vehicle_id, request, primary)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
-    
-    return vehicle
+
+    return conditional_response(
+        request, VehicleWithUser.model_validate(vehicle), last_modified(*_vehicle_timestamps(vehicle))
+    )
+
+@router.get("/vehicles/{vehicle_id}/similar", response_model=list[VehicleCard])
+async def get_similar_vehicles(
+    vehicle_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Listings most similar to a vehicle, closest first (public access)."""
+    similar_ids = await similar_vehicle_index.similar_ids(vehicle_id, limit)
+    if similar_ids is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return await fetch_vehicle_cards(db, similar_ids)
 
 @router.post("/vehicles", response_model=VehicleOut)
 async def create_vehicle(
@@ -183,32 +226,9 @@ async def create_vehicle(
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new vehicle listing (requires authentication)."""
-    from app.models.vehicle_image import VehicleImage
-    
     # Create the vehicle
-    db_vehicle = Vehicle(
-        posted_by_id=current_user.id,
-        vehicle_type=vehicle_data.vehicle_type,
-        title=vehicle_data.title,
-        make=vehicle_data.make,
-        model=vehicle_data.model,
-        variant=vehicle_data.variant,
-        year=vehicle_data.year,
-        price=vehicle_data.price,
-        mileage=vehicle_data.mileage,
-        fuel_type=vehicle_data.fuel_type,
-        transmission=vehicle_data.transmission,
-        body_type=vehicle_data.body_type,
-        color=vehicle_data.color,
-        engine_size=vehicle_data.engine_size,
-        doors=vehicle_data.doors,
-        location=vehicle_data.location,
-        seller_type=vehicle_data.seller_type,
-        import_status=vehicle_data.import_status,
-        condition=vehicle_data.condition,
-        ownership_history=vehicle_data.ownership_history,
-        description=vehicle_data.description,
-    )
+    values = vehicle_values(vehicle_data, current_user.id)
+    db_vehicle = Vehicle(**values)
     
     # Add images if provided
     if vehicle_data.images:
@@ -217,6 +237,10 @@ async def create_vehicle(
             db_vehicle.images.append(db_image)
     
     db.add(db_vehicle)
+    await record_listing_prices(db, [vehicle_data.model_dump()])
+    await db.flush()
+    await sync_vehicle_features(db, [(db_vehicle.id, vehicle_data.features)])
+    await match_saved_searches(db, [{**values, "id": db_vehicle.id}])
     await db.commit()
     await db.refresh(db_vehicle)
     
@@ -232,3 +256,14 @@ async def create_vehicle(
     created_vehicle = result.scalar_one()
     
     return created_vehicle
+
+@router.post("/vehicles/import", response_model=VehicleImportReport)
+async def import_vehicle_listings(
+    request: Request,
+    format: Optional[str] = Query(None, description=f"Upload format ({', '.join(IMPORT_FORMATS)}); defaults to the Content-Type"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Bulk-create vehicle listings from an NDJSON or CSV upload (requires authentication)."""
+    import_format = detect_import_format(format, request.headers.get("content-type"))
+    return await import_vehicles(db, request.stream(), import_format, current_user.id)
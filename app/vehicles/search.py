@@ -0,0 +1,175 @@
+"""Full-text search over vehicle listings.
+
+SQLite uses an FTS5 virtual table (``vehicles_fts``) whose rowid is the vehicle
+id; it is kept in step with the ``vehicles`` table from a session flush hook.
+PostgreSQL uses a generated ``tsvector`` column with a GIN index, which the
+database maintains by itself.
+"""
+import json
+import re
+import unicodedata
+
+from sqlalchemy import event, func, literal_column, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import column, table
+
+from app.db import engine
+from app.models.vehicle import Vehicle
+
+FTS_TABLE = "vehicles_fts"
+fts_table = table(FTS_TABLE, column("rowid"), column("rank"))
+
+# Columns covered by the index, in FTS5 column order
+INDEXED_COLUMNS = ("title", "make", "model", "variant", "description", "features")
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, make, model, variant, description, features,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+    # Weight title/make/model hits above description text (bm25 column weights)
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES('rank', 'bm25(10.0, 6.0, 6.0, 3.0, 1.0, 2.0)')",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE vehicles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(make, '') || ' ' || coalesce(model, '') || ' ' || coalesce(variant, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(features::text, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_vehicles_search_vector ON vehicles USING GIN (search_vector)",
+]
+
+def _tokens(q: str) -> list[str]:
+    return re.findall(r"\w+", q.lower())
+
+def has_search_terms(q) -> bool:
+    """True when `q` contains at least one searchable word."""
+    return bool(q and _tokens(q))
+
+def text_matches(q: str, values: dict) -> bool:
+    """Evaluate a `q` search against one listing's values in Python.
+
+    Mirrors the index: every query word must prefix some indexed word, with
+    case and diacritics ignored.
+    """
+    document = " ".join(
+        " ".join(value) if isinstance(value, list) else str(value)
+        for value in (values.get(name) for name in INDEXED_COLUMNS)
+        if value
+    )
+    folded = unicodedata.normalize("NFKD", document)
+    words = _tokens("".join(char for char in folded if not unicodedata.combining(char)))
+    return all(any(word.startswith(token) for word in words) for token in _tokens(q))
+
+def _sqlite_match(q: str) -> str:
+    # Every word must match, each as a prefix: "toy axi" -> "toy"* "axi"*
+    return " ".join(f'"{token}"*' for token in _tokens(q))
+
+def _postgres_tsquery(q: str):
+    return func.to_tsquery("simple", " & ".join(f"{token}:*" for token in _tokens(q)))
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+def text_search_filter(q: str):
+    """Filter expression restricting vehicles to those matching `q`."""
+    if _is_sqlite(engine):
+        matching_ids = select(fts_table.c.rowid).where(
+            literal_column(FTS_TABLE).op("MATCH")(_sqlite_match(q))
+        )
+        return Vehicle.id.in_(matching_ids)
+    return literal_column("vehicles.search_vector").op("@@")(_postgres_tsquery(q))
+
+def order_by_relevance(query, q: str):
+    """Order a vehicle query by text-match rank (best first), then id."""
+    if _is_sqlite(engine):
+        # FTS5 rank is bm25, where lower means a better match
+        return (
+            query.join(fts_table, fts_table.c.rowid == Vehicle.id)
+            .where(literal_column(FTS_TABLE).op("MATCH")(_sqlite_match(q)))
+            .order_by(fts_table.c.rank, Vehicle.id)
+        )
+    rank = func.ts_rank(literal_column("vehicles.search_vector"), _postgres_tsquery(q))
+    return query.order_by(rank.desc(), Vehicle.id)
+
+def _document(values: dict) -> dict:
+    document = {name: values.get(name) or "" for name in INDEXED_COLUMNS}
+    document["features"] = json.dumps(values["features"]) if values.get("features") else ""
+    document["rowid"] = values["id"]
+    return document
+
+_INSERT_DOCUMENTS = text(
+    f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(INDEXED_COLUMNS)}) "
+    f"VALUES (:rowid, {', '.join(':' + name for name in INDEXED_COLUMNS)})"
+)
+
+async def index_new_vehicles(db, vehicles: list[dict]) -> None:
+    """Index vehicles inserted without the ORM unit of work (bulk Core inserts).
+
+    `vehicles` are column-value dicts including `id`. Run inside the
+    inserting transaction.
+    """
+    if vehicles and _is_sqlite(engine):
+        await db.execute(_INSERT_DOCUMENTS, [_document(values) for values in vehicles])
+
+def rebuild_search_index(connection):
+    """Re-index every vehicle. Takes a sync connection (use with run_sync)."""
+    if not _is_sqlite(connection):
+        return  # The generated tsvector column is always current
+    connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    connection.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(INDEXED_COLUMNS)}) "
+        "SELECT id, coalesce(title, ''), coalesce(make, ''), coalesce(model, ''), "
+        "coalesce(variant, ''), coalesce(description, ''), coalesce(features, '') FROM vehicles"
+    ))
+
+def ensure_search_index(connection):
+    """Create the text index if missing, back-filling it for existing rows.
+
+    Safe to run on every startup. Takes a sync connection (use with run_sync).
+    """
+    if _is_sqlite(connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        if exists:
+            return
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        rebuild_search_index(connection)
+    elif connection.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+@event.listens_for(Vehicle.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    ensure_search_index(connection)
+
+@event.listens_for(Vehicle.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    if _is_sqlite(connection):
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    """Mirror vehicle inserts, updates and deletes into the FTS5 table."""
+    changed = [obj for obj in (*session.new, *session.dirty) if isinstance(obj, Vehicle)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Vehicle)]
+    if not changed and not deleted:
+        return
+
+    connection = session.connection()
+    if not _is_sqlite(connection):
+        return
+
+    stale_ids = [{"rowid": vehicle.id} for vehicle in (*changed, *deleted)]
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), stale_ids)
+    if changed:
+        connection.execute(
+            _INSERT_DOCUMENTS,
+            [_document({name: getattr(vehicle, name) for name in ("id", *INDEXED_COLUMNS)}) for vehicle in changed],
+        )
@@ -0,0 +1,240 @@
+"""In-memory feature store for "similar vehicles" recommendations.
+
+Every listing is reduced to a compact vector: integer codes for make, model,
+body type and fuel type, year, log price, mileage, and a 256-bit hashed set
+of its `features`. Vectors are kept in NumPy arrays partitioned by
+vehicle_type, so recommendations never cross types. A query computes the
+weighted distance from one listing to every other listing of its type in a
+few vectorized passes over contiguous columns and keeps the k closest. The
+feature-set term is bounded, so it is only computed for rows that can still
+make the cut.
+
+The store is built from the database on first use and then kept current from
+vehicle change events. Changes with incomplete values are re-read before
+the next query. It is per process.
+"""
+import asyncio
+import enum
+import hashlib
+import math
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session_maker
+from app.models.vehicle import Vehicle
+from app.vehicles.events import DELETED, on_vehicles_changed
+
+_COLUMNS = ["vehicle_type", "make", "model", "body_type", "fuel_type", "year", "price", "mileage", "features"]
+_REFRESH_BATCH = 500
+
+FEATURE_BITS = 256
+_FEATURE_WORDS = FEATURE_BITS // 64
+
+# Distance weights. Categorical terms add their weight on a mismatch; numeric
+# terms add it per unit of the given scale.
+WEIGHTS = {
+    "make": 2.0,
+    "model": 3.0,
+    "body_type": 1.5,
+    "fuel_type": 1.0,
+    "year": 1.0,  # per 3 years
+    "price": 2.0,  # per 50% price difference
+    "mileage": 1.0,  # per 50,000 km
+    "features": 1.5,  # times (1 - Jaccard similarity)
+}
+_YEAR_SCALE = 3.0
+_PRICE_SCALE = math.log(1.5)
+_MILEAGE_SCALE = 50_000.0
+
+def _label(value) -> str:
+    if isinstance(value, enum.Enum):
+        value = value.name
+    return (value or "").strip().lower()
+
+def _feature_words(features) -> list[int]:
+    """Hash a listing's features into a FEATURE_BITS-bit set, as 64-bit words."""
+    words = [0] * _FEATURE_WORDS
+    for feature in features or []:
+        digest = hashlib.blake2b(_label(feature).encode(), digest_size=4).digest()
+        bit = int.from_bytes(digest, "little") % FEATURE_BITS
+        words[bit // 64] |= 1 << (bit % 64)
+    return words
+
+def _bit_counts(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a 2-D uint64 array (np.bitwise_count needs NumPy 2)."""
+    return np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+_CATEGORICAL = ["make", "model", "body_type", "fuel_type"]
+# numeric column -> distance weight per unit
+_NUMERIC_WEIGHTS = {
+    "year": WEIGHTS["year"] / _YEAR_SCALE,
+    "log_price": WEIGHTS["price"] / _PRICE_SCALE,
+    "mileage": WEIGHTS["mileage"] / _MILEAGE_SCALE,
+}
+_ARRAYS = {
+    "ids": (np.int64, ()),
+    "alive": (bool, ()),
+    **{column: (np.int32, ()) for column in _CATEGORICAL},
+    **{column: (np.float32, ()) for column in _NUMERIC_WEIGHTS},
+    "features": (np.uint64, (_FEATURE_WORDS,)),
+    "feature_counts": (np.int32, ()),
+}
+
+class _Partition:
+    """Vectors of one vehicle_type, one array per column, with room to grow."""
+
+    def __init__(self):
+        self.size = 0
+        for name, (dtype, shape) in _ARRAYS.items():
+            setattr(self, name, np.zeros((0, *shape), dtype=dtype))
+
+    def append(self) -> int:
+        if self.size == len(self.ids):
+            capacity = max(256, 2 * len(self.ids))
+            for name in _ARRAYS:
+                current = getattr(self, name)
+                grown = np.zeros((capacity, *current.shape[1:]), dtype=current.dtype)
+                grown[:len(current)] = current
+                setattr(self, name, grown)
+        self.size += 1
+        return self.size - 1
+
+    def nearest(self, row: int, k: int) -> list[int]:
+        size = self.size
+        distance = np.zeros(size, dtype=np.float32)
+        for column in _CATEGORICAL:
+            values = getattr(self, column)
+            distance += (values[:size] != values[row]) * np.float32(WEIGHTS[column])
+        for column, weight in _NUMERIC_WEIGHTS.items():
+            values = getattr(self, column)
+            distance += np.abs(values[:size] - values[row]) * np.float32(weight)
+        distance[~self.alive[:size]] = np.inf
+        distance[row] = np.inf
+
+        k = min(k, int(np.isfinite(distance).sum()))
+        if k == 0:
+            return []
+        # The feature term adds at most its weight, so only rows within that
+        # margin of the k-th best partial distance can still make the cut
+        cutoff = np.partition(distance, k - 1)[k - 1] + WEIGHTS["features"]
+        candidates = np.flatnonzero(distance <= cutoff)
+
+        shared = _bit_counts(self.features[candidates] & self.features[row])
+        union = self.feature_counts[candidates] + self.feature_counts[row] - shared
+        jaccard = np.divide(shared, union, out=np.ones(len(candidates)), where=union > 0)
+        totals = distance[candidates] + WEIGHTS["features"] * (1.0 - jaccard)
+
+        closest = np.argpartition(totals, k - 1)[:k]
+        closest = closest[np.lexsort((self.ids[candidates[closest]], totals[closest]))]
+        return self.ids[candidates[closest]].tolist()
+
+class SimilarVehicleIndex:
+    def __init__(self):
+        self.ready = False
+        self._building = False
+        self._lock = asyncio.Lock()
+        self._partitions: dict[str, _Partition] = {}
+        self._locations: dict[int, tuple[str, int]] = {}  # vehicle id -> (partition, row)
+        self._codes: dict[str, dict[str, int]] = {column: {} for column in _CATEGORICAL}
+        self._stale: set[int] = set()
+
+    def _code(self, column: str, value) -> int:
+        codes = self._codes[column]
+        return codes.setdefault(_label(value), len(codes))
+
+    def _upsert(self, vehicle_id: int, values: dict) -> None:
+        partition_name = _label(values["vehicle_type"])
+        location = self._locations.get(vehicle_id)
+        if location is not None and location[0] != partition_name:
+            self._remove(vehicle_id)
+            location = None
+        if location is None:
+            partition = self._partitions.setdefault(partition_name, _Partition())
+            row = partition.append()
+            self._locations[vehicle_id] = (partition_name, row)
+        else:
+            partition = self._partitions[partition_name]
+            row = location[1]
+
+        partition.ids[row] = vehicle_id
+        partition.alive[row] = True
+        for column in _CATEGORICAL:
+            getattr(partition, column)[row] = self._code(column, values[column])
+        partition.year[row] = values["year"]
+        partition.log_price[row] = math.log(max(values["price"], 1.0))
+        partition.mileage[row] = values["mileage"]
+        words = _feature_words(values["features"])
+        partition.features[row] = words
+        partition.feature_counts[row] = sum(bin(word).count("1") for word in words)
+
+    def _remove(self, vehicle_id: int) -> None:
+        location = self._locations.pop(vehicle_id, None)
+        if location is not None:
+            partition_name, row = location
+            self._partitions[partition_name].alive[row] = False
+
+    async def _load(self, db: AsyncSession, ids: Optional[list[int]] = None) -> set[int]:
+        query = select(Vehicle.id, *(getattr(Vehicle, column) for column in _COLUMNS))
+        if ids is not None:
+            query = query.where(Vehicle.id.in_(ids))
+        result = await db.stream(query.execution_options(yield_per=10_000))
+        loaded = set()
+        async for rows in result.partitions():
+            for row in rows:
+                loaded.add(row.id)
+                self._upsert(row.id, row._mapping)
+        return loaded
+
+    async def ensure_current(self) -> None:
+        """Build the store on first use and re-read listings with unknown values.
+
+        Reads the primary, which the change events describe; a replica may lag.
+        """
+        if self.ready and not self._stale:
+            return
+        async with self._lock, async_session_maker() as db:
+            if not self.ready:
+                self._building = True
+                try:
+                    self._stale.clear()
+                    await self._load(db)
+                    self.ready = True
+                finally:
+                    self._building = False
+            while self._stale:
+                batch = [self._stale.pop() for _ in range(min(len(self._stale), _REFRESH_BATCH))]
+                for vehicle_id in set(batch) - await self._load(db, batch):
+                    self._remove(vehicle_id)
+
+    def apply(self, changes) -> None:
+        if not self.ready:
+            # Nothing to keep in sync until the first query builds the store,
+            # but a build in progress may already have read the old values
+            if self._building:
+                self._stale.update(change.id for change in changes)
+            return
+        for change in changes:
+            if change.action == DELETED:
+                self._remove(change.id)
+            elif change.values is not None and all(column in change.values for column in _COLUMNS):
+                self._upsert(change.id, change.values)
+            else:
+                self._stale.add(change.id)
+
+    async def similar_ids(self, vehicle_id: int, k: int) -> Optional[list[int]]:
+        """Ids of the k listings closest to `vehicle_id`, or None if it does not exist."""
+        await self.ensure_current()
+        location = self._locations.get(vehicle_id)
+        if location is None:
+            return None
+        partition_name, row = location
+        return self._partitions[partition_name].nearest(row, k)
+
+similar_vehicle_index = SimilarVehicleIndex()
+
+@on_vehicles_changed
+def _sync_similar_vehicle_index(changes):
+    similar_vehicle_index.apply(changes)
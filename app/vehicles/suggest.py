@@ -0,0 +1,175 @@
+"""In-memory type-ahead index for make, model and variant suggestions.
+
+Every distinct make, make/model and make/model/variant is an entry with the
+number of listings carrying it. Entries are reachable from several lower-
+cased keys ("axio" and "toyota axio" both lead to Toyota Axio), kept in one
+sorted list, so the keys starting with a prefix form a contiguous range
+found by binary search. The most-listed entries of that range are picked
+with a NumPy partial sort.
+
+The index is loaded at startup (or by the first request) with one grouped
+query and then kept current from vehicle change events; it never queries
+the database while answering. It is per process.
+"""
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session_maker
+from app.models.vehicle import Vehicle
+from app.vehicles.events import CREATED, DELETED, on_vehicles_changed
+
+SUGGEST_FIELDS = ("make", "model", "variant")
+_KEY_END = "\uffff"  # Sorts after any character in a key
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+@dataclass
+class Suggestion:
+    field: str  # "make", "model" or "variant"
+    text: str  # e.g. "Toyota Axio"
+    make: str
+    model: Optional[str] = None
+    variant: Optional[str] = None
+
+def _suggestions(make, model, variant) -> list[tuple[Suggestion, list[str]]]:
+    """The entries a listing counts towards, with the keys each is found under.
+
+    Whitespace is already collapsed, so lower-casing a key normalizes it.
+    """
+    make, model, variant = (" ".join((value or "").split()) for value in (make, model, variant))
+    if not make:
+        return []
+    entries = [(Suggestion("make", make, make), [make])]
+    if model:
+        entries.append((Suggestion("model", f"{make} {model}", make, model), [model, f"{make} {model}"]))
+        if variant:
+            entries.append((
+                Suggestion("variant", f"{make} {model} {variant}", make, model, variant),
+                [variant, f"{model} {variant}", f"{make} {model} {variant}"],
+            ))
+    return entries
+
+class SuggestionIndex:
+    def __init__(self):
+        self.ready = False
+        self._lock = asyncio.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._entries: list[Suggestion] = []
+        self._entry_ids: dict[str, int] = {}  # normalized entry text + field -> entry
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._keys: list[str] = []  # sorted
+        self._key_entries = np.zeros(0, dtype=np.int32)  # entry of each key
+
+    def _count(self, make, model, variant, delta: int) -> list[tuple[str, int]]:
+        """Adjust the counts of a listing's entries. Returns the keys of unseen entries."""
+        new_keys = []
+        for suggestion, keys in _suggestions(make, model, variant):
+            entry_key = f"{suggestion.field}:{suggestion.text.lower()}"
+            entry = self._entry_ids.get(entry_key)
+            if entry is None:
+                if delta <= 0:
+                    continue
+                entry = len(self._entries)
+                self._entry_ids[entry_key] = entry
+                self._entries.append(suggestion)
+                if entry == len(self._counts):
+                    self._counts = np.concatenate([self._counts, np.zeros(max(len(self._counts), 256), dtype=np.int64)])
+                new_keys.extend((key, entry) for key in dict.fromkeys(key.lower() for key in keys))
+            self._counts[entry] = max(int(self._counts[entry]) + delta, 0)
+        return new_keys
+
+    def _add_keys(self, new_keys: list[tuple[str, int]]) -> None:
+        for key, entry in new_keys:
+            position = bisect_left(self._keys, key)
+            self._keys.insert(position, key)
+            self._key_entries = np.insert(self._key_entries, position, entry)
+
+    async def build(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(Vehicle.make, Vehicle.model, Vehicle.variant, func.count())
+            .group_by(Vehicle.make, Vehicle.model, Vehicle.variant)
+        )
+        entries: dict[str, list] = {}  # entry key -> [suggestion, keys, count]
+        for make, model, variant, count in result:
+            for suggestion, keys in _suggestions(make, model, variant):
+                entry = entries.setdefault(f"{suggestion.field}:{suggestion.text.lower()}", [suggestion, keys, 0])
+                entry[2] += count
+
+        self._clear()
+        self._entry_ids = {entry_key: position for position, entry_key in enumerate(entries)}
+        self._entries = [suggestion for suggestion, _, _ in entries.values()]
+        self._counts = np.array([count for _, _, count in entries.values()], dtype=np.int64)
+        keyed = sorted(
+            (key, position)
+            for position, (_, keys, _) in enumerate(entries.values())
+            for key in dict.fromkeys(key.lower() for key in keys)
+        )
+        self._keys = [key for key, _ in keyed]
+        self._key_entries = np.array([position for _, position in keyed], dtype=np.int32)
+        self.ready = True
+
+    async def ensure_loaded(self) -> None:
+        if self.ready:
+            return
+        # Built from the primary, which the change events that follow describe
+        async with self._lock, async_session_maker() as db:
+            if not self.ready:
+                await self.build(db)
+
+    def apply(self, changes) -> None:
+        if not self.ready:
+            return
+        new_keys = []
+        for change in changes:
+            values = change.values or {}
+            if "make" not in values:
+                continue  # Image-only change, or values unknown
+            listing = (values["make"], values.get("model"), values.get("variant"))
+            if change.action == CREATED:
+                new_keys.extend(self._count(*listing, 1))
+            elif change.action == DELETED:
+                self._count(*listing, -1)
+            elif change.previous and any(field in change.previous for field in SUGGEST_FIELDS):
+                previous = tuple(change.previous.get(field, value) for field, value in zip(SUGGEST_FIELDS, listing))
+                self._count(*previous, -1)
+                new_keys.extend(self._count(*listing, 1))
+        self._add_keys(new_keys)
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        """The `limit` most-listed entries with a key starting with `prefix`."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _KEY_END, lo=start)
+        entries = self._key_entries[start:end]
+        counts = self._counts[entries]
+        # An entry sits under at most three keys, so this many keys cover `limit` entries
+        wanted = 3 * limit
+        if len(entries) > wanted:
+            top = np.argpartition(-counts, wanted - 1)[:wanted]
+            entries, counts = entries[top], counts[top]
+
+        ranked = sorted(
+            {int(entry): int(count) for entry, count in zip(entries, counts) if count > 0}.items(),
+            key=lambda item: (-item[1], len(self._entries[item[0]].text), self._entries[item[0]].text),
+        )
+        return [
+            {**self._entries[entry].__dict__, "count": count}
+            for entry, count in ranked[:limit]
+        ]
+
+suggestion_index = SuggestionIndex()
+
+@on_vehicles_changed
+def _sync_suggestion_index(changes):
+    suggestion_index.apply(changes)
@@ -0,0 +1,275 @@
+"""Market valuation from precomputed asking-price statistics.
+
+`vehicle_price_stats` holds one row of price percentiles per lower-cased
+make/model, year and mileage band, plus an ALL_MILEAGE row per make/model/
+year. The valuation endpoint only ever reads this table.
+
+New listings update their two rows in the same transaction that inserts
+them, using a uniform reservoir of price samples per row to keep the
+percentiles current. That step is best effort: concurrent writers can race
+on a row, and deletes or price edits are not tracked. A periodic full
+rebuild therefore recomputes every row from `vehicles` with vectorized
+NumPy aggregation.
+"""
+import asyncio
+import os
+import random
+from bisect import bisect_right
+
+import numpy as np
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session_maker, read_session
+from app.models.price_stat import ALL_MILEAGE, PriceStat
+from app.models.vehicle import Vehicle
+
+VALUATION_REBUILD_INTERVAL = float(os.getenv("VALUATION_REBUILD_INTERVAL", "3600"))  # seconds; 0 disables
+# Prices kept per row for incremental percentile updates
+SAMPLE_SIZE = 256
+# A mileage band with fewer listings than this falls back to the all-mileage row
+MIN_BAND_LISTINGS = 3
+
+# Lower bounds of the mileage bands in km; the last band is open-ended
+MILEAGE_BANDS = [0, 20_000, 50_000, 80_000, 120_000, 160_000, 220_000]
+
+PERCENTILES = {
+    "price_p10": 10,
+    "price_p25": 25,
+    "price_median": 50,
+    "price_p75": 75,
+    "price_p90": 90,
+}
+
+def normalize(name: str) -> str:
+    return (name or "").strip().lower()
+
+def mileage_band(mileage: int) -> int:
+    return max(bisect_right(MILEAGE_BANDS, mileage) - 1, 0)
+
+def band_range(band: int) -> tuple:
+    """(min_km, max_km) of a band; max_km is None for the last band."""
+    upper = MILEAGE_BANDS[band + 1] if band + 1 < len(MILEAGE_BANDS) else None
+    return MILEAGE_BANDS[band], upper
+
+def _buckets(listing: dict) -> list[tuple]:
+    make, model = normalize(listing["make"]), normalize(listing["model"])
+    return [
+        (make, model, listing["year"], mileage_band(listing["mileage"])),
+        (make, model, listing["year"], ALL_MILEAGE),
+    ]
+
+def _percentiles(samples) -> dict:
+    values = np.percentile(np.asarray(samples, dtype=np.float64), list(PERCENTILES.values()))
+    return {column: float(value) for column, value in zip(PERCENTILES, values)}
+
+# Incremental updates
+
+def _add_prices(stat: PriceStat, prices: list[float]) -> None:
+    samples = list(stat.price_samples)
+    count = stat.listing_count
+    for price in prices:
+        count += 1
+        # Reservoir sampling keeps every price seen equally likely to be in the sample
+        if len(samples) < SAMPLE_SIZE:
+            samples.append(price)
+        else:
+            slot = random.randrange(count)
+            if slot < SAMPLE_SIZE:
+                samples[slot] = price
+    stat.price_mean = (stat.price_mean * stat.listing_count + sum(prices)) / count
+    stat.listing_count = count
+    stat.price_min = min(stat.price_min, *prices)
+    stat.price_max = max(stat.price_max, *prices)
+    stat.price_samples = samples
+    for column, value in _percentiles(samples).items():
+        setattr(stat, column, value)
+
+def _new_stat(bucket: tuple, prices: list[float]) -> PriceStat:
+    make, model, year, band = bucket
+    samples = prices[:SAMPLE_SIZE]
+    return PriceStat(
+        make=make, model=model, year=year, mileage_band=band,
+        listing_count=len(prices),
+        price_min=min(prices),
+        price_max=max(prices),
+        price_mean=sum(prices) / len(prices),
+        price_samples=samples,
+        **_percentiles(samples),
+    )
+
+async def record_listing_prices(db: AsyncSession, listings: list[dict]) -> None:
+    """Fold new listings into their price statistics rows.
+
+    `listings` are column-value dicts with make, model, year, mileage and
+    price. Runs in a savepoint of the caller's transaction; a conflict with a
+    concurrent writer skips the update rather than failing the listing write.
+    """
+    prices_by_bucket: dict[tuple, list[float]] = {}
+    for listing in listings:
+        for bucket in _buckets(listing):
+            prices_by_bucket.setdefault(bucket, []).append(float(listing["price"]))
+    if not prices_by_bucket:
+        return
+
+    try:
+        async with db.begin_nested():
+            result = await db.execute(
+                select(PriceStat).where(
+                    tuple_(PriceStat.make, PriceStat.model, PriceStat.year, PriceStat.mileage_band)
+                    .in_(list(prices_by_bucket))
+                )
+            )
+            existing = {
+                (stat.make, stat.model, stat.year, stat.mileage_band): stat for stat in result.scalars()
+            }
+            for bucket, prices in prices_by_bucket.items():
+                if bucket in existing:
+                    _add_prices(existing[bucket], prices)
+                else:
+                    db.add(_new_stat(bucket, prices))
+    except IntegrityError:
+        pass  # Another writer created the row first; the next rebuild catches up
+
+# Full rebuild
+
+def _aggregate(groups: np.ndarray, prices: np.ndarray) -> dict:
+    """Per-group price statistics for integer group ids, computed without Python loops."""
+    order = np.lexsort((prices, groups))
+    groups, prices = groups[order], prices[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    counts = np.diff(np.r_[starts, len(prices)])
+    stats = {
+        "group": groups[starts],
+        "start": starts,
+        "listing_count": counts,
+        "price_min": prices[starts],
+        "price_max": prices[starts + counts - 1],
+        "price_mean": np.add.reduceat(prices, starts) / counts,
+        "sorted_prices": prices,
+    }
+    for column, percentile in PERCENTILES.items():
+        # Linear interpolation between order statistics, as np.percentile does
+        position = starts + (counts - 1) * (percentile / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        stats[column] = prices[lower] + (prices[upper] - prices[lower]) * (position - lower)
+    return stats
+
+def _stat_rows(keys: np.ndarray, stats: dict) -> list[dict]:
+    prices = stats["sorted_prices"]
+    rows = []
+    for index, group in enumerate(stats["group"]):
+        make, model, year, band = keys[group]
+        start, count = int(stats["start"][index]), int(stats["listing_count"][index])
+        # An evenly spaced subset of the sorted prices seeds the incremental reservoir
+        picks = np.linspace(start, start + count - 1, min(count, SAMPLE_SIZE)).round().astype(np.int64)
+        rows.append({
+            "make": make,
+            "model": model,
+            "year": int(year),
+            "mileage_band": int(band),
+            "price_samples": prices[picks].tolist(),
+            **{
+                column: float(stats[column][index])
+                for column in ("price_min", "price_max", "price_mean", *PERCENTILES)
+            },
+            "listing_count": count,
+        })
+    return rows
+
+async def price_stat_rows(db: AsyncSession) -> tuple[list[dict], int]:
+    """Compute every statistics row from the vehicles table. Only reads, so any session will do.
+
+    Returns the rows and the highest vehicle id the scan saw, for `replace_price_stats`.
+    """
+    makes, models, years, mileages, prices = [], [], [], [], []
+    last_id = 0
+    result = await db.stream(
+        select(Vehicle.id, Vehicle.make, Vehicle.model, Vehicle.year, Vehicle.mileage, Vehicle.price)
+        .execution_options(yield_per=10_000)
+    )
+    async for partition in result.partitions():
+        for vehicle_id, make, model, year, mileage, price in partition:
+            last_id = max(last_id, vehicle_id)
+            makes.append(normalize(make))
+            models.append(normalize(model))
+            years.append(year)
+            mileages.append(mileage)
+            prices.append(price)
+
+    rows = []
+    if prices:
+        prices = np.asarray(prices, dtype=np.float64)
+        names = np.char.add(np.char.add(np.asarray(makes, dtype=str), "\x1f"), np.asarray(models, dtype=str))
+        name_keys, name_codes = np.unique(names, return_inverse=True)
+        years = np.asarray(years, dtype=np.int64)
+        bands = np.searchsorted(MILEAGE_BANDS, np.asarray(mileages, dtype=np.int64), side="right") - 1
+        bands = np.maximum(bands, 0)
+
+        for band_column in (bands, np.full_like(bands, ALL_MILEAGE)):
+            keys, groups = np.unique(np.stack([name_codes, years, band_column], axis=1), axis=0, return_inverse=True)
+            labelled = [(*name_keys[code].split("\x1f"), year, band) for code, year, band in keys]
+            rows += _stat_rows(labelled, _aggregate(groups.ravel(), prices))
+    return rows, last_id
+
+async def replace_price_stats(db: AsyncSession, rows: list[dict], scanned_through: int) -> int:
+    """Swap the statistics table's contents for `rows` in one transaction. Returns the row count.
+
+    Listings created after the scan (ids above `scanned_through`) already
+    updated the old rows; they are folded into the new ones too, so they are
+    not lost until the next rebuild.
+    """
+    await db.execute(delete(PriceStat))
+    for start in range(0, len(rows), 1000):
+        await db.execute(insert(PriceStat), rows[start:start + 1000])
+    result = await db.execute(
+        select(Vehicle.make, Vehicle.model, Vehicle.year, Vehicle.mileage, Vehicle.price)
+        .where(Vehicle.id > scanned_through)
+    )
+    await record_listing_prices(db, [row._asdict() for row in result])
+    await db.commit()
+    return len(rows)
+
+async def rebuild_price_stats(db: AsyncSession) -> int:
+    """Recompute every statistics row from the vehicles table. Returns the row count."""
+    rows, scanned_through = await price_stat_rows(db)
+    return await replace_price_stats(db, rows, scanned_through)
+
+async def refresh_price_stats_periodically() -> None:
+    """Rebuild the statistics now and then every VALUATION_REBUILD_INTERVAL seconds."""
+    while True:
+        try:
+            # Scan on the read pool so the (single, in tuned SQLite) writer
+            # connection is only held for the short replace transaction
+            async with read_session() as session:
+                rows, scanned_through = await price_stat_rows(session)
+            async with async_session_maker() as session:
+                await replace_price_stats(session, rows, scanned_through)
+        except Exception as e:
+            print(f"⚠️ Price statistics rebuild failed: {e}")
+        await asyncio.sleep(VALUATION_REBUILD_INTERVAL)
+
+# Lookup
+
+async def find_valuation(db: AsyncSession, make: str, model: str, year: int, mileage=None):
+    """The statistics row answering a valuation query, or None without market data.
+
+    With a mileage, its band is used when it has at least MIN_BAND_LISTINGS
+    listings; otherwise the answer covers every mileage.
+    """
+    bands = [ALL_MILEAGE] if mileage is None else [mileage_band(mileage), ALL_MILEAGE]
+    result = await db.execute(
+        select(PriceStat).where(
+            PriceStat.make == normalize(make),
+            PriceStat.model == normalize(model),
+            PriceStat.year == year,
+            PriceStat.mileage_band.in_(bands),
+        )
+    )
+    stats = {stat.mileage_band: stat for stat in result.scalars()}
+    band_stat = stats.get(bands[0])
+    if band_stat is not None and (band_stat.listing_count >= MIN_BAND_LISTINGS or ALL_MILEAGE not in stats):
+        return band_stat
+    return stats.get(ALL_MILEAGE)
@@ -0,0 +1,70 @@
+"""Shared pieces of the vehicle write paths (single create and bulk import)."""
+from typing import Optional
+
+from sqlalchemy import event, select, update
+
+from app.geo import geohash
+from app.geo.gazetteer import geocode
+from app.models.vehicle import Vehicle
+from app.schemas.vehicle import VehicleCreate
+
+def geocoded_fields(location: Optional[str]) -> dict:
+    """Latitude, longitude and geohash for a listing's location (all None if unknown)."""
+    point = geocode(location)
+    if point is None:
+        return dict(latitude=None, longitude=None, geohash=None)
+    latitude, longitude = point
+    return dict(latitude=latitude, longitude=longitude, geohash=geohash.encode(latitude, longitude))
+
+@event.listens_for(Vehicle.location, "set")
+def _geocode_location(vehicle, location, previous, initiator):
+    # Keeps coordinates current for any ORM write that sets or changes the location
+    for key, value in geocoded_fields(location).items():
+        setattr(vehicle, key, value)
+
+def backfill_geocodes(connection) -> int:
+    """Geocode listings stored before coordinates existed. Returns rows updated."""
+    locations = connection.execute(
+        select(Vehicle.location).where(Vehicle.geohash.is_(None)).distinct()
+    ).scalars().all()
+    updated = 0
+    for location in locations:
+        fields = geocoded_fields(location)
+        if fields["geohash"] is None:
+            continue
+        result = connection.execute(
+            update(Vehicle)
+            .where(Vehicle.location == location, Vehicle.geohash.is_(None))
+            .values(**fields)
+        )
+        updated += result.rowcount
+    return updated
+
+def vehicle_values(vehicle_data: VehicleCreate, posted_by_id: int) -> dict:
+    """Column values for a new Vehicle row built from a VehicleCreate payload."""
+    return dict(
+        posted_by_id=posted_by_id,
+        vehicle_type=vehicle_data.vehicle_type,
+        title=vehicle_data.title,
+        make=vehicle_data.make,
+        model=vehicle_data.model,
+        variant=vehicle_data.variant,
+        year=vehicle_data.year,
+        price=vehicle_data.price,
+        mileage=vehicle_data.mileage,
+        fuel_type=vehicle_data.fuel_type,
+        transmission=vehicle_data.transmission,
+        body_type=vehicle_data.body_type,
+        color=vehicle_data.color,
+        engine_size=vehicle_data.engine_size,
+        doors=vehicle_data.doors,
+        location=vehicle_data.location,
+        seller_type=vehicle_data.seller_type,
+        import_status=vehicle_data.import_status,
+        condition=vehicle_data.condition,
+        ownership_history=vehicle_data.ownership_history,
+        description=vehicle_data.description,
+        features=vehicle_data.features,
+        # Bulk inserts skip the ORM location event, so geocode here as well
+        **geocoded_fields(vehicle_data.location),
+    )
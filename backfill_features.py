@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Fill the features / vehicle_features tables from the JSON features of existing listings.
+
+Safe to re-run: each listing's feature rows are replaced, one batch per transaction.
+"""
+import asyncio
+
+from app.db import engine, Base, async_session_maker
+from app.models import Vehicle, VehicleImage, User  # noqa: F401 - registers every table
+from app.models.dealer_profile import DealerProfile  # noqa: F401
+from app.vehicles.features import backfill_vehicle_features
+
+async def backfill_features():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        processed = await backfill_vehicle_features(session)
+    print(f"✅ Feature rows rebuilt for {processed} vehicles")
+
+if __name__ == "__main__":
+    print("Running feature backfill script...")
+    asyncio.run(backfill_features())
+    print("Script completed!")
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Load-test the real HTTP endpoints and record the results as JSON.
+
+Seeds the database up to the requested size with generate_dataset.py, boots
+app.main:app under uvicorn in a subprocess, and drives each endpoint in turn
+with concurrent asyncio clients for a fixed time:
+
+- public_search: GET /api/vehicles/public with random mixed filters and sorts
+- vehicle_detail: GET /api/vehicles/{id}
+- login: POST /auth/login
+- me: GET /auth/me
+- create_vehicle: POST /api/vehicles
+
+For each endpoint it reports throughput, p50/p95/p99 latency, errors and
+SQL statements per request. The server counts statements itself and
+returns the count in a response header. The results file records the
+commit, so runs can be compared with --compare.
+
+    python benchmarks/load_test.py [--database-url URL] [--vehicles 10000] [--concurrency 16] [--seconds 10]
+        [--endpoints public_search,login] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "carro_load_test.db")
+
+# Server side
+
+def serve(port: int) -> None:
+    """Run the app with a per-request SQL statement counter (the --serve mode)."""
+    import uvicorn
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app.main import app
+
+    statements = contextvars.ContextVar("statements", default=None)
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count_statement(connection, cursor, statement, parameters, context, executemany):
+        counter = statements.get()
+        if counter is not None:
+            counter[0] += 1
+
+    async def counted_app(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+        counter = [0]
+        statements.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (QUERY_COUNT_HEADER.lower().encode(), str(counter[0]).encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await app(scope, receive, send_with_count)
+
+    uvicorn.run(counted_app, host="127.0.0.1", port=port, log_level="warning")
+
+# Seeding
+
+async def seed(args) -> tuple[list[str], int]:
+    """Top the database up to the requested size. Returns generated user emails and the highest vehicle id."""
+    from sqlalchemy import func, select
+
+    import generate_dataset
+    from app.db import engine, async_session_maker
+    from app.models import User, Vehicle
+
+    if not await generate_dataset.init_database():
+        raise SystemExit(1)
+    email_pattern = f"%@{generate_dataset.EMAIL_DOMAIN}"
+    async with async_session_maker() as session:
+        vehicles = (await session.execute(select(func.count(Vehicle.id)))).scalar()
+        users = (await session.execute(select(func.count(User.id)).where(User.email.like(email_pattern)))).scalar()
+    missing_vehicles, missing_users = max(args.vehicles - vehicles, 0), max(args.users - users, 0)
+    if missing_vehicles or missing_users:
+        print(f"🌱 Seeding {missing_vehicles} vehicles and {missing_users} users...")
+        await generate_dataset.generate_dataset(argparse.Namespace(
+            vehicles=missing_vehicles, users=missing_users, dealer_share=0.1, images=3.0,
+            days=365, batch_size=5_000, seed=args.seed, reset=False,
+        ))
+
+    async with async_session_maker() as session:
+        emails = (await session.execute(
+            select(User.email).where(User.email.like(email_pattern)).order_by(User.id).limit(args.users)
+        )).scalars().all()
+        max_vehicle_id = (await session.execute(select(func.max(Vehicle.id)))).scalar() or 0
+    await engine.dispose()
+    return emails, max_vehicle_id
+
+# Client side
+
+class Workload:
+    def __init__(self, rng: random.Random, emails: list[str], tokens: list[str], max_vehicle_id: int):
+        from generate_dataset import CATALOG, FEATURES, GENERATED_PASSWORD, TOWN_WEIGHTS
+
+        self.rng = rng
+        self.emails = emails
+        self.tokens = tokens
+        self.max_vehicle_id = max_vehicle_id
+        self.password = GENERATED_PASSWORD
+        self.catalog = CATALOG
+        self.features = FEATURES
+        self.towns = list(TOWN_WEIGHTS)
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def _search_params(self) -> dict:
+        rng = self.rng
+        make, model, *_ = rng.choice(self.catalog)
+        params = {"limit": 20}
+        if rng.random() < 0.4:
+            params["make"] = make
+            if rng.random() < 0.5:
+                params["model"] = model
+        if rng.random() < 0.3:
+            low = rng.choice([1, 2, 3, 5, 8]) * 1_000_000
+            params.update(min_price=low, max_price=low * rng.choice([2, 3, 5]))
+        if rng.random() < 0.3:
+            params["min_year"] = rng.randint(2008, 2022)
+        if rng.random() < 0.2:
+            params["fuel_type"] = rng.choice(["petrol", "diesel", "hybrid", "electric"])
+        if rng.random() < 0.15:
+            params["q"] = model
+        if rng.random() < 0.1:
+            params.update(near=rng.choice(self.towns), radius_km=25)
+        if rng.random() < 0.1:
+            params["features"] = rng.choice(self.features)
+        if "q" not in params:
+            params["sort"] = rng.choice(["created_at_desc", "price_asc", "price_desc", "year_desc", "mileage_asc"])
+        if rng.random() < 0.3:
+            params["view"] = "card"
+        return params
+
+    def _vehicle_payload(self) -> dict:
+        rng = self.rng
+        make, model, vehicle_type, body_type, new_price, fuel_types, _, variants = rng.choice(self.catalog)
+        year = rng.randint(2010, 2024)
+        return {
+            "vehicle_type": vehicle_type.value, "title": f"{year} {make} {model}", "make": make, "model": model,
+            "variant": rng.choice(variants), "year": year, "price": float(round(new_price * 0.92 ** (2025 - year), -4)),
+            "mileage": rng.randint(0, 150_000), "fuel_type": rng.choice(fuel_types).value, "transmission": "Automatic",
+            "body_type": body_type, "color": "White", "engine_size": 1.5, "doors": 4, "location": rng.choice(self.towns).title(),
+            "seller_type": "Private", "import_status": "Used Import", "condition": "Used", "ownership_history": 1,
+            "description": "Load test listing", "features": rng.sample(self.features, 3),
+            "images": [{"url": "https://images.loadtest.carro.com/new/1.jpg"}],
+        }
+
+    async def public_search(self, client):
+        return await client.get("/api/vehicles/public", params=self._search_params())
+
+    async def vehicle_detail(self, client):
+        return await client.get(f"/api/vehicles/{self.rng.randint(1, self.max_vehicle_id)}")
+
+    async def login(self, client):
+        return await client.post("/auth/login", json={"email": self.rng.choice(self.emails), "password": self.password})
+
+    async def me(self, client):
+        return await client.get("/auth/me", headers=self._auth())
+
+    async def create_vehicle(self, client):
+        return await client.post("/api/vehicles", json=self._vehicle_payload(), headers=self._auth())
+
+ENDPOINTS = ["public_search", "vehicle_detail", "login", "me", "create_vehicle"]
+
+def _percentile(ordered: list[float], percentile: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+def summarize(latencies: list[float], queries: list[int], errors: int, cache_hits: int, seconds: float) -> dict:
+    ordered = sorted(latencies) or [0.0]
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / seconds, 2),
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50": round(_percentile(ordered, 50) * 1000, 3),
+            "p95": round(_percentile(ordered, 95) * 1000, 3),
+            "p99": round(_percentile(ordered, 99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+    if cache_hits:
+        summary["cache_hit_ratio"] = round(cache_hits / len(latencies), 3)
+    return summary
+
+async def run_endpoint(client, workload: Workload, name: str, args) -> dict:
+    import httpx
+
+    operation = getattr(workload, name)
+    latencies, queries = [], []
+    errors = cache_hits = 0
+    deadline = time.monotonic() + args.seconds
+
+    async def worker():
+        nonlocal errors, cache_hits
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await operation(client)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                errors += 1
+                continue
+            latencies.append(elapsed)
+            if QUERY_COUNT_HEADER in response.headers:
+                queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+            cache_hits += response.headers.get("X-Cache") == "HIT"
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return summarize(latencies, queries, errors, cache_hits, time.monotonic() - started)
+
+async def wait_until_ready(client, server: subprocess.Popen, timeout: float = 300) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"❌ Server exited with code {server.returncode}")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("❌ Server did not become ready")
+
+async def drive(args, server: subprocess.Popen, emails: list[str], max_vehicle_id: int) -> dict:
+    import httpx
+
+    from generate_dataset import GENERATED_PASSWORD
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+        await wait_until_ready(client, server)
+        tokens = []
+        for email in emails[:20]:
+            response = await client.post("/auth/login", json={"email": email, "password": GENERATED_PASSWORD})
+            response.raise_for_status()
+            tokens.append(response.json()["access_token"])
+        workload = Workload(random.Random(args.seed), emails, tokens, max_vehicle_id)
+
+        if args.warmup:
+            await run_endpoint(client, workload, "public_search", argparse.Namespace(**{**vars(args), "seconds": args.warmup}))
+        results = {}
+        for name in args.endpoints:
+            results[name] = await run_endpoint(client, workload, name, args)
+            result = results[name]
+            print(
+                f"  {name:15} {result['throughput_rps']:9.1f} req/s  p50 {result['latency_ms']['p50']:8.2f} ms  "
+                f"p95 {result['latency_ms']['p95']:8.2f} ms  p99 {result['latency_ms']['p99']:8.2f} ms  "
+                f"queries {result['queries_per_request']['mean']}  errors {result['errors']}"
+            )
+        return results
+
+def _git(*command: str):
+    try:
+        return subprocess.run(["git", *command], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📊 Compared with {baseline_path} ({baseline['meta'].get('commit')})")
+    for name, result in results["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before or not before["requests"]:
+            continue
+        throughput = (result["throughput_rps"] / before["throughput_rps"] - 1) * 100 if before["throughput_rps"] else 0.0
+        p95 = (result["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1) * 100 if before["latency_ms"]["p95"] else 0.0
+        print(f"  {name:15} throughput {throughput:+7.1f}%  p95 {p95:+7.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--vehicles", type=int, default=10_000, help="seed the database up to this many vehicles")
+    parser.add_argument("--users", type=int, default=200, help="seed up to this many generated users")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10, help="run time per endpoint")
+    parser.add_argument("--warmup", type=float, default=2, help="public search warm-up before measuring, in seconds")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="results file (default benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    os.environ["DATABASE_URL"] = args.database_url
+    emails, max_vehicle_id = asyncio.run(seed(args))
+    if not emails or not max_vehicle_id:
+        raise SystemExit("❌ Seeding left no generated users or vehicles to test with")
+
+    # The periodic price statistics rebuild would compete with the measured requests
+    server_env = {"VALUATION_REBUILD_INTERVAL": "0", **os.environ}
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port)], cwd=ROOT, env=server_env
+    )
+    print(f"🏁 {', '.join(args.endpoints)}: {args.concurrency} clients, {args.seconds:g}s each, {max_vehicle_id} vehicles")
+    try:
+        endpoint_results = asyncio.run(drive(args, server, emails, max_vehicle_id))
+    finally:
+        server.terminate()
+        server.wait()
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "database": args.database_url.split(":", 1)[0],
+            "vehicles": max_vehicle_id,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "endpoints": endpoint_results,
+    }
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
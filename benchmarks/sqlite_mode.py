@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Compare SQLite throughput with default settings and in tuned mode.
+
+Seeds a fresh database file for each mode, then runs concurrent writer
+tasks (single-listing inserts, one transaction each) and reader tasks
+(filtered, sorted search pages) for a fixed time, and reports operations
+per second, latency and "database is locked" errors.
+
+    python benchmarks/sqlite_mode.py [--seconds 10] [--writers 8] [--readers 32] [--rows 20000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "carro_bench.db"))
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base, create_sqlite_engines
+from app.models import Vehicle
+from app.models.dealer_profile import DealerProfile  # noqa: F401 - resolves User.dealer_profile
+from app.models.vehicle import FuelType, ImportStatus, SellerType, TransmissionType, VehicleCondition, VehicleType
+
+MAKES = {"Toyota": ["Axio", "Aqua", "Prius"], "Honda": ["Fit", "Vezel", "Civic"], "Suzuki": ["Alto", "Swift", "Wagon R"]}
+
+def vehicle_row() -> dict:
+    make = random.choice(list(MAKES))
+    model = random.choice(MAKES[make])
+    year = random.randint(2005, 2024)
+    return dict(
+        posted_by_id=1, vehicle_type=VehicleType.car, title=f"{year} {make} {model}", make=make, model=model,
+        year=year, price=float(random.randint(2, 20) * 500_000), mileage=random.randint(0, 200_000),
+        fuel_type=random.choice(list(FuelType)), transmission=random.choice(list(TransmissionType)),
+        body_type="Sedan", color="White", engine_size=1.5, doors=4, location="Colombo",
+        seller_type=random.choice(list(SellerType)), import_status=ImportStatus.used_import,
+        condition=VehicleCondition.used, ownership_history=1, description="Benchmark listing", features=["ABS"],
+    )
+
+def search_query():
+    make = random.choice(list(MAKES))
+    return (
+        select(Vehicle.id, Vehicle.title, Vehicle.price)
+        .where(Vehicle.make == make, Vehicle.price <= random.randint(4, 20) * 500_000)
+        .order_by(Vehicle.created_at.desc(), Vehicle.id.desc())
+        .limit(20)
+    )
+
+class Stats:
+    def __init__(self):
+        self.ok = 0
+        self.locked = 0
+        self.errors = 0
+        self.latencies = []
+
+    def summary(self, seconds: float) -> str:
+        latencies = sorted(self.latencies) or [0.0]
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        return (
+            f"{self.ok / seconds:9.1f} ops/s  p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  "
+            f"locked {self.locked}  other errors {self.errors}"
+        )
+
+async def worker(session_maker, operation, stats: Stats, deadline: float):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session_maker() as session:
+                await operation(session)
+            stats.ok += 1
+            stats.latencies.append(time.perf_counter() - started)
+        except DBAPIError as e:
+            if "locked" in str(e.orig):
+                stats.locked += 1
+            else:
+                stats.errors += 1
+
+async def write_listing(session):
+    await session.execute(insert(Vehicle), [vehicle_row()])
+    await session.commit()
+
+async def read_page(session):
+    (await session.execute(search_query())).all()
+
+async def run_mode(name: str, tuned: bool, args) -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="carro_bench_"), "bench.db")
+    url = f"sqlite+aiosqlite:///{path}"
+    if tuned:
+        writer, reader = create_sqlite_engines(url)
+    else:
+        writer = reader = create_async_engine(url)
+
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with writer.begin() as conn:
+        for start in range(0, args.rows, 1000):
+            await conn.execute(insert(Vehicle), [vehicle_row() for _ in range(min(1000, args.rows - start))])
+
+    write_sessions = async_sessionmaker(writer, expire_on_commit=False)
+    read_sessions = async_sessionmaker(reader, expire_on_commit=False)
+    writes, reads = Stats(), Stats()
+    deadline = time.monotonic() + args.seconds
+    await asyncio.gather(
+        *[worker(write_sessions, write_listing, writes, deadline) for _ in range(args.writers)],
+        *[worker(read_sessions, read_page, reads, deadline) for _ in range(args.readers)],
+    )
+    await writer.dispose()
+    await reader.dispose()
+
+    print(f"{name}")
+    print(f"  writes {writes.summary(args.seconds)}")
+    print(f"  reads  {reads.summary(args.seconds)}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+    print(f"🏁 {args.writers} writers, {args.readers} readers, {args.rows} seeded rows, {args.seconds:g}s per mode")
+    await run_mode("default settings (rollback journal, shared pool)", False, args)
+    await run_mode("tuned mode (WAL, single writer, read pool)", True, args)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Shared pytest fixtures: the app against a throwaway SQLite database with the demo data.
+
+The database URL is set before anything imports app.db, which creates the
+engines at import time.
+"""
+import os
+import tempfile
+import uuid
+
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(prefix="carro_tests_"), "test.db")
+os.environ["VALUATION_REBUILD_INTERVAL"] = "0"  # Tests rebuild price statistics themselves
+os.environ["SQLITE_TUNED"] = "true"  # As deployed (railway.toml, Dockerfile)
+
+import pytest
+from fastapi.testclient import TestClient
+
+LISTING = {
+    "vehicle_type": "Car",
+    "title": "2020 Toyota Axio",
+    "make": "Toyota",
+    "model": "Axio",
+    "variant": "G",
+    "year": 2020,
+    "price": 8_500_000.0,
+    "mileage": 40_000,
+    "fuel_type": "Hybrid",
+    "transmission": "Automatic",
+    "body_type": "Sedan",
+    "color": "White",
+    "engine_size": 1.5,
+    "doors": 4,
+    "location": "Colombo",
+    "seller_type": "Dealer",
+    "import_status": "Used Import",
+    "condition": "Used",
+    "ownership_history": 1,
+    "description": "Well maintained",
+    "features": ["ABS", "Reverse Camera"],
+    "images": [{"url": "https://example.com/1.jpg"}],
+}
+
+def listing(**overrides) -> dict:
+    """A valid VehicleCreate payload with the given fields replaced."""
+    return {**LISTING, **overrides}
+
+def unique_make() -> str:
+    """A make no other test uses, so searches only see the test's own listings."""
+    return "Make" + uuid.uuid4().hex[:10]
+
+async def _prepare_database():
+    from app.db import engine, read_engine
+    from run import init_database
+    from seed_db import seed_database
+
+    assert await init_database()
+    await seed_database()
+    # The test client runs the app on its own event loop; start it with empty pools
+    await engine.dispose()
+    await read_engine.dispose()
+
+@pytest.fixture(scope="session")
+def client():
+    import asyncio
+
+    from app.main import app
+
+    asyncio.run(_prepare_database())
+    with TestClient(app) as test_client:
+        yield test_client
+
+def login(client, email: str, password: str) -> dict:
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture(scope="session")
+def dealer_headers(client) -> dict:
+    return login(client, "dealer@carro.com", "dealer123")
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict:
+    return login(client, "admin@carro.com", "admin123")
+
+@pytest.fixture
+def create_listing(client, dealer_headers):
+    """Post a listing as the demo dealer and return the created vehicle."""
+    def create(**overrides) -> dict:
+        response = client.post("/api/vehicles", json=listing(**overrides), headers=dealer_headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return create
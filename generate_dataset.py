@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Generate a large synthetic marketplace for load and search testing.
+
+Creates users (a share of them dealerships with dealer profiles), vehicles
+and images with realistic spreads of makes, models, years, prices, mileage
+and towns. Rows are written in batches with bulk Core inserts, or with COPY
+on PostgreSQL (asyncpg). Each vehicle batch also fills the text index and
+feature rows in the same transaction, and price statistics are rebuilt at
+the end. Saved-search matching is not run for generated listings.
+
+Appends to the configured DATABASE_URL unless --reset is given.
+
+    python generate_dataset.py [--vehicles 1000000] [--users 20000] [--batch-size 5000] [--seed 42] [--reset]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select, text
+
+from app.auth import get_password_hash
+from app.db import engine, Base, async_session_maker, drop_schema_fingerprint
+from app.geo.gazetteer import TOWNS
+from app.models import Vehicle, VehicleImage, User
+from app.models.dealer_profile import DealerProfile
+from app.models.user import UserType
+from app.models.vehicle import (
+    FuelType, ImportStatus, SellerType, TransmissionType, VehicleCondition, VehicleType,
+)
+from app.vehicles.features import sync_vehicle_features
+from app.vehicles.search import index_new_vehicles
+from app.vehicles.valuation import rebuild_price_stats
+from app.vehicles.writes import geocoded_fields
+from run import init_database
+
+GENERATED_PASSWORD = "loadtest123"  # Every generated user can log in with this
+EMAIL_DOMAIN = "loadtest.carro.com"
+
+# (make, model, vehicle type, body type, new price in LKR, fuel types, share of listings, variants)
+CATALOG = [
+    ("Toyota", "Axio", VehicleType.car, "Sedan", 14_500_000, [FuelType.hybrid, FuelType.petrol], 9, ["G", "X", "WXB"]),
+    ("Toyota", "Aqua", VehicleType.car, "Hatchback", 12_000_000, [FuelType.hybrid], 8, ["S", "G", "Crossover"]),
+    ("Toyota", "Prius", VehicleType.car, "Hatchback", 16_000_000, [FuelType.hybrid], 5, ["S", "A", "Touring"]),
+    ("Toyota", "Corolla", VehicleType.car, "Sedan", 15_000_000, [FuelType.petrol, FuelType.hybrid], 4, ["LX", "GLi", "Altis"]),
+    ("Toyota", "Land Cruiser", VehicleType.car, "SUV", 95_000_000, [FuelType.diesel], 1, ["Prado", "Sahara", "ZX"]),
+    ("Toyota", "HiAce", VehicleType.van, "Van", 22_000_000, [FuelType.diesel], 2, ["Dolphin", "KDH", "Commuter"]),
+    ("Suzuki", "Alto", VehicleType.car, "Hatchback", 5_500_000, [FuelType.petrol], 8, ["LXi", "VXi", "K10"]),
+    ("Suzuki", "Wagon R", VehicleType.car, "Hatchback", 7_500_000, [FuelType.petrol, FuelType.hybrid], 7, ["FX", "FZ", "Stingray"]),
+    ("Suzuki", "Swift", VehicleType.car, "Hatchback", 9_000_000, [FuelType.petrol], 4, ["RS", "XG", "Sport"]),
+    ("Suzuki", "Every", VehicleType.van, "Van", 6_500_000, [FuelType.petrol], 2, ["PA", "Join", "Wagon"]),
+    ("Honda", "Fit", VehicleType.car, "Hatchback", 10_500_000, [FuelType.hybrid, FuelType.petrol], 6, ["GP5", "GK3", "L Package"]),
+    ("Honda", "Vezel", VehicleType.car, "SUV", 17_500_000, [FuelType.hybrid], 5, ["Z", "RS", "X"]),
+    ("Honda", "Civic", VehicleType.car, "Sedan", 18_000_000, [FuelType.petrol], 2, ["EX", "RS", "Type R"]),
+    ("Honda", "Grace", VehicleType.car, "Sedan", 12_500_000, [FuelType.hybrid], 2, ["LX", "EX"]),
+    ("Nissan", "Leaf", VehicleType.car, "Hatchback", 11_000_000, [FuelType.electric], 3, ["X", "G", "Aero"]),
+    ("Nissan", "X-Trail", VehicleType.car, "SUV", 19_000_000, [FuelType.petrol, FuelType.hybrid], 2, ["20X", "Mode Premier"]),
+    ("Nissan", "Sunny", VehicleType.car, "Sedan", 6_000_000, [FuelType.petrol], 2, ["FB15", "Super Saloon"]),
+    ("Mitsubishi", "Montero", VehicleType.car, "SUV", 35_000_000, [FuelType.diesel], 1, ["Sport", "GLS"]),
+    ("Mitsubishi", "Lancer", VehicleType.car, "Sedan", 8_000_000, [FuelType.petrol], 2, ["GLX", "EX"]),
+    ("Mazda", "Axela", VehicleType.car, "Hatchback", 13_000_000, [FuelType.petrol, FuelType.diesel], 1, ["15S", "XD"]),
+    ("Hyundai", "Tucson", VehicleType.car, "SUV", 20_000_000, [FuelType.petrol, FuelType.diesel], 1, ["GL", "GLS"]),
+    ("Kia", "Sportage", VehicleType.car, "SUV", 19_500_000, [FuelType.petrol, FuelType.diesel], 1, ["LX", "EX", "GT Line"]),
+    ("Kia", "Picanto", VehicleType.car, "Hatchback", 6_500_000, [FuelType.petrol], 1, ["LX", "EX"]),
+    ("BMW", "3 Series", VehicleType.car, "Sedan", 38_000_000, [FuelType.petrol, FuelType.diesel], 1, ["318i", "320d", "330e"]),
+    ("Mercedes-Benz", "C-Class", VehicleType.car, "Sedan", 45_000_000, [FuelType.petrol, FuelType.hybrid], 1, ["C200", "C300", "C350e"]),
+    ("Micro", "Panda", VehicleType.car, "Hatchback", 3_000_000, [FuelType.petrol], 1, ["Cross", "LX"]),
+    ("Bajaj", "RE", VehicleType.threeWheeler, "Three Wheeler", 2_200_000, [FuelType.petrol], 6, ["4 Stroke", "2 Stroke"]),
+    ("Bajaj", "Pulsar", VehicleType.motorbike, "Motorcycle", 900_000, [FuelType.petrol], 3, ["150", "180", "NS200"]),
+    ("Honda", "Dio", VehicleType.motorbike, "Scooter", 650_000, [FuelType.petrol], 3, ["Standard", "Deluxe"]),
+    ("TVS", "Apache", VehicleType.motorbike, "Motorcycle", 850_000, [FuelType.petrol], 2, ["RTR 160", "RTR 200"]),
+    ("Yadea", "G5", VehicleType.electricBike, "Scooter", 700_000, [FuelType.electric], 1, ["Lite", "Pro"]),
+    ("Isuzu", "Elf", VehicleType.truck, "Lorry", 14_000_000, [FuelType.diesel], 2, ["Freezer", "Tipper", "Crew Cab"]),
+    ("Tata", "Ace", VehicleType.truck, "Lorry", 4_500_000, [FuelType.diesel], 1, ["Gold", "HT"]),
+    ("Kubota", "M5000", VehicleType.farm, "Tractor", 9_500_000, [FuelType.diesel], 1, ["2WD", "4WD"]),
+    ("JCB", "3DX", VehicleType.plant, "Backhoe Loader", 32_000_000, [FuelType.diesel], 1, ["Super", "Xtra"]),
+]
+
+# town -> share of listings; towns not listed share the remainder equally
+TOWN_WEIGHTS = {"colombo": 20, "kandy": 6, "gampaha": 6, "negombo": 5, "kurunegala": 5, "galle": 4, "nugegoda": 4}
+
+FEATURES = [
+    "Air Conditioning", "Power Steering", "Power Windows", "ABS", "Airbags", "Reverse Camera",
+    "Push Start", "Alloy Wheels", "Keyless Entry", "Navigation", "Sunroof", "Leather Seats",
+    "Cruise Control", "Bluetooth", "Heated Mirrors", "Parking Sensors", "Fog Lamps", "Multi-function Steering",
+]
+COLORS = ["White", "Silver", "Black", "Grey", "Blue", "Red", "Pearl White", "Green", "Brown"]
+FIRST_NAMES = ["Nimal", "Kamal", "Sunil", "Chamari", "Dilani", "Ruwan", "Ishara", "Sanjeewa", "Tharindu", "Nadeesha"]
+LAST_NAMES = ["Perera", "Fernando", "Silva", "Jayasinghe", "Bandara", "Wickramasinghe", "Dissanayake", "Rajapaksa"]
+
+def _cumulative(weights) -> list[float]:
+    total, cumulative = 0.0, []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+_CATALOG_WEIGHTS = _cumulative(entry[6] for entry in CATALOG)
+_TOWNS = list(TOWNS)
+_TOWN_WEIGHTS = _cumulative(TOWN_WEIGHTS.get(town, 0.5) for town in _TOWNS)
+_TOWN_FIELDS = {town: geocoded_fields(town.title()) for town in _TOWNS}
+
+class Generator:
+    def __init__(self, rng: random.Random, now: datetime, days: int):
+        self.rng = rng
+        self.now = now
+        self.days = days
+        self.password_hash = get_password_hash(GENERATED_PASSWORD)
+
+    def users(self, first_id: int, count: int, dealer_share: float) -> tuple[list[dict], list[dict]]:
+        users, profiles = [], []
+        for user_id in range(first_id, first_id + count):
+            rng = self.rng
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            dealer = rng.random() < dealer_share
+            town = rng.choices(_TOWNS, cum_weights=_TOWN_WEIGHTS)[0].title()
+            business_name = f"{last_name} {rng.choice(['Motors', 'Auto Traders', 'Car Sale', 'Auto Mart'])} {user_id}" if dealer else None
+            users.append(dict(
+                id=user_id,
+                email=f"user{user_id}@{EMAIL_DOMAIN}",
+                hashed_password=self.password_hash,
+                is_active=True,
+                is_superuser=False,
+                is_verified=rng.random() < 0.8,
+                first_name=first_name,
+                last_name=last_name,
+                user_type=UserType.dealership if dealer else UserType.individual,
+                business_name=business_name,
+                business_registration=f"PV{user_id:08d}" if dealer else None,
+                phone=f"+947{rng.randrange(10**8):08d}",
+                address=f"{rng.randint(1, 400)} Main Street, {town}",
+                created_at=self.now - timedelta(days=rng.uniform(0, self.days * 2)),
+            ))
+            if dealer:
+                profiles.append(dict(
+                    user_id=user_id,
+                    business_id=f"GEN{user_id:08d}",
+                    business_name=business_name,
+                    address=f"{rng.randint(1, 400)} Main Street, {town}",
+                    phone=users[-1]["phone"],
+                    rating=round(rng.uniform(3.0, 5.0), 1),
+                    about_us=f"{business_name} has served buyers in {town} for {rng.randint(2, 30)} years.",
+                    services=rng.sample(["Leasing", "Trade-in", "Warranty", "Servicing", "Registration"], 2),
+                ))
+        return users, profiles
+
+    def vehicle(self, vehicle_id: int, posted_by_id: int, dealer: bool, created_at: datetime) -> dict:
+        rng = self.rng
+        make, model, vehicle_type, body_type, new_price, fuel_types, _, variants = rng.choices(CATALOG, cum_weights=_CATALOG_WEIGHTS)[0]
+        # Ages skew young: most listings are 3-12 years old, a long tail reaches 30
+        age = min(int(rng.gammavariate(2.5, 3.0)), 30)
+        year = self.now.year - age
+        if age == 0 and rng.random() < 0.7:
+            condition = VehicleCondition.new
+        else:
+            condition = VehicleCondition.reconditioned if rng.random() < 0.3 else VehicleCondition.used
+        mileage = 0 if condition == VehicleCondition.new else int(max(age, 0.5) * rng.gammavariate(4.0, 3_000))
+        # About 8% a year of depreciation, with listing-to-listing spread
+        price = new_price * 0.92 ** age * rng.lognormvariate(0, 0.12)
+        variant = rng.choice(variants) if rng.random() < 0.8 else None
+        town = rng.choices(_TOWNS, cum_weights=_TOWN_WEIGHTS)[0]
+        features = rng.sample(FEATURES, rng.randint(0, 8)) or None
+        manual = vehicle_type in (VehicleType.threeWheeler, VehicleType.farm) or rng.random() < 0.2
+        return dict(
+            id=vehicle_id,
+            posted_by_id=posted_by_id,
+            vehicle_type=vehicle_type,
+            title=" ".join(part for part in (str(year), make, model, variant) if part),
+            make=make,
+            model=model,
+            variant=variant,
+            year=year,
+            price=float(max(round(price, -4), 10_000)),
+            mileage=mileage,
+            fuel_type=rng.choice(fuel_types),
+            transmission=TransmissionType.manual if manual else TransmissionType.automatic,
+            body_type=body_type,
+            color=rng.choice(COLORS),
+            engine_size=round(rng.uniform(0.6, 3.0), 1),
+            doors={VehicleType.car: 4, VehicleType.van: 5}.get(vehicle_type, 2),
+            registration_date=None if condition == VehicleCondition.new else (created_at - timedelta(days=365 * age)).date(),
+            location=town.title(),
+            **_TOWN_FIELDS[town],
+            seller_type=SellerType.dealer if dealer else SellerType.private,
+            import_status=rng.choice(list(ImportStatus)),
+            condition=condition,
+            ownership_history=0 if condition == VehicleCondition.new else min(int(rng.expovariate(1.0)) + 1, 5),
+            description=(
+                f"{year} {make} {model} in {rng.choice(['excellent', 'good', 'mint', 'well maintained'])} condition, "
+                f"{mileage:,} km. Located in {town.title()}."
+            ),
+            features=features,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+def _copy_value(value):
+    # COPY sends raw column values: enums by name, as SQLAlchemy stores them, JSON as text
+    if isinstance(value, (VehicleType, FuelType, TransmissionType, SellerType, ImportStatus, VehicleCondition, UserType)):
+        return value.name
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+async def write_rows(session, table, rows: list[dict]) -> None:
+    """Bulk insert `rows` into `table`: COPY on PostgreSQL (asyncpg), executemany otherwise."""
+    if not rows:
+        return
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg":
+        columns = list(rows[0])
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, columns=columns, records=[tuple(_copy_value(row[column]) for column in columns) for row in rows]
+        )
+    else:
+        await session.execute(insert(table), rows)
+
+async def _next_id(session, model) -> int:
+    return (await session.execute(select(func.coalesce(func.max(model.id), 0)))).scalar() + 1
+
+async def _reset_sequences(session) -> None:
+    # Explicit ids bypass PostgreSQL sequences; move them past the generated rows
+    connection = await session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for table in ("users", "dealer_profiles", "vehicles", "vehicle_images"):
+        await session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+        ))
+    await session.commit()
+
+async def generate_dataset(args) -> None:
+    if args.reset:
+        print("🗑️  Dropping existing tables...")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            # Otherwise init_database trusts the old marker and skips create_all
+            await conn.run_sync(drop_schema_fingerprint)
+    if not await init_database():
+        raise SystemExit(1)
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    generator = Generator(rng, now, args.days)
+    started = time.perf_counter()
+
+    async with async_session_maker() as session:
+        first_user_id = await _next_id(session, User)
+        posters, dealers = [], set()
+        for start in range(0, args.users, args.batch_size):
+            count = min(args.batch_size, args.users - start)
+            users, profiles = generator.users(first_user_id + start, count, args.dealer_share)
+            await write_rows(session, User.__table__, users)
+            await write_rows(session, DealerProfile.__table__, profiles)
+            await session.commit()
+            posters.extend(user["id"] for user in users)
+            dealers.update(profile["user_id"] for profile in profiles)
+        print(f"👥 {args.users} users ({len(dealers)} dealers) in {time.perf_counter() - started:.1f}s")
+
+        if not posters:
+            posters = (await session.execute(select(User.id))).scalars().all()
+            if not posters:
+                raise SystemExit("❌ No users to post the vehicles; pass --users")
+        # Dealers post far more listings than private sellers
+        poster_weights = _cumulative(20 if user_id in dealers else 1 for user_id in posters)
+
+        first_vehicle_id = await _next_id(session, Vehicle)
+        images = 0
+        for start in range(0, args.vehicles, args.batch_size):
+            count = min(args.batch_size, args.vehicles - start)
+            rows = []
+            for offset in range(count):
+                position = start + offset
+                # Listing dates rise with the id, spread over the last --days days
+                created_at = now - timedelta(days=args.days * (1 - position / args.vehicles), seconds=rng.uniform(0, 60))
+                posted_by_id = rng.choices(posters, cum_weights=poster_weights)[0]
+                rows.append(generator.vehicle(first_vehicle_id + position, posted_by_id, posted_by_id in dealers, created_at))
+            image_rows = [
+                {
+                    "vehicle_id": row["id"],
+                    "url": f"https://images.loadtest.carro.com/{row['id']}/{number}.jpg",
+                    "created_at": row["created_at"],
+                    "updated_at": row["created_at"],
+                }
+                for row in rows
+                for number in range(1, min(int(rng.expovariate(1 / args.images)) + 1, 12) + 1)
+            ]
+
+            await write_rows(session, Vehicle.__table__, rows)
+            await write_rows(session, VehicleImage.__table__, image_rows)
+            await index_new_vehicles(session, rows)
+            await sync_vehicle_features(session, [(row["id"], row["features"]) for row in rows])
+            await session.commit()
+            images += len(image_rows)
+
+            done = start + count
+            elapsed = time.perf_counter() - started
+            if done == args.vehicles or done // args.batch_size % 20 == 0:
+                print(f"🚗 {done}/{args.vehicles} vehicles, {images} images ({elapsed:.1f}s, {done / elapsed:,.0f} vehicles/s)")
+
+        await _reset_sequences(session)
+        print("📊 Rebuilding price statistics...")
+        await rebuild_price_stats(session)
+
+    print(f"✅ Generated {args.users} users, {args.vehicles} vehicles and {images} images in {time.perf_counter() - started:.1f}s")
+    print(f"🔑 Generated users log in with password '{GENERATED_PASSWORD}'")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--dealer-share", type=float, default=0.1, help="fraction of users that are dealerships")
+    parser.add_argument("--images", type=float, default=3.0, help="average images per vehicle")
+    parser.add_argument("--days", type=int, default=365, help="spread listing dates over this many days")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop every table first")
+    args = parser.parse_args()
+    asyncio.run(generate_dataset(args))
+
+if __name__ == "__main__":
+    main()
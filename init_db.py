@@ -10,6 +10,10 @@ from app.models.vehicle_image import VehicleImage
 from app.models.user import User, UserType
 from app.models.dealer_profile import DealerProfile
 from app.auth import get_password_hash
+from app.vehicles import search  # noqa: F401 - registers the full-text index hooks
+from app.vehicles import writes  # noqa: F401 - registers the location geocoding hook
+from app.vehicles.features import backfill_vehicle_features
+from app.vehicles.valuation import rebuild_price_stats
 
 async def create_tables_and_seed():
     print("Starting database initialization...")
@@ -289,6 +293,8 @@ async def create_tables_and_seed():
         session.add_all(vehicles)
         print("Committing changes...")
         await session.commit()
+        await rebuild_price_stats(session)
+        await backfill_vehicle_features(session)
         print("Database seeded with 6 vehicles, 3 demo users, and 1 dealer profile!")
         print("Demo users:")
         print("  - admin@carro.com / admin123 (admin)")
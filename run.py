@@ -3,16 +3,19 @@ import os
 import sys
 import asyncio
 
+# Skip demo data outside development; SEED_DATABASE overrides either way
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development").lower()
+SEED_DATABASE = os.getenv("SEED_DATABASE", str(ENVIRONMENT != "production")).lower() in ("1", "true", "yes")
+# Start serving before the database is ready, with /ready reporting when it is
+FAST_STARTUP = os.getenv("FAST_STARTUP", "true").lower() in ("1", "true", "yes")
+
 async def init_database():
-    """Initialize database tables"""
+    """Initialize database tables, unless the stored schema fingerprint is current"""
     try:
         print("🔧 Initializing database...")
-        from app.db import engine, Base
-        
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        from app.schema import ensure_schema
         
-        print("✅ Database tables created/verified")
+        await ensure_schema()
         return True
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
@@ -32,6 +35,31 @@ async def seed_database():
         print(f"⚠️ Database seeding failed (continuing anyway): {e}")
         return False
 
+async def startup_steps():
+    """Schema check, then demo data when enabled"""
+    if not await init_database():
+        print("❌ Database initialization failed, but continuing...")
+    if SEED_DATABASE:
+        print("🌱 Seeding database if needed...")
+        await seed_database()
+    else:
+        print("⏭️  Skipping demo data seeding")
+
+async def serve(app, config):
+    """Run uvicorn, with the startup steps before it or as part of the app's warm-up"""
+    import uvicorn
+    
+    if FAST_STARTUP:
+        # The lifespan runs these in the background; /health answers at once and /ready once they finish
+        app.state.startup_steps = [startup_steps]
+    else:
+        await startup_steps()
+        app.state.startup_steps = []  # Already done; skip the warm-up's own schema check
+    
+    print(f"🌐 Starting uvicorn server on 0.0.0.0:{config.port}")
+    print("🎉 Server ready! Check https://your-app.railway.app/docs for API documentation")
+    await uvicorn.Server(config).serve()
+
 def main():
     try:
         # Add current directory to Python path
@@ -54,24 +82,12 @@ def main():
             traceback.print_exc()
             sys.exit(1)
         
-        # Initialize database
-        print("🔧 Initializing database...")
-        if not asyncio.run(init_database()):
-            print("❌ Database initialization failed, but continuing...")
-        
-        # Seed database with demo data (only if empty)
-        print("🌱 Seeding database if needed...")
-        asyncio.run(seed_database())
-        
         # Import uvicorn after we know the app works
         print("📦 Importing uvicorn...")
         import uvicorn
         
-        print(f"🌐 Starting uvicorn server on 0.0.0.0:{port}")
-        print("🎉 Server ready! Check https://your-app.railway.app/docs for API documentation")
-        
-        # Use the imported app object directly instead of string path
-        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+        # Schema check, seeding and serving share one event loop
+        asyncio.run(serve(app, uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")))
         
     except Exception as e:
         print(f"💥 ERROR: {e}")
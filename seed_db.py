@@ -11,6 +11,7 @@ from app.models.vehicle_image import VehicleImage
 from app.models.user import User, UserType
 from app.models.dealer_profile import DealerProfile
 from app.auth import get_password_hash
+from app.vehicles.features import backfill_vehicle_features
 
 async def seed_database():
     """Seed database with demo data only if it's empty"""
@@ -18,11 +19,10 @@ async def seed_database():
     
     async_session = async_sessionmaker(engine, expire_on_commit=False)
     async with async_session() as session:
-        # Check if users already exist
-        result = await session.execute(select(User))
-        existing_users = result.scalars().all()
+        # Check if any user exists; one row is enough to know
+        existing_user = (await session.execute(select(User.id).limit(1))).first()
         
-        if existing_users:
+        if existing_user:
             print("✅ Database already has data, skipping seed")
             return
         
@@ -187,6 +187,7 @@ async def seed_database():
 
         session.add_all(vehicles)
         await session.commit()
+        await backfill_vehicle_features(session)
         
         print(f"✅ Database seeded with {len(vehicles)} vehicles and {len(demo_users)} users!")
         print("Demo accounts:")
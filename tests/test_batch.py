@@ -0,0 +1,12 @@
+from conftest import unique_make
+
+def test_batch_returns_vehicles_in_requested_order(client, create_listing):
+    make = unique_make()
+    ids = [create_listing(make=make)["id"] for _ in range(3)]
+    requested = [ids[2], 999_999, ids[0], ids[2], ids[1]]
+
+    response = client.get("/api/vehicles/batch", params={"ids": ",".join(map(str, requested))})
+    assert response.status_code == 200
+    assert [vehicle["id"] for vehicle in response.json()] == [ids[2], ids[0], ids[1]]
+
+    assert client.get("/api/vehicles/batch", params={"ids": "1,two"}).status_code == 400
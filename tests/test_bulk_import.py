@@ -0,0 +1,31 @@
+import json
+
+from conftest import listing, unique_make
+
+def test_bulk_import_reports_bad_rows_and_keeps_good_ones(client, dealer_headers):
+    make = unique_make()
+    rows = [
+        json.dumps(listing(make=make, title="First")),
+        json.dumps(listing(make=make, year="not a year")),
+        "{not json",
+        json.dumps(listing(make=make, title="Last")),
+    ]
+    response = client.post(
+        "/api/vehicles/import",
+        content="\n".join(rows) + "\n",
+        headers={**dealer_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["failed"]) == (2, 2)
+    assert [(row["line"], row["status"]) for row in report["results"]] == [
+        (1, "created"), (2, "error"), (3, "error"), (4, "created"),
+    ]
+    assert all(row["errors"] for row in report["results"] if row["status"] == "error")
+
+    titles = {vehicle["title"] for vehicle in client.get("/api/vehicles/public", params={"make": make}).json()}
+    assert titles == {"First", "Last"}
+
+def test_bulk_import_rejects_unknown_upload_types(client, dealer_headers):
+    response = client.post("/api/vehicles/import", content="x", headers={**dealer_headers, "Content-Type": "text/plain"})
+    assert response.status_code == 415
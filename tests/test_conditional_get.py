@@ -0,0 +1,44 @@
+from conftest import unique_make
+
+def test_vehicle_conditional_get(client, create_listing):
+    vehicle = create_listing(make=unique_make())
+    url = f"/api/vehicles/{vehicle['id']}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(url, headers={"If-Modified-Since": response.headers["Last-Modified"]})
+    assert response.status_code == 304
+
+    response = client.get(url, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json()["id"] == vehicle["id"]
+
+def test_edits_within_the_same_second_change_the_etag(client, create_listing, dealer_headers):
+    vehicle = create_listing(make=unique_make())
+    vehicle_url = f"/api/vehicles/{vehicle['id']}"
+    profile_url = f"/api/dealer-profile/{vehicle['posted_by_id']}"
+    vehicle_etag = client.get(vehicle_url).headers["ETag"]
+
+    for name in ("Colombo Motors", "Kandy Motors"):
+        profile_etag = client.get(profile_url).headers["ETag"]
+        client.put("/api/dealer-profile", json={"business_name": name}, headers=dealer_headers).raise_for_status()
+
+        # The updated_at timestamps may not have moved, but the body has
+        response = client.get(profile_url, headers={"If-None-Match": profile_etag})
+        assert response.status_code == 200
+        assert response.json()["business_name"] == name
+
+        # The listing embeds its poster's dealer profile
+        response = client.get(vehicle_url, headers={"If-None-Match": vehicle_etag})
+        assert response.status_code == 200
+        assert response.json()["posted_by"]["dealer_profile"]["business_name"] == name
+        vehicle_etag = response.headers["ETag"]
+        assert client.get(vehicle_url, headers={"If-None-Match": vehicle_etag}).status_code == 304
@@ -0,0 +1,20 @@
+import json
+
+from conftest import unique_make
+
+def test_export_streams_matching_listings(client, create_listing, dealer_headers):
+    make = unique_make()
+    ids = [create_listing(make=make)["id"] for _ in range(3)]
+
+    response = client.get("/api/vehicles/export", params={"make": make}, headers=dealer_headers)
+    assert response.status_code == 200
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ids
+
+    response = client.get("/api/vehicles/export", params={"make": make, "format": "csv"}, headers=dealer_headers)
+    assert response.text.splitlines()[0].startswith("id,posted_by_id,")
+    assert len(response.text.splitlines()) == 4
+
+def test_export_rejects_invalid_filters_before_streaming(client, dealer_headers):
+    response = client.get("/api/vehicles/export", params={"near": "Atlantis"}, headers=dealer_headers)
+    assert response.status_code == 400
+    assert "Atlantis" in response.json()["detail"]
@@ -0,0 +1,14 @@
+from conftest import unique_make
+
+def test_facets_ignore_their_own_filter(client, create_listing):
+    make = unique_make()
+    create_listing(make=make, fuel_type="Petrol")
+    create_listing(make=make, fuel_type="Petrol")
+    create_listing(make=make, fuel_type="Diesel")
+
+    response = client.get("/api/vehicles/facets", params={"make": make, "fuel_type": "Diesel"})
+    facets = response.json()
+    assert facets["total"] == 1
+    assert {bucket["value"]: bucket["count"] for bucket in facets["fuel_type"]} == {"Petrol": 2, "Diesel": 1}
+    # The make facet drops the make filter, so other diesel listings are counted too
+    assert {"value": make, "count": 1} in facets["make"]
@@ -0,0 +1,30 @@
+import warnings
+
+from sqlalchemy.exc import SADeprecationWarning
+
+from app.db import async_session_maker
+from app.vehicles.features import backfill_vehicle_features
+from conftest import unique_make
+
+def test_feature_filter_requires_every_feature(client, create_listing):
+    make = unique_make()
+    both = create_listing(make=make, features=["Sunroof", "Reverse  camera"])
+    create_listing(make=make, features=["Sunroof"])
+
+    response = client.get("/api/vehicles/public", params={"make": make, "features": "sunroof, REVERSE CAMERA"})
+    assert [vehicle["id"] for vehicle in response.json()] == [both["id"]]
+
+def test_backfill_rebuilds_feature_rows(client, create_listing):
+    make = unique_make()
+    vehicle = create_listing(make=make, features=["Heated seats"])
+
+    async def backfill():
+        async with async_session_maker() as session:
+            return await backfill_vehicle_features(session, batch_size=2)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SADeprecationWarning)
+        assert client.portal.call(backfill) >= 1
+
+    response = client.get("/api/vehicles/public", params={"make": make, "features": "heated seats"})
+    assert [listing["id"] for listing in response.json()] == [vehicle["id"]]
@@ -0,0 +1,29 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _generate(database: Path, *extra: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "generate_dataset.py", "--vehicles", "30", "--users", "5", "--images", "1", *extra],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{database}"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+def test_reset_recreates_the_schema(tmp_path):
+    database = tmp_path / "generated.db"
+    first = _generate(database)
+    assert first.returncode == 0, first.stdout + first.stderr
+
+    reset = _generate(database, "--reset", "--seed", "7")
+    assert reset.returncode == 0, reset.stdout + reset.stderr
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT count(*) FROM vehicles").fetchone() == (30,)
+        assert connection.execute("SELECT count(*) FROM vehicles_fts").fetchone() == (30,)
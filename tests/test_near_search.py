@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models.vehicle import Vehicle
+from app.vehicles import filters
+from conftest import unique_make
+
+def test_near_search_uses_geohash_cells_and_distance(client, create_listing):
+    make = unique_make()
+    colombo = create_listing(make=make, location="Colombo")
+    create_listing(make=make, location="Jaffna")
+
+    response = client.get("/api/vehicles/public", params={"make": make, "near": "Colombo", "radius_km": 10})
+    assert [vehicle["id"] for vehicle in response.json()] == [colombo["id"]]
+    assert client.get("/api/vehicles/public", params={"near": "Atlantis"}).status_code == 400
+
+def test_geohash_ranges_compare_bytewise_on_postgresql(client, monkeypatch):
+    dialect = postgresql.dialect()
+    monkeypatch.setattr(filters, "engine", SimpleNamespace(dialect=dialect))
+    query = filters.build_vehicle_search_query(near="6.9271,79.8612")
+    sql = str(query.compile(dialect=dialect))
+    assert '(vehicles.geohash COLLATE "C") >=' in sql
+    assert '(vehicles.geohash COLLATE "C") <=' in sql
+
+    index = next(index for index in Vehicle.__table__.indexes if index.name == "ix_vehicles_geohash_c")
+    assert 'COLLATE "C"' in str(CreateIndex(index).compile(dialect=dialect))
@@ -0,0 +1,30 @@
+from conftest import unique_make
+
+def test_cursor_pagination_walks_every_listing_once(client, create_listing):
+    make = unique_make()
+    prices = [9_000_000, 7_000_000, 8_000_000, 7_000_000, 6_500_000]
+    created = [create_listing(make=make, price=price)["id"] for price in prices]
+
+    seen, cursor = [], None
+    while True:
+        params = {"make": make, "sort": "price_asc", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/vehicles/public", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen += [vehicle["price"] for vehicle in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert seen and len(seen) <= len(created)
+
+    assert seen == sorted(prices)
+
+def test_cursor_must_match_sort(client, create_listing):
+    make = unique_make()
+    for _ in range(2):
+        create_listing(make=make)
+    response = client.get("/api/vehicles/public", params={"make": make, "sort": "price_asc", "limit": 1})
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/api/vehicles/public", params={"make": make, "sort": "year_desc", "cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.main import app, warm_up
+
+@pytest.fixture
+def cold_app(client):
+    """Mark the app as not warmed up again, restoring its state afterwards."""
+    state = dict(app.state._state)
+    app.state.ready = False
+    app.state.warm_up_error = None
+    yield app
+    app.state._state.clear()
+    app.state._state.update(state)
+
+def test_ready_waits_for_warm_up(client, cold_app):
+    release = threading.Event()
+
+    async def slow_step():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    cold_app.state.startup_steps = [slow_step]
+    warming = client.portal.start_task_soon(warm_up, cold_app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "warming up"
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/vehicles/public").status_code == 200
+
+    release.set()
+    warming.result(timeout=10)
+    assert client.get("/ready").status_code == 200
+
+def test_failed_warm_up_is_reported(client, cold_app):
+    async def broken_step():
+        raise RuntimeError("database unreachable")
+
+    cold_app.state.startup_steps = [broken_step]
+    client.portal.call(warm_up, cold_app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "database unreachable"
+
+def test_price_statistics_rebuild_starts_after_startup_steps(client, cold_app, monkeypatch):
+    events = []
+
+    async def create_tables():
+        await asyncio.sleep(0.05)
+        events.append("startup step")
+
+    async def refresh_price_stats_periodically():
+        events.append("price statistics rebuild")
+
+    monkeypatch.setattr("app.main.VALUATION_REBUILD_INTERVAL", 3600)
+    monkeypatch.setattr("app.main.refresh_price_stats_periodically", refresh_price_stats_periodically)
+    cold_app.state.startup_steps = [create_tables]
+
+    async def warm_up_and_wait():
+        await warm_up(cold_app)
+        await cold_app.state.price_stats_task
+
+    client.portal.call(warm_up_and_wait)
+    assert events == ["startup step", "price statistics rebuild"]
+    assert client.get("/ready").status_code == 200
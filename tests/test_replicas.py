@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import insert, update
+
+from app import db
+from app.auth import get_password_hash
+from app.models.user import User, UserType
+from conftest import login, unique_make
+
+@pytest.fixture
+def stale_replica(client, monkeypatch):
+    """A read replica holding a snapshot of the primary taken now, which never catches up."""
+    primary_path = db.engine.url.database
+    replica_path = primary_path.replace(".db", f"_replica_{unique_make()}.db")
+    with sqlite3.connect(primary_path) as primary, sqlite3.connect(replica_path) as replica:
+        primary.backup(replica)
+
+    replica = db.Replica(f"sqlite+aiosqlite:///{replica_path}")
+    monkeypatch.setattr(db.replica_router, "replicas", [replica])
+    yield replica
+    client.portal.call(replica.engine.dispose)
+
+def _add_user(client, email: str) -> None:
+    async def add():
+        async with db.async_session_maker() as session:
+            await session.execute(insert(User).values(
+                email=email,
+                hashed_password=get_password_hash("secret123"),
+                first_name="Replica",
+                last_name="Test",
+                phone="0771234567",
+                user_type=UserType.individual,
+            ))
+            await session.commit()
+    client.portal.call(add)
+
+def _deactivate(client, email: str) -> None:
+    async def deactivate():
+        async with db.async_session_maker() as session:
+            await session.execute(update(User).where(User.email == email).values(is_active=False))
+            await session.commit()
+    client.portal.call(deactivate)
+
+def test_authentication_ignores_lagging_replicas(client, stale_replica):
+    email = f"{unique_make().lower()}@example.com"
+    _add_user(client, email)
+    headers = login(client, email, "secret123")
+
+    # The replica snapshot predates the account
+    assert client.get("/api/saved-searches", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).json()["email"] == email
+
+    _deactivate(client, email)
+    response = client.get("/api/saved-searches", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
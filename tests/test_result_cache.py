@@ -0,0 +1,16 @@
+from conftest import unique_make
+
+def test_public_search_cache_is_invalidated_by_new_listings(client, create_listing):
+    make = unique_make()
+    create_listing(make=make)
+    params = {"make": make}
+
+    first = client.get("/api/vehicles/public", params=params)
+    second = client.get("/api/vehicles/public", params=params)
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.json() == first.json()
+
+    create_listing(make=make)
+    third = client.get("/api/vehicles/public", params=params)
+    assert third.headers["X-Cache"] == "MISS"
+    assert len(third.json()) == 2
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import login, unique_make
+
+@pytest.fixture(scope="module")
+def user_headers(client):
+    return login(client, "user@carro.com", "user123")
+
+def test_new_listings_land_in_matching_saved_search_inboxes(client, create_listing, user_headers):
+    make = unique_make()
+    response = client.post(
+        "/api/saved-searches",
+        json={"name": "Cheap hybrids", "filters": {"make": make, "fuel_type": "hybrid", "max_price": 5_000_000}},
+        headers=user_headers,
+    )
+    assert response.status_code == 200, response.text
+    saved_search_id = response.json()["id"]
+
+    match = create_listing(make=make, fuel_type="Hybrid", price=4_500_000)
+    create_listing(make=make, fuel_type="Hybrid", price=6_000_000)  # Too expensive
+    create_listing(make=make, fuel_type="Petrol", price=4_000_000)  # Wrong fuel
+
+    inbox = client.get(
+        "/api/saved-searches/matches", params={"saved_search_id": saved_search_id}, headers=user_headers
+    ).json()
+    assert [entry["vehicle"]["id"] for entry in inbox["matches"]] == [match["id"]]
+    assert inbox["unread"] >= 1
+
+    client.post(
+        "/api/saved-searches/matches/read", params={"saved_search_id": saved_search_id}, headers=user_headers
+    ).raise_for_status()
+    unread = client.get(
+        "/api/saved-searches/matches",
+        params={"saved_search_id": saved_search_id, "unread_only": True},
+        headers=user_headers,
+    ).json()
+    assert unread["matches"] == []
+
+def test_own_listings_do_not_match(client, create_listing, dealer_headers):
+    make = unique_make()
+    response = client.post(
+        "/api/saved-searches", json={"name": "Mine", "filters": {"make": make}}, headers=dealer_headers
+    )
+    saved_search_id = response.json()["id"]
+    create_listing(make=make)
+
+    inbox = client.get(
+        "/api/saved-searches/matches", params={"saved_search_id": saved_search_id}, headers=dealer_headers
+    ).json()
+    assert inbox["matches"] == []
+
+def test_deleting_a_saved_search_clears_and_stops_its_matches(client, create_listing, user_headers, dealer_headers):
+    make = unique_make()
+    response = client.post("/api/saved-searches", json={"name": "Any", "filters": {"make": make}}, headers=user_headers)
+    saved_search_id = response.json()["id"]
+    create_listing(make=make)
+
+    assert client.delete(f"/api/saved-searches/{saved_search_id}", headers=dealer_headers).status_code == 404
+    assert client.delete(f"/api/saved-searches/{saved_search_id}", headers=user_headers).status_code == 200
+    create_listing(make=make)
+
+    inbox = client.get(
+        "/api/saved-searches/matches", params={"saved_search_id": saved_search_id}, headers=user_headers
+    ).json()
+    assert inbox["matches"] == []
+    searches = client.get("/api/saved-searches", headers=user_headers).json()
+    assert saved_search_id not in [search["id"] for search in searches]
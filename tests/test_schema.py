@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Starts the app the way uvicorn does, without run.py's startup steps
+SERVE_WITHOUT_RUN_PY = textwrap.dedent("""
+    import time
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline, client.get("/ready").json()
+            time.sleep(0.05)
+        for params in ({}, {"q": "toyota"}, {"near": "Colombo"}, {"features": "abs"}):
+            response = client.get("/api/vehicles/public", params=params)
+            assert response.status_code == 200, (params, response.text)
+        assert client.get("/api/vehicles/valuation", params={"make": "Toyota", "model": "Axio", "year": 2020}).status_code == 404
+""")
+
+def test_app_prepares_its_schema_without_run_py(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", SERVE_WITHOUT_RUN_PY],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
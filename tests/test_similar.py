@@ -0,0 +1,28 @@
+import numpy as np
+
+from app.vehicles.similar import _bit_counts
+from conftest import unique_make
+
+def test_bit_counts_match_python_popcount():
+    rng = np.random.default_rng(7)
+    words = rng.integers(0, 2**64, size=(50, 4), dtype=np.uint64, endpoint=False)
+    words[0] = 0
+    words[1] = np.iinfo(np.uint64).max
+    expected = [sum(int(word).bit_count() for word in row) for row in words]
+    assert _bit_counts(words).tolist() == expected
+    assert _bit_counts(words[::3]).tolist() == expected[::3]  # Non-contiguous view
+
+def test_similar_vehicles_rank_closest_listings_first(client, create_listing):
+    make = unique_make()
+    anchor = create_listing(make=make, model="Vitz", year=2018, features=["ABS", "Sunroof"])
+    twin = create_listing(make=make, model="Vitz", year=2018, features=["ABS", "Sunroof"])
+    cousin = create_listing(make=make, model="Aqua", year=2014, features=["ABS"])
+
+    response = client.get(f"/api/vehicles/{anchor['id']}/similar", params={"limit": 50})
+    assert response.status_code == 200
+    ids = [vehicle["id"] for vehicle in response.json()]
+    assert ids[0] == twin["id"]
+    assert ids.index(twin["id"]) < ids.index(cousin["id"])
+    assert anchor["id"] not in ids
+
+    assert client.get("/api/vehicles/999999999/similar").status_code == 404
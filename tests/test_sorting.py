@@ -0,0 +1,40 @@
+import pytest
+
+from conftest import listing, unique_make
+
+@pytest.fixture(scope="module")
+def sorted_make(client, dealer_headers):
+    """A make with three listings whose price, year and mileage orders all differ."""
+    make = unique_make()
+    for price, year, mileage in [(5_000_000, 2015, 30_000), (7_000_000, 2019, 90_000), (6_000_000, 2012, 60_000)]:
+        response = client.post(
+            "/api/vehicles", json=listing(make=make, price=price, year=year, mileage=mileage), headers=dealer_headers
+        )
+        response.raise_for_status()
+    return make
+
+def _column(client, make: str, sort: str, column: str) -> list:
+    response = client.get("/api/vehicles/public", params={"make": make, "sort": sort})
+    assert response.status_code == 200
+    return [vehicle[column] for vehicle in response.json()]
+
+@pytest.mark.parametrize("sort, column, descending", [
+    ("price_asc", "price", False),
+    ("price_desc", "price", True),
+    ("year_asc", "year", False),
+    ("year_desc", "year", True),
+    ("mileage_asc", "mileage", False),
+    ("mileage_desc", "mileage", True),
+])
+def test_sort_options_order_results(client, sorted_make, sort, column, descending):
+    values = _column(client, sorted_make, sort, column)
+    assert len(values) == 3
+    assert values == sorted(values, reverse=descending)
+
+def test_sort_aliases_and_unknown_sorts(client, sorted_make):
+    assert _column(client, sorted_make, "newest", "id") == _column(client, sorted_make, "created_at_desc", "id")
+    assert _column(client, sorted_make, "oldest", "id") == _column(client, sorted_make, "created_at_asc", "id")
+
+    response = client.get("/api/vehicles/public", params={"sort": "cheapest"})
+    assert response.status_code == 400
+    assert "price_asc" in response.json()["detail"]
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.db import engine
+
+def test_logging_in_does_not_wait_for_the_writer(client):
+    async def login_while_writer_is_busy():
+        async with engine.connect() as writer:
+            await writer.exec_driver_sql("SELECT 1")  # Holds the only writer connection
+            response = await asyncio.to_thread(
+                client.post, "/auth/login", json={"email": "user@carro.com", "password": "user123"}
+            )
+            token = response.json()["access_token"]
+            me = await asyncio.to_thread(client.get, "/auth/me", headers={"Authorization": f"Bearer {token}"})
+        return response.status_code, me.status_code
+
+    assert client.portal.call(login_while_writer_is_busy) == (200, 200)
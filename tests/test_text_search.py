@@ -0,0 +1,12 @@
+from conftest import unique_make
+
+def test_text_search_matches_word_prefixes(client, create_listing):
+    make = unique_make()
+    match = create_listing(make=make, title="Nissan Skyline GT-R", description="Twin turbo, immaculate")
+    create_listing(make=make, title="Nissan Sunny", description="Economical runabout")
+
+    response = client.get("/api/vehicles/public", params={"make": make, "q": "skyl turb"})
+    assert [vehicle["id"] for vehicle in response.json()] == [match["id"]]
+
+    response = client.get("/api/vehicles/public", params={"make": make, "q": "nissan", "sort": "relevance"})
+    assert len(response.json()) == 2
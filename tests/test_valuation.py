@@ -0,0 +1,56 @@
+import asyncio
+
+from app.db import async_session_maker, engine, read_session
+from app.vehicles import valuation
+
+def test_periodic_rebuild_only_needs_the_writer_to_swap_rows(client, create_listing, monkeypatch):
+    create_listing(make="Suzuki", model="Alto", year=2018, price=3_000_000)
+    scanned, replaced = asyncio.Event(), asyncio.Event()
+    price_stat_rows, replace_price_stats = valuation.price_stat_rows, valuation.replace_price_stats
+
+    async def scan(session):
+        scan = await price_stat_rows(session)
+        scanned.set()
+        return scan
+
+    async def replace(session, rows, scanned_through):
+        count = await replace_price_stats(session, rows, scanned_through)
+        replaced.set()
+        return count
+
+    monkeypatch.setattr(valuation, "price_stat_rows", scan)
+    monkeypatch.setattr(valuation, "replace_price_stats", replace)
+
+    async def rebuild_while_writer_is_busy():
+        async with engine.connect() as writer:
+            await writer.exec_driver_sql("SELECT 1")  # Holds the writer connection
+            task = asyncio.create_task(valuation.refresh_price_stats_periodically())
+            await asyncio.wait_for(scanned.wait(), timeout=5)
+            assert not replaced.is_set()
+        try:
+            await asyncio.wait_for(replaced.wait(), timeout=5)
+        finally:
+            task.cancel()
+
+    client.portal.call(rebuild_while_writer_is_busy)
+
+    response = client.get("/api/vehicles/valuation", params={"make": "suzuki", "model": "ALTO", "year": 2018})
+    assert response.status_code == 200
+    assert response.json()["listing_count"] >= 1
+
+def test_listings_created_during_a_rebuild_are_kept(client, create_listing):
+    async def scan():
+        async with read_session() as session:
+            return await valuation.price_stat_rows(session)
+
+    async def replace(rows, scanned_through):
+        async with async_session_maker() as session:
+            await valuation.replace_price_stats(session, rows, scanned_through)
+
+    rows, scanned_through = client.portal.call(scan)
+    create_listing(make="Perodua", model="Axia", year=2016, price=2_500_000)
+    client.portal.call(replace, rows, scanned_through)
+
+    response = client.get("/api/vehicles/valuation", params={"make": "Perodua", "model": "Axia", "year": 2016})
+    assert response.status_code == 200
+    assert response.json()["listing_count"] == 1